@@ -0,0 +1,15 @@
+"""Benchmarks for the macros and `install.py` that run without FreeCAD.
+
+Run them from the root of this repo e.g. `python -m benchmarks.run --help`.
+"""
+
+import sys
+from pathlib import Path
+
+
+PATH_ROOT = Path(__file__).resolve().parent.parent
+PATH_MACROS = PATH_ROOT / "src" / "macros"
+
+# Make the macros' shared `freecadconfig` package importable.
+if str(PATH_MACROS) not in sys.path:
+    sys.path.insert(0, str(PATH_MACROS))
@@ -0,0 +1,562 @@
+"""Measure the macros and installer against synthetic documents.
+
+Every case is run against the stand-in FreeCAD in `benchmarks.standin`. The best time
+of a few repeats and the number of calls into the FreeCAD API are compared against a
+stored baseline. Any extra call or a run that is much slower than the baseline fails
+the benchmark.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 100000 --cases force_recompute
+    python -m benchmarks.run --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import importlib.util
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from benchmarks import PATH_ROOT, standin, synthetic
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import ModuleType
+
+    Setup = Callable[[standin.Session, int], Callable[[], Any]]
+
+
+PATH_BASELINE = Path(__file__).resolve().with_name("baseline.json")
+
+SIZES_DEFAULT = (100, 1_000, 10_000)
+
+SESSION = standin.install()
+
+# These have to be imported after the stand-in modules are installed.
+from freecadconfig import host, labels, runtime  # noqa: E402
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Setup
+    sized: bool = True
+
+    def key(self, size: int) -> str:
+        return f"{self.name}@{size}" if self.sized else self.name
+
+
+CASES: dict[str, Case] = {}
+
+_MODULES: dict[str, ModuleType] = {}
+
+_OUTPUT = Path(tempfile.mkdtemp(prefix="freecadconfig-bench-"))
+
+
+def case(name: str, sized: bool = True) -> Callable[[Setup], Setup]:
+    def decorator(setup: Setup) -> Setup:
+        CASES[name] = Case(name, setup, sized)
+        return setup
+
+    return decorator
+
+
+def macro(file: str) -> ModuleType:
+    if file not in _MODULES:
+        _MODULES[file] = runtime.load_macro(file)
+    return _MODULES[file]
+
+
+def installer() -> ModuleType:
+    if "install" not in _MODULES:
+        spec = importlib.util.spec_from_file_location(
+            "install", PATH_ROOT / "install.py"
+        )
+        assert spec is not None and spec.loader is not None
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _MODULES["install"] = module
+    return _MODULES["install"]
+
+
+def reset_install_state(session: standin.Session) -> None:
+    session.parameters = standin.ParameterStore()
+    session.commands.commands.clear()
+
+
+def reset_caches() -> None:
+    """Forget everything `freecadconfig` keeps for the session so every repeat of
+    every case starts cold, whichever cases ran before it."""
+
+    runtime.get_main_window.cache_clear()
+    runtime.get_mdi_area.cache_clear()
+    runtime.DOCK_WIDGETS.clear()
+    runtime.SESSION_STATE.clear()
+
+    labels.INDEX.clear()
+    labels.OBSERVER = None
+    standin.OBSERVERS.clear()
+
+    host.HOST.clear()
+
+
+# Cases
+
+
+@case("adaptive_tessellation")
+def setup_adaptive_tessellation(session: standin.Session, size: int):
+    synthetic.generate_document(session, synthetic.DocumentSpec.of_size(size))
+    module = macro("AdaptiveTessellation.py")
+    return lambda: module.UserMacro().run(budget=size * 100)
+
+
+@case("force_recompute")
+def setup_force_recompute(session: standin.Session, size: int):
+    synthetic.generate_document(session, synthetic.DocumentSpec.of_size(size))
+    return macro("ForceRecompute.py").UserMacro.run
+
+
+@case("set_view_object_viewport")
+def setup_set_view_object_viewport(session: standin.Session, size: int):
+    synthetic.generate_document(session, synthetic.DocumentSpec.of_size(size))
+    module = macro("SetViewObjectViewport.py")
+    return lambda: module.UserMacro().run()
+
+
+@case("set_view_object_projection")
+def setup_set_view_object_projection(session: standin.Session, size: int):
+    synthetic.generate_document(session, synthetic.DocumentSpec.of_size(size))
+    module = macro("SetViewObjectProjection.py")
+    return lambda: module.UserMacro().run()
+
+
+@case("toggle_level_of_detail")
+def setup_toggle_level_of_detail(session: standin.Session, size: int):
+    synthetic.generate_document(session, synthetic.DocumentSpec.of_size(size))
+    module = macro("ToggleLevelOfDetail.py")
+
+    def run() -> None:
+        # Simplify then restore.
+        module.UserMacro().run()
+        module.UserMacro().run()
+
+    return run
+
+
+@case("toggle_level_of_detail_links")
+def setup_toggle_level_of_detail_links(session: standin.Session, size: int):
+    document = synthetic.generate_document(
+        session, synthetic.DocumentSpec.of_size(size)
+    )
+    synthetic.link_features(document)
+    module = macro("ToggleLevelOfDetail.py")
+
+    def run() -> None:
+        module.UserMacro().run()
+        module.UserMacro().run()
+
+    return run
+
+
+@case("search_and_replace_labels")
+def setup_search_and_replace_labels(session: standin.Session, size: int):
+    document = synthetic.generate_document(
+        session, synthetic.DocumentSpec.of_size(size)
+    )
+    session.selection.objects = list(document._objects)
+    module = macro("SearchAndReplaceLabels.py")
+    return lambda: module.UserMacro.run(r"_imported$", "", dry_run=False)
+
+
+@case("print_external_geometry")
+def setup_print_external_geometry(session: standin.Session, size: int):
+    document = synthetic.generate_document(
+        session, synthetic.DocumentSpec.of_size(size)
+    )
+    sketches = document.getObjectsByLabel("Sketch_000000")
+    session.selection.objects = sketches[:1]
+    module = macro("PrintExternalGeometry.py")
+    return lambda: module.UserMacro().run()
+
+
+@case("export_drawings")
+def setup_export_drawings(session: standin.Session, size: int):
+    synthetic.generate_document(session, synthetic.DocumentSpec.of_size(size))
+    module = macro("ExportDrawingsIso5457Minimal.py")
+    return lambda: module.UserMacro().run(
+        module.PageDataIso5457(title="Benchmark"),
+        _OUTPUT / "drawings",
+        revision="A",
+    )
+
+
+@case("export_drawings_merged")
+def setup_export_drawings_merged(session: standin.Session, size: int):
+    synthetic.generate_document(session, synthetic.DocumentSpec.of_size(size))
+    module = macro("ExportDrawingsIso5457Minimal.py")
+    return lambda: module.UserMacro().run(
+        module.PageDataIso5457(title="Benchmark"),
+        _OUTPUT / "drawings-merged",
+        revision="A",
+        merge=True,
+        svg=True,
+    )
+
+
+@case("export_step_bodies")
+def setup_export_step_bodies(session: standin.Session, size: int):
+    document = synthetic.generate_document(
+        session, synthetic.DocumentSpec.of_size(size)
+    )
+    session.selection.objects = synthetic.features(document)[: max(1, size // 10)]
+    output_directory = Path(tempfile.mkdtemp(dir=_OUTPUT))
+    module = macro("ExportStepBodies.py")
+    return lambda: module.UserMacro().run(output_directory, jobs=1)
+
+
+@case("export_step_bodies_cached")
+def setup_export_step_bodies_cached(session: standin.Session, size: int):
+    document = synthetic.generate_document(
+        session, synthetic.DocumentSpec.of_size(size)
+    )
+    bodies = synthetic.features(document)[: max(1, size // 10)]
+    session.selection.objects = bodies
+    output_directory = Path(tempfile.mkdtemp(dir=_OUTPUT))
+    module = macro("ExportStepBodies.py")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        module.UserMacro().run(output_directory, jobs=1)
+
+    # Only the recolored body is exported again.
+    bodies[0].ViewObject.ShapeAppearance = [standin.Material(DiffuseColor=(1, 0, 0))]
+
+    return lambda: module.UserMacro().run(output_directory, jobs=1)
+
+
+@case("analyze_spreadsheet")
+def setup_analyze_spreadsheet(session: standin.Session, size: int):
+    document = synthetic.generate_document(
+        session, synthetic.DocumentSpec.of_size(size)
+    )
+    synthetic.bind_features(document, synthetic.sheets(document)[0])
+    module = macro("AnalyzeSpreadsheet.py")
+    return lambda: module.UserMacro().run(_OUTPUT / "graphs")
+
+
+@case("export_spreadsheet")
+def setup_export_spreadsheet(session: standin.Session, size: int):
+    spec = synthetic.DocumentSpec.of_size(size)
+    document = synthetic.generate_document(session, spec)
+    sheet = synthetic.sheets(document)[0]
+    synthetic.select_sheet(session, sheet, spec.sheet_rows, spec.sheet_columns)
+    end = standin.address(spec.sheet_rows - 1, spec.sheet_columns - 1)
+    cell_range = f"A1:{end}"
+    module = macro("ExportSpreadsheet.py")
+    return lambda: module.UserMacro.run(cell_range, _OUTPUT / "sheet.csv")
+
+
+@case("import_spreadsheet")
+def setup_import_spreadsheet(session: standin.Session, size: int):
+    spec = synthetic.DocumentSpec.of_size(size)
+    document = synthetic.generate_document(session, spec)
+    sheet = synthetic.sheets(document)[0]
+    path = _OUTPUT / "import.csv"
+    synthetic.write_sheet_csv(sheet, spec.sheet_rows, spec.sheet_columns, path)
+    module = macro("ImportSpreadsheet.py")
+    return lambda: module.UserMacro.import_sheet(sheet, path)
+
+
+@case("search_and_replace_cell_contents")
+def setup_search_and_replace_cell_contents(session: standin.Session, size: int):
+    spec = synthetic.DocumentSpec.of_size(size)
+    document = synthetic.generate_document(session, spec)
+    sheet = synthetic.sheets(document)[0]
+    synthetic.select_sheet(session, sheet, spec.sheet_rows, spec.sheet_columns)
+    module = macro("SearchAndReplaceCellContents.py")
+    return lambda: module.UserMacro.run(r"^param_", "p_", dry_run=False)
+
+
+@case("rename_with_rules")
+def setup_rename_with_rules(session: standin.Session, size: int):
+    synthetic.generate_document(session, synthetic.DocumentSpec.of_size(size))
+
+    # Twenty rules, most of which match nothing, as a cleanup list grows.
+    rules = [("^Part_", "P_"), (r"_imported$", ""), (r"^param_(\d+)$", r"p\1")]
+    rules += [(f"vendor_{i}_", "") for i in range(17)]
+
+    path = _OUTPUT / "rename.toml"
+    path.write_text(
+        "".join(
+            f"[[rule]]\npattern = '{pattern}'\nreplace = '{replace}'\n\n"
+            for pattern, replace in rules
+        )
+    )
+
+    module = macro("RenameWithRules.py")
+    return lambda: module.UserMacro().run(path, dry_run=False)
+
+
+@case("host_dispatch")
+def setup_host_dispatch(session: standin.Session, size: int):
+    from freecadconfig import host
+
+    synthetic.generate_document(session, synthetic.DocumentSpec.of_size(size))
+    macro_host = host.MacroHost()
+    macro_host.get("ForceRecompute.py")
+
+    def run() -> None:
+        for _ in range(10):
+            macro_host.run("ForceRecompute.py")
+
+    return run
+
+
+# Queries as they're typed, with and without a type filter.
+LABEL_QUERIES = [
+    ("pa", None),
+    ("part_0", None),
+    ("part_000042", None),
+    ("_0001", None),
+    ("sketch_00", ["Sketcher::SketchObject"]),
+    ("imported", ["Part::Feature"]),
+]
+
+
+@case("find_objects_index")
+def setup_find_objects_index(session: standin.Session, size: int):
+    from freecadconfig import labels
+
+    synthetic.generate_document(session, synthetic.DocumentSpec.of_size(size))
+    labels.INDEX.clear()
+    return labels.get_index
+
+
+@case("find_objects_search")
+def setup_find_objects_search(session: standin.Session, size: int):
+    from freecadconfig import labels
+
+    document = synthetic.generate_document(
+        session, synthetic.DocumentSpec.of_size(size)
+    )
+    labels.INDEX.clear()
+    labels.get_index()
+
+    objects = synthetic.features(document)[:100]
+
+    def run() -> None:
+        # Relabelled objects are re-indexed by the observer between searches.
+        for obj in objects:
+            obj.Label = f"{obj.Label}_renamed"
+
+        for query, type_ids in LABEL_QUERIES:
+            labels.search(query, type_ids, limit=1_000)
+
+    return run
+
+
+@case("install_preferences", sized=False)
+def setup_install_preferences(session: standin.Session, size: int):
+    reset_install_state(session)
+    return lambda: installer().install_preferences(PATH_ROOT)
+
+
+@case("install_shortcuts", sized=False)
+def setup_install_shortcuts(session: standin.Session, size: int):
+    reset_install_state(session)
+    return lambda: installer().install_shortcuts(PATH_ROOT)
+
+
+@case("install_macros", sized=False)
+def setup_install_macros(session: standin.Session, size: int):
+    reset_install_state(session)
+    return lambda: installer().install_macros(PATH_ROOT)
+
+
+@case("install_macros_reinstall", sized=False)
+def setup_install_macros_reinstall(session: standin.Session, size: int):
+    reset_install_state(session)
+    with contextlib.redirect_stdout(io.StringIO()):
+        installer().install_macros(PATH_ROOT)
+    return lambda: installer().install_macros(PATH_ROOT)
+
+
+@case("apply_config_changes", sized=False)
+def setup_apply_config_changes(session: standin.Session, size: int):
+    install = installer()
+    reset_install_state(session)
+
+    # A copy so a preference can be changed without touching the repo's config.
+    root = _OUTPUT / "config-root"
+    shutil.rmtree(root, ignore_errors=True)
+    shutil.copytree(PATH_ROOT / install.SUBPATH_CONFIG, root / install.SUBPATH_CONFIG)
+    (root / install.SUBPATH_MACROS).mkdir(parents=True)
+
+    previous = install.read_config_state(root)
+
+    path = root / install.SUBPATH_PREFERENCES_TOML
+    path.write_text(path.read_text().replace("value = false", "value = true", 1))
+
+    return lambda: install.apply_config_changes(root, previous, macros=False)
+
+
+# Measuring
+
+
+def measure(case: Case, size: int, repeats: int) -> dict[str, Any]:
+    times = []
+    calls: dict[str, int] = {}
+
+    for _ in range(repeats):
+        SESSION.reset()
+        reset_caches()
+        run = case.setup(SESSION, size)
+
+        gc.collect()
+        standin.RECORDER.reset()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+
+        calls = standin.RECORDER.snapshot()
+
+    return {"time": min(times), "calls": calls}
+
+
+def compare(
+    key: str,
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    time_tolerance: float,
+    time_floor: float,
+) -> list[str]:
+    regressions = []
+
+    for name, count in current["calls"].items():
+        expected = baseline["calls"].get(name, 0)
+        if count > expected:
+            regressions.append(f"{key}: {name} called {count} times (was {expected})")
+
+    limit = baseline["time"] * (1 + time_tolerance)
+
+    if current["time"] > limit and current["time"] - baseline["time"] > time_floor:
+        regressions.append(
+            f"{key}: took {current['time'] * 1000:.1f}ms "
+            f"(was {baseline['time'] * 1000:.1f}ms)"
+        )
+
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Benchmark the macros and installer against synthetic documents.",
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in SIZES_DEFAULT),
+        help="Comma separated document sizes in objects.",
+    )
+    parser.add_argument(
+        "--cases",
+        default="",
+        help=f"Comma separated cases to run. Defaults to all: {', '.join(CASES)}.",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=PATH_BASELINE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the results to the baseline instead of comparing.",
+    )
+    parser.add_argument(
+        "--time-tolerance",
+        type=float,
+        default=1.0,
+        help="Allowed slowdown as a fraction of the baseline time.",
+    )
+    parser.add_argument(
+        "--time-floor",
+        type=float,
+        default=0.005,
+        help="Slowdowns under this many seconds are never regressions.",
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    names = [name for name in args.cases.split(",") if name] or list(CASES)
+
+    unknown = set(names) - set(CASES)
+
+    if unknown:
+        print(f"Unknown cases: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+
+    results: dict[str, dict[str, Any]] = {}
+    regressions: list[str] = []
+
+    print(f"{'case':<45} {'time':>10} {'calls':>10}")
+
+    for name in names:
+        case = CASES[name]
+
+        for size in sizes if case.sized else [0]:
+            key = case.key(size)
+            result = measure(case, size, args.repeats)
+            results[key] = result
+
+            total = sum(result["calls"].values())
+            status = ""
+
+            if not args.update_baseline:
+                if key in baseline:
+                    found = compare(
+                        key,
+                        result,
+                        baseline[key],
+                        args.time_tolerance,
+                        args.time_floor,
+                    )
+                    regressions += found
+                    status = "REGRESSED" if found else "ok"
+                else:
+                    status = "new"
+
+            print(f"{key:<45} {result['time'] * 1000:>8.2f}ms {total:>10} {status}")
+
+    if args.update_baseline:
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"\nUpdated {args.baseline}")
+        return 0
+
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f" {regression}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
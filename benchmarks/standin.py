@@ -0,0 +1,1058 @@
+"""A lightweight stand-in for the parts of FreeCAD the macros and installer use.
+
+`install` registers fake `FreeCAD`, `FreeCADGui` and `PySide` modules in `sys.modules`
+so the macros and `install.py` can be imported and run without FreeCAD. Every call
+into the fake API is counted by `RECORDER` so benchmarks can track how often the
+code under test crosses into FreeCAD.
+"""
+
+from __future__ import annotations
+
+import sys
+import types
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+
+PREFIX_USER_PARAMETER = "User parameter:"
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+
+    def record(self, name: str) -> None:
+        self.calls[name] += 1
+
+    def reset(self) -> None:
+        self.calls.clear()
+
+    def snapshot(self) -> dict[str, int]:
+        return dict(sorted(self.calls.items()))
+
+
+RECORDER = Recorder()
+record = RECORDER.record
+
+# The objects passed to `FreeCAD.addDocumentObserver`.
+OBSERVERS: list[Any] = []
+
+
+def notify(slot: str, *args: Any) -> None:
+    for observer in OBSERVERS:
+        method = getattr(observer, slot, None)
+
+        if method is not None:
+            method(*args)
+
+
+# Parameters
+
+
+class ParameterGrp:
+    """A recording stand-in for FreeCAD's `ParameterGrp`."""
+
+    TYPES = {
+        "Bool": "Boolean",
+        "Float": "Float",
+        "Int": "Integer",
+        "String": "String",
+        "Unsigned": "Unsigned Long",
+    }
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.groups: dict[str, ParameterGrp] = {}
+        self.values: dict[tuple[str, str], Any] = {}
+
+    def __getattr__(self, attr: str) -> Any:
+        for prefix in ("Set", "Get", "Rem"):
+            kind = attr.removeprefix(prefix)
+
+            if attr.startswith(prefix) and kind in self.TYPES:
+                return getattr(self, f"_{prefix.lower()}")(kind)
+
+        raise AttributeError(attr)
+
+    def _set(self, kind: str):
+        def setter(name: str, value: Any) -> None:
+            record(f"ParameterGrp.Set{kind}")
+            self.values[(kind, name)] = value
+
+        return setter
+
+    def _get(self, kind: str):
+        def getter(name: str, default: Any = None) -> Any:
+            record(f"ParameterGrp.Get{kind}")
+            return self.values.get((kind, name), default)
+
+        return getter
+
+    def _rem(self, kind: str):
+        def remover(name: str) -> None:
+            record(f"ParameterGrp.Rem{kind}")
+            self.values.pop((kind, name), None)
+
+        return remover
+
+    def GetGroup(self, name: str) -> ParameterGrp:
+        record("ParameterGrp.GetGroup")
+        group = self
+
+        for part in name.split("/"):
+            if part:
+                group = group.groups.setdefault(part, ParameterGrp(part))
+
+        return group
+
+    def GetGroupName(self) -> str:
+        return self.name
+
+    def GetGroups(self) -> list[str]:
+        record("ParameterGrp.GetGroups")
+        return list(self.groups)
+
+    def HasGroup(self, name: str) -> bool:
+        record("ParameterGrp.HasGroup")
+        return name in self.groups
+
+    def RemGroup(self, name: str) -> None:
+        record("ParameterGrp.RemGroup")
+        self.groups.pop(name, None)
+
+    def GetContents(self) -> list[tuple[str, str, Any]]:
+        record("ParameterGrp.GetContents")
+        return [
+            (self.TYPES[kind], name, value)
+            for (kind, name), value in self.values.items()
+        ]
+
+    def Clear(self) -> None:
+        record("ParameterGrp.Clear")
+        self.groups.clear()
+        self.values.clear()
+
+
+class ParameterStore:
+    def __init__(self) -> None:
+        self.root = ParameterGrp("Root")
+
+    def get(self, path: str) -> ParameterGrp:
+        path = path.removeprefix(PREFIX_USER_PARAMETER)
+        group = self.root
+
+        for part in path.split("/"):
+            if part:
+                group = group.groups.setdefault(part, ParameterGrp(part))
+
+        return group
+
+    def flatten(self) -> dict[str, tuple[str, Any]]:
+        """Returns every value keyed by its full path."""
+
+        flat = {}
+
+        def walk(group: ParameterGrp, prefix: str) -> None:
+            for (kind, name), value in group.values.items():
+                flat[f"{prefix}{name}"] = (kind, value)
+            for name, child in group.groups.items():
+                walk(child, f"{prefix}{name}/")
+
+        walk(self.root, "")
+
+        return flat
+
+
+# Documents
+
+
+class Material:
+    def __init__(self, **kwargs: Any) -> None:
+        self.DiffuseColor = (0.44705, 0.47450, 0.50196, 0.0)
+        self.__dict__.update(kwargs)
+
+
+class ViewObject:
+    """Records every property assignment as `ViewObject.<Property>=`."""
+
+    def __init__(self, obj: DocumentObject, **properties: Any) -> None:
+        defaults = {
+            "DisplayMode": "Flat Lines",
+            "Visibility": True,
+            "LineColor": (25, 25, 25, 0),
+            "LineWidth": 2.0,
+            "PointColor": (25, 25, 25, 0),
+            "PointSize": 2.0,
+            "ShapeAppearance": [Material()],
+        }
+        object.__setattr__(self, "Object", obj)
+        self.__dict__.update(defaults | properties)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        record(f"ViewObject.{name}=")
+        object.__setattr__(self, name, value)
+
+    def doubleClicked(self) -> bool:
+        record("ViewObject.doubleClicked")
+        return True
+
+
+class DocumentObject:
+    def __init__(self, document: Document, name: str, type_id: str) -> None:
+        self.Document = document
+        self.Name = name
+        self.TypeId = type_id
+        self._label = name
+        self.ViewObject: ViewObject | None = ViewObject(self)
+        self.ExpressionEngine: list[tuple[str, str]] = []
+        self.InList: list[DocumentObject] = []
+
+    @property
+    def Label(self) -> str:
+        return self._label
+
+    @Label.setter
+    def Label(self, value: str) -> None:
+        record("DocumentObject.Label=")
+        self._label = value
+        notify("slotChangedObject", self, "Label")
+
+    @property
+    def InListRecursive(self) -> list[DocumentObject]:
+        record("DocumentObject.InListRecursive")
+        found: dict[str, DocumentObject] = {}
+        pending = list(self.InList)
+
+        while pending:
+            obj = pending.pop()
+            if obj.Name not in found:
+                found[obj.Name] = obj
+                pending += obj.InList
+
+        return list(found.values())
+
+    def touch(self) -> None:
+        record("DocumentObject.touch")
+
+    def isDerivedFrom(self, type_id: str) -> bool:
+        record("DocumentObject.isDerivedFrom")
+        return self.TypeId == type_id
+
+    def getLinkedObject(self, recursive: bool = True) -> DocumentObject:
+        record("DocumentObject.getLinkedObject")
+        return self
+
+    def __repr__(self) -> str:
+        return f"<{self.TypeId} {self.Name}>"
+
+
+class Quantity:
+    """Parses `<number> [unit]` like `FreeCAD.Units.Quantity`."""
+
+    def __init__(self, value: Any = 0.0) -> None:
+        record("Units.Quantity")
+        if isinstance(value, Quantity):
+            self.Value, self.unit = value.Value, value.unit
+            return
+        if isinstance(value, (int, float)):
+            self.Value, self.unit = float(value), ""
+            return
+        number, _, unit = str(value).strip().partition(" ")
+        try:
+            self.Value = float(number)
+        except ValueError as e:
+            raise ValueError(f"Unable to parse '{value}' as a quantity.") from e
+        self.unit = unit.strip()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Quantity):
+            return NotImplemented
+        return (self.Value, self.unit) == (other.Value, other.unit)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class Vector(tuple):
+    def __new__(cls, x: float = 0.0, y: float = 0.0, z: float = 0.0) -> Vector:
+        return super().__new__(cls, (x, y, z))
+
+
+class BoundBox:
+    """A box from the origin to `(x, y, z)`."""
+
+    def __init__(self, x: float, y: float, z: float) -> None:
+        self.XMin = self.YMin = self.ZMin = 0.0
+        self.XMax, self.YMax, self.ZMax = x, y, z
+        self.XLength = x
+        self.YLength = y
+        self.ZLength = z
+
+    @property
+    def DiagonalLength(self) -> float:
+        return (self.XLength**2 + self.YLength**2 + self.ZLength**2) ** 0.5
+
+
+class Shape:
+    """A box-like shape with a number of faces."""
+
+    def __init__(self, size: float = 10.0, faces: int = 6) -> None:
+        self.BoundBox = BoundBox(size, size, size)
+        self.Faces = [None] * faces
+
+    def isNull(self) -> bool:
+        return not self.Faces
+
+    def countSubElements(self, kind: str) -> int:
+        record("Shape.countSubElements")
+        return len(self.Faces) if kind == "Face" else 0
+
+    def exportBrepToString(self) -> str:
+        record("Shape.exportBrepToString")
+        return f"box {self.BoundBox.XLength} faces {len(self.Faces)}"
+
+
+class PartFeature(DocumentObject):
+    def __init__(self, document: Document, name: str, type_id: str) -> None:
+        super().__init__(document, name, type_id)
+        self.Shape = Shape()
+        self.ViewObject = ViewObject(
+            self, Deviation=0.5, AngularDeflection=28.5, BoundingBox=False
+        )
+
+
+class Link(DocumentObject):
+    """An `App::Link`. It has no shape of its own and is drawn like what it links."""
+
+    def __init__(self, document: Document, name: str, type_id: str) -> None:
+        super().__init__(document, name, type_id)
+        self.LinkedObject: DocumentObject | None = None
+        self.ViewObject = ViewObject(self, DisplayMode="Link")
+
+    def getLinkedObject(self, recursive: bool = True) -> DocumentObject:
+        record("DocumentObject.getLinkedObject")
+        linked = self.LinkedObject
+
+        if linked is None:
+            return self
+
+        return linked.getLinkedObject(recursive) if recursive else linked
+
+
+class SketchObject(DocumentObject):
+    def __init__(self, document: Document, name: str, type_id: str) -> None:
+        super().__init__(document, name, type_id)
+        self.ExternalGeometry: list[tuple[DocumentObject, list[str]]] = []
+
+
+class Template:
+    def __init__(self) -> None:
+        self.EditableTexts: dict[str, str] = {}
+
+    def setEditFieldContent(self, key: str, value: str) -> bool:
+        record("Template.setEditFieldContent")
+        self.EditableTexts[key] = value
+        return True
+
+
+class DrawPage(DocumentObject):
+    def __init__(self, document: Document, name: str, type_id: str) -> None:
+        super().__init__(document, name, type_id)
+        self.Template = Template()
+        self.Views: list[DocumentObject] = []
+
+
+class Sheet(DocumentObject):
+    def __init__(self, document: Document, name: str, type_id: str) -> None:
+        super().__init__(document, name, type_id)
+        self.cells: dict[str, str] = {}
+        self.aliases: dict[str, str] = {}
+
+    def set(self, address: str, content: str) -> None:
+        record("Sheet.set")
+        if content:
+            self.cells[address] = content
+        else:
+            self.cells.pop(address, None)
+
+    def get(self, address: str) -> Any:
+        record("Sheet.get")
+        address = self.getCellFromAlias(address) or address
+        content = self.cells[address]
+        content = content.removeprefix("=")
+        try:
+            return float(content)
+        except ValueError:
+            return content
+
+    def getContents(self, address: str) -> str:
+        record("Sheet.getContents")
+        return self.cells.get(address, "")
+
+    def setAlias(self, address: str, alias: str) -> None:
+        record("Sheet.setAlias")
+        if alias:
+            self.aliases[address] = alias
+        else:
+            self.aliases.pop(address, None)
+
+    def getAlias(self, address: str) -> str | None:
+        record("Sheet.getAlias")
+        return self.aliases.get(address)
+
+    def getCellFromAlias(self, alias: str) -> str | None:
+        record("Sheet.getCellFromAlias")
+        for address, name in self.aliases.items():
+            if name == alias:
+                return address
+        return None
+
+    def getUsedCells(self) -> list[str]:
+        record("Sheet.getUsedCells")
+        return list(self.cells)
+
+    def getNonEmptyCells(self) -> list[str]:
+        record("Sheet.getNonEmptyCells")
+        return list(self.cells)
+
+
+CLASSES_BY_TYPE_ID: dict[str, type[DocumentObject]] = {
+    "App::Link": Link,
+    "Part::Feature": PartFeature,
+    "Sketcher::SketchObject": SketchObject,
+    "Spreadsheet::Sheet": Sheet,
+    "TechDraw::DrawPage": DrawPage,
+}
+
+
+class Document:
+    def __init__(self, name: str) -> None:
+        self.Name = name
+        self.Label = name
+        self.FileName = ""
+        self._objects: list[DocumentObject] = []
+        self._names: dict[str, DocumentObject] = {}
+
+    @property
+    def Objects(self) -> list[DocumentObject]:
+        record("Document.Objects")
+        return list(self._objects)
+
+    def addObject(self, type_id: str, name: str = "") -> DocumentObject:
+        record("Document.addObject")
+        name = name or type_id.split("::")[-1]
+        base, index = name, 0
+
+        while name in self._names:
+            index += 1
+            name = f"{base}{index:03d}"
+
+        cls = CLASSES_BY_TYPE_ID.get(type_id, DocumentObject)
+        obj = cls(self, name, type_id)
+        self._objects.append(obj)
+        self._names[name] = obj
+        notify("slotCreatedObject", obj)
+
+        return obj
+
+    def removeObject(self, name: str) -> None:
+        record("Document.removeObject")
+        obj = self._names.pop(name)
+        self._objects.remove(obj)
+        notify("slotDeletedObject", obj)
+
+    def getObject(self, name: str) -> DocumentObject | None:
+        record("Document.getObject")
+        return self._names.get(name)
+
+    def getObjectsByLabel(self, label: str) -> list[DocumentObject]:
+        record("Document.getObjectsByLabel")
+        return [obj for obj in self._objects if obj.Label == label]
+
+    def recompute(self) -> int:
+        record("Document.recompute")
+        return len(self._objects)
+
+    def save(self) -> None:
+        record("Document.save")
+
+    def openTransaction(self, name: str = "") -> None:
+        record("Document.openTransaction")
+
+    def commitTransaction(self) -> None:
+        record("Document.commitTransaction")
+
+    def abortTransaction(self) -> None:
+        record("Document.abortTransaction")
+
+
+# GUI
+
+
+class View3D:
+    """An orthographic top view at a fixed scale."""
+
+    PIXELS_PER_MM = 0.1
+
+    def getPointOnViewport(self, point: Vector) -> tuple[int, int]:
+        record("View3D.getPointOnViewport")
+        return (
+            round(point[0] * self.PIXELS_PER_MM),
+            round(point[1] * self.PIXELS_PER_MM),
+        )
+
+
+class Selection:
+    def __init__(self) -> None:
+        self.objects: list[DocumentObject] = []
+
+    def getSelection(self, *args: Any) -> list[DocumentObject]:
+        record("Selection.getSelection")
+        return list(self.objects)
+
+    def addSelection(self, obj: DocumentObject, *args: Any) -> None:
+        record("Selection.addSelection")
+        self.objects.append(obj)
+
+    def clearSelection(self, *args: Any) -> None:
+        record("Selection.clearSelection")
+        self.objects.clear()
+
+
+class MetaObject:
+    def __init__(self, class_name: str) -> None:
+        self._class_name = class_name
+
+    def className(self) -> str:
+        return self._class_name
+
+
+class Widget:
+    CLASS_NAME = "QWidget"
+
+    def __init__(self, name: str = "") -> None:
+        self.name = name
+        self.children: list[Widget] = []
+        self.visible = True
+
+    def metaObject(self) -> MetaObject:
+        return MetaObject(self.CLASS_NAME)
+
+    def findChild(self, cls: type, name: str | None = None) -> Widget | None:
+        record("QObject.findChild")
+        for child in self._walk():
+            if isinstance(child, cls) and (name is None or child.name == name):
+                return child
+        return None
+
+    def _walk(self):
+        for child in self.children:
+            yield child
+            yield from child._walk()
+
+    def isVisible(self) -> bool:
+        return self.visible
+
+    def show(self) -> None:
+        self.visible = True
+
+    def hide(self) -> None:
+        self.visible = False
+
+
+class QMainWindow(Widget):
+    pass
+
+
+class QDockWidget(Widget):
+    pass
+
+
+class QMdiArea(Widget):
+    def __init__(self, name: str = "") -> None:
+        super().__init__(name)
+        self.sub_windows: list[QMdiSubWindow] = []
+        self.active: QMdiSubWindow | None = None
+
+    def subWindowList(self) -> list[QMdiSubWindow]:
+        record("QMdiArea.subWindowList")
+        return list(self.sub_windows)
+
+    def activeSubWindow(self) -> QMdiSubWindow | None:
+        record("QMdiArea.activeSubWindow")
+        return self.active
+
+
+class QMdiSubWindow(Widget):
+    def __init__(self, widget: Widget) -> None:
+        super().__init__()
+        self._widget = widget
+
+    def widget(self) -> Widget:
+        return self._widget
+
+
+class ModelIndex:
+    def __init__(self, row: int, column: int) -> None:
+        self._row = row
+        self._column = column
+
+    def row(self) -> int:
+        return self._row
+
+    def column(self) -> int:
+        return self._column
+
+
+class SheetModel:
+    """A table model backed by a `Sheet`'s cells."""
+
+    def __init__(self, sheet: Sheet) -> None:
+        self.sheet = sheet
+
+    def index(self, row: int, column: int) -> ModelIndex:
+        record("QAbstractItemModel.index")
+        return ModelIndex(row, column)
+
+    def data(self, index: ModelIndex, role: int = 0) -> Any:
+        record("QAbstractItemModel.data")
+        return self.sheet.cells.get(address(index.row(), index.column()))
+
+    def setData(self, index: ModelIndex, value: Any, role: int = 2) -> bool:
+        record("QAbstractItemModel.setData")
+        self.sheet.cells[address(index.row(), index.column())] = value
+        return True
+
+
+class SelectionModel:
+    def __init__(self, indexes: list[ModelIndex]) -> None:
+        self.indexes = indexes
+
+    def selectedIndexes(self) -> list[ModelIndex]:
+        record("QItemSelectionModel.selectedIndexes")
+        return list(self.indexes)
+
+
+class QTableView(Widget):
+    def __init__(self, model: SheetModel, selected: list[ModelIndex]) -> None:
+        super().__init__()
+        self._model = model
+        self._selection_model = SelectionModel(selected)
+
+    def model(self) -> SheetModel:
+        return self._model
+
+    def selectionModel(self) -> SelectionModel:
+        return self._selection_model
+
+
+class SheetView(Widget):
+    CLASS_NAME = "SpreadsheetGui::SheetView"
+
+
+class Workbench:
+    def reloadActive(self) -> None:
+        record("Workbench.reloadActive")
+
+
+class CommandRegistry:
+    def __init__(self) -> None:
+        self.commands: dict[str, dict[str, Any]] = {}
+
+    def findCustomCommand(self, macro_file: str) -> str | None:
+        record("Command.findCustomCommand")
+        for name, command in self.commands.items():
+            if command["macroFile"] == macro_file:
+                return name
+        return None
+
+    def removeCustomCommand(self, name: str) -> bool:
+        record("Command.removeCustomCommand")
+        return self.commands.pop(name, None) is not None
+
+    def createCustomCommand(self, **kwargs: Any) -> str:
+        record("Command.createCustomCommand")
+
+        # Like FreeCAD, use the first free macro name.
+        number = 0
+        while f"Std_Macro_{number}" in self.commands:
+            number += 1
+
+        name = f"Std_Macro_{number}"
+        self.commands[name] = kwargs
+        return name
+
+    def get(self, name: str) -> CommandProxy:
+        record("Command.get")
+        return CommandProxy(self.commands[name])
+
+
+class CommandProxy:
+    def __init__(self, command: dict[str, Any]) -> None:
+        self.command = command
+
+    def setShortcut(self, shortcut: str) -> None:
+        record("Command.setShortcut")
+        self.command["shortcut"] = shortcut
+
+
+class Session:
+    """The state behind the stand-in modules."""
+
+    def __init__(self) -> None:
+        self.parameters = ParameterStore()
+        self.documents: dict[str, Document] = {}
+        self.active_document: Document | None = None
+        self.selection = Selection()
+        self.commands = CommandRegistry()
+        self.workbench = Workbench()
+        self.exported: list[tuple[list[Any], str]] = []
+        self.user_app_data = Path("/tmp/freecadconfig-standin")
+
+        self.main_window = QMainWindow("Main window")
+        self.mdi_area = QMdiArea()
+        self.main_window.children += [
+            self.mdi_area,
+            QDockWidget("Python console"),
+            QDockWidget("Report view"),
+        ]
+
+    def new_document(self, name: str = "Unnamed") -> Document:
+        document = Document(name)
+        self.documents[name] = document
+        self.active_document = document
+        return document
+
+    def open_sheet_view(self, sheet: Sheet, selected: list[ModelIndex]) -> None:
+        view = SheetView()
+        view.children.append(QTableView(SheetModel(sheet), selected))
+        sub_window = QMdiSubWindow(view)
+        self.mdi_area.sub_windows = [sub_window]
+        self.mdi_area.active = sub_window
+
+    def reset(self) -> None:
+        """Reset the documents and GUI state, keeping parameters and commands."""
+
+        for document in self.documents.values():
+            notify("slotDeletedDocument", document)
+
+        self.documents.clear()
+        self.active_document = None
+        self.selection.objects.clear()
+        self.mdi_area.sub_windows.clear()
+        self.mdi_area.active = None
+        self.exported.clear()
+
+
+def address(row: int, column: int) -> str:
+    letters = ""
+    column += 1
+    while column:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return f"{letters}{row + 1}"
+
+
+def minimal_pdf() -> bytes:
+    """A one page PDF laid out the way Qt writes them."""
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 1189 841] /Contents 4 0 R >>",
+        b"<< /Length 5 0 R >>\nstream\n0 0 m 1189 841 l S\nendstream",
+        b"22",
+    ]
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    data += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    data += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+
+    return bytes(data)
+
+
+# Modules
+
+
+def build_freecad(session: Session) -> types.ModuleType:
+    module = types.ModuleType("FreeCAD")
+
+    def ParamGet(path: str) -> ParameterGrp:
+        record("FreeCAD.ParamGet")
+        return session.parameters.get(path)
+
+    def activeDocument() -> Document | None:
+        record("FreeCAD.activeDocument")
+        return session.active_document
+
+    def newDocument(name: str = "Unnamed") -> Document:
+        record("FreeCAD.newDocument")
+        return session.new_document(name)
+
+    def getDocument(name: str) -> Document:
+        record("FreeCAD.getDocument")
+        return session.documents[name]
+
+    def listDocuments() -> dict[str, Document]:
+        record("FreeCAD.listDocuments")
+        return dict(session.documents)
+
+    def addDocumentObserver(observer: Any) -> None:
+        record("FreeCAD.addDocumentObserver")
+        OBSERVERS.append(observer)
+
+    def setActiveDocument(name: str) -> None:
+        record("FreeCAD.setActiveDocument")
+        session.active_document = session.documents[name]
+
+    module.__dict__.update(
+        ParamGet=ParamGet,
+        activeDocument=activeDocument,
+        newDocument=newDocument,
+        getDocument=getDocument,
+        listDocuments=listDocuments,
+        addDocumentObserver=addDocumentObserver,
+        setActiveDocument=setActiveDocument,
+        Material=Material,
+        Units=types.SimpleNamespace(Quantity=Quantity),
+        Vector=Vector,
+        getUserAppDataDir=lambda: f"{session.user_app_data}/",
+        getUserCachePath=lambda: f"{session.user_app_data}/cache/",
+        getUserMacroDir=lambda *args: f"{session.user_app_data}/Macro/",
+        getHomePath=lambda: f"{session.user_app_data}/home/",
+        Version=lambda: ["1", "0", "0"],
+    )
+
+    # `FreeCAD.ActiveDocument` is a property on the real module.
+    class FreeCADModule(types.ModuleType):
+        @property
+        def ActiveDocument(self) -> Document | None:
+            record("FreeCAD.ActiveDocument")
+            return session.active_document
+
+    module.__class__ = FreeCADModule
+
+    return module
+
+
+def build_freecad_gui(session: Session) -> types.ModuleType:
+    module = types.ModuleType("FreeCADGui")
+
+    def getMainWindow() -> QMainWindow:
+        record("FreeCADGui.getMainWindow")
+        return session.main_window
+
+    def activeWorkbench() -> Workbench:
+        record("FreeCADGui.activeWorkbench")
+        return session.workbench
+
+    def export(objects: list[Any], path: str, options: Any = None) -> None:
+        record("FreeCADGui.export")
+        session.exported.append((objects, path))
+
+        if path.endswith(".pdf"):
+            Path(path).write_bytes(minimal_pdf())
+        else:
+            Path(path).write_text("<svg xmlns='http://www.w3.org/2000/svg'/>")
+
+    def exportOptions(path: str) -> dict:
+        record("FreeCADGui.exportOptions")
+        return {}
+
+    command = types.ModuleType("FreeCADGui.Command")
+    command.__dict__.update(
+        findCustomCommand=session.commands.findCustomCommand,
+        removeCustomCommand=session.commands.removeCustomCommand,
+        createCustomCommand=session.commands.createCustomCommand,
+        get=session.commands.get,
+    )
+
+    module.__dict__.update(
+        Selection=session.selection,
+        ActiveDocument=types.SimpleNamespace(ActiveView=View3D()),
+        Command=command,
+        getMainWindow=getMainWindow,
+        activeWorkbench=activeWorkbench,
+        export=export,
+        exportOptions=exportOptions,
+    )
+
+    return module
+
+
+class QImage:
+    Format_ARGB32_Premultiplied = 6
+
+    def __init__(self, width: int, height: int, format: int) -> None:
+        self.width = width
+        self.height = height
+
+    def fill(self, color: Any) -> None:
+        pass
+
+    def save(self, path: str, format: str) -> bool:
+        record("QImage.save")
+        Path(path).write_bytes(b"\x89PNG\r\n\x1a\n")
+        return True
+
+
+class QPainter:
+    Antialiasing = 1
+
+    def __init__(self, image: QImage) -> None:
+        self.image = image
+
+    def setRenderHint(self, hint: int) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+class QSvgRenderer:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    def isValid(self) -> bool:
+        return True
+
+    def render(self, painter: QPainter) -> None:
+        record("QSvgRenderer.render")
+
+
+def build_pyside() -> dict[str, types.ModuleType]:
+    qt_core = types.ModuleType("PySide.QtCore")
+    qt_core.Qt = types.SimpleNamespace(DisplayRole=0, EditRole=2, transparent=0)
+    qt_core.QByteArray = bytes
+
+    qt_widgets = types.ModuleType("PySide.QtWidgets")
+    qt_widgets.__dict__.update(
+        QDockWidget=QDockWidget,
+        QMainWindow=QMainWindow,
+        QMdiArea=QMdiArea,
+        QTableView=QTableView,
+        QMessageBox=types.SimpleNamespace(),
+    )
+
+    # FreeCAD's PySide shim also exposes the widgets through `QtGui`.
+    qt_gui = types.ModuleType("PySide.QtGui")
+    qt_gui.__dict__.update(qt_widgets.__dict__ | {"__name__": "PySide.QtGui"})
+    qt_gui.__dict__.update(QImage=QImage, QPainter=QPainter)
+
+    qt_svg = types.ModuleType("PySide.QtSvg")
+    qt_svg.QSvgRenderer = QSvgRenderer
+
+    pyside = types.ModuleType("PySide")
+    pyside.__path__ = []
+    pyside.__dict__.update(
+        QtCore=qt_core, QtGui=qt_gui, QtSvg=qt_svg, QtWidgets=qt_widgets
+    )
+
+    return {
+        "PySide": pyside,
+        "PySide.QtCore": qt_core,
+        "PySide.QtGui": qt_gui,
+        "PySide.QtSvg": qt_svg,
+        "PySide.QtWidgets": qt_widgets,
+    }
+
+
+def build_mesh_part() -> types.ModuleType:
+    def meshFromShape(
+        Shape: Shape,
+        LinearDeflection: float,
+        AngularDeflection: float,
+        Relative: bool = False,
+    ) -> types.SimpleNamespace:
+        record("MeshPart.meshFromShape")
+
+        # Curved faces need more triangles the smaller either deflection is. Every
+        # face needs at least two.
+        box = Shape.BoundBox
+        segments = (box.XLength / LinearDeflection) ** 0.5 + 1 / AngularDeflection
+        facets = len(Shape.Faces) * (2 + int(segments))
+
+        return types.SimpleNamespace(CountFacets=facets)
+
+    module = types.ModuleType("MeshPart")
+    module.meshFromShape = meshFromShape
+
+    return module
+
+
+def build_part() -> types.ModuleType:
+    def getShape(obj: DocumentObject, subname: str = "", **kwargs: Any) -> Shape:
+        record("Part.getShape")
+
+        while isinstance(obj, Link) and obj.LinkedObject is not None:
+            obj = obj.LinkedObject
+
+        # Objects without a shape get a null one.
+        return getattr(obj, "Shape", None) or Shape(faces=0)
+
+    module = types.ModuleType("Part")
+    module.getShape = getShape
+
+    return module
+
+
+def build_import_gui(session: Session) -> types.ModuleType:
+    def export(objects: list[Any], path: str, options: Any = None) -> None:
+        record("ImportGui.export")
+        session.exported.append((objects, path))
+        Path(path).write_text("ISO-10303-21;\nEND-ISO-10303-21;\n")
+
+    module = types.ModuleType("ImportGui")
+    module.export = export
+
+    return module
+
+
+def build_techdraw_gui(session: Session) -> types.ModuleType:
+    # Rendering from the page's view provider needs FreeCAD 0.21 or newer.
+    def exportPageAsPdf(page: Any, path: str) -> None:
+        record("TechDrawGui.exportPageAsPdf")
+        session.exported.append(([page], path))
+        Path(path).write_bytes(minimal_pdf())
+
+    def exportPageAsSvg(page: Any, path: str) -> None:
+        record("TechDrawGui.exportPageAsSvg")
+        session.exported.append(([page], path))
+        Path(path).write_text("<svg xmlns='http://www.w3.org/2000/svg'/>")
+
+    module = types.ModuleType("TechDrawGui")
+    module.exportPageAsPdf = exportPageAsPdf
+    module.exportPageAsSvg = exportPageAsSvg
+
+    return module
+
+
+def install() -> Session:
+    """Register the stand-in modules and return the session behind them."""
+
+    session = Session()
+
+    freecad = build_freecad(session)
+    freecad_gui = build_freecad_gui(session)
+
+    sys.modules["FreeCAD"] = freecad
+    sys.modules["FreeCADGui"] = freecad_gui
+    sys.modules["FreeCADGui.Command"] = freecad_gui.Command
+    sys.modules["MeshPart"] = build_mesh_part()
+    sys.modules["Part"] = build_part()
+    sys.modules["ImportGui"] = build_import_gui(session)
+    sys.modules["TechDrawGui"] = build_techdraw_gui(session)
+    sys.modules.update(build_pyside())
+
+    return session
@@ -0,0 +1,209 @@
+"""Generate synthetic documents for the stand-in FreeCAD."""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from benchmarks.standin import (
+    DrawPage,
+    Link,
+    ModelIndex,
+    PartFeature,
+    Session,
+    Shape,
+    Sheet,
+    address,
+)
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+TYPE_ID_FEATURE = "Part::Feature"
+TYPE_ID_LINK = "App::Link"
+TYPE_ID_PAGE = "TechDraw::DrawPage"
+TYPE_ID_PROJECTION = "TechDraw::DrawProjGroupItem"
+TYPE_ID_SHEET = "Spreadsheet::Sheet"
+TYPE_ID_SKETCH = "Sketcher::SketchObject"
+
+
+@dataclass
+class DocumentSpec:
+    """The shape of a synthetic document.
+
+    The ratios are fractions of `objects`. Whatever isn't a sketch or a projection is
+    a plain `Part::Feature`.
+    """
+
+    objects: int = 1_000
+    sketch_ratio: float = 0.2
+    projection_ratio: float = 0.1
+    pages: int = 10
+    sheet_rows: int = 100
+    sheet_columns: int = 10
+
+    @classmethod
+    def of_size(cls, size: int) -> DocumentSpec:
+        """A spec that scales pages and the sheet with the number of objects."""
+
+        return cls(
+            objects=size,
+            pages=max(1, size // 100),
+            sheet_rows=max(1, size // 10),
+        )
+
+
+def generate_document(session: Session, spec: DocumentSpec, name: str = "Synthetic"):
+    document = session.new_document(name)
+    document.FileName = f"/tmp/{name}.FCStd"
+
+    sketches = int(spec.objects * spec.sketch_ratio)
+    projections = int(spec.objects * spec.projection_ratio)
+    features = max(0, spec.objects - sketches - projections)
+
+    for i in range(features):
+        obj = document.addObject(TYPE_ID_FEATURE, f"Feature{i}")
+        obj._label = f"Part_{i:06d}_imported"
+
+        # A few large assemblies with many faces among many small parts.
+        if i % 50 == 0:
+            obj.Shape = Shape(size=1_000.0, faces=2_000)
+        else:
+            obj.Shape = Shape(size=5.0 + i % 100, faces=6 + i % 40)
+
+    previous = None
+
+    for i in range(sketches):
+        sketch = document.addObject(TYPE_ID_SKETCH, f"Sketch{i}")
+        sketch._label = f"Sketch_{i:06d}"
+
+        # Chain every sketch to the one before it and every tenth to the first.
+        if previous is not None:
+            sketch.ExternalGeometry.append((previous, ["Edge1"]))
+        if i % 10 == 0 and sketches:
+            first = document._objects[features]
+            sketch.ExternalGeometry.append((first, ["Edge2"]))
+
+        previous = sketch
+
+    for i in range(projections):
+        projection = document.addObject(TYPE_ID_PROJECTION, f"ProjItem{i}")
+        projection._label = f"View_{i:06d}"
+        projection.ViewObject.__dict__.update(
+            ExtraWidth="0.7 mm",
+            IsoWidth="0.35 mm",
+            LineWidth="0.35 mm",
+            HiddenWidth="0.35 mm",
+        )
+
+    for i in range(spec.pages):
+        page = document.addObject(TYPE_ID_PAGE, f"Page{i}")
+        page._label = f"Sheet_{spec.pages - i:04d}"
+
+    if spec.sheet_rows and spec.sheet_columns:
+        sheet = document.addObject(TYPE_ID_SHEET, "Spreadsheet")
+        fill_sheet(sheet, spec.sheet_rows, spec.sheet_columns)
+
+    return document
+
+
+def fill_sheet(sheet: Sheet, rows: int, columns: int) -> None:
+    for row in range(rows):
+        for column in range(columns):
+            cell = address(row, column)
+
+            if column == 0:
+                sheet.cells[cell] = f"param_{row}"
+            elif row and column == 1:
+                sheet.cells[cell] = f"={address(row - 1, 1)} + 1"
+            else:
+                sheet.cells[cell] = str(row * columns + column)
+
+
+def bind_features(document, sheet: Sheet, every: int = 10) -> None:
+    """Alias the sheet's second column and bind every few features to it.
+
+    Each bound feature has the next few features downstream of it.
+    """
+
+    bound = features(document)
+    rows = len({cell for cell in sheet.cells if cell.startswith("B")})
+
+    for row in range(rows):
+        sheet.aliases[address(row, 1)] = f"length_{row}"
+
+    for i in range(0, len(bound), every):
+        row = (i // every) % max(1, rows)
+        feature = bound[i]
+        feature.ExpressionEngine = [
+            ("Placement.Base.x", f"{sheet.Name}.length_{row} * 2"),
+            ("Placement.Base.y", f"<<{sheet.Label}>>.C{row + 1} + 1 mm"),
+        ]
+
+        feature.InList += bound[i + 1 : i + 3]
+
+
+def link_features(document, sources: int = 50) -> list[Link]:
+    """Add a link for every feature to one of the first few features, like an
+    assembly of repeated parts.
+
+    The features are hidden so only the links are drawn.
+    """
+
+    linked = features(document)
+    sources = min(sources, len(linked))
+    links = []
+
+    for i, feature in enumerate(linked):
+        link = document.addObject(TYPE_ID_LINK, f"Link{i}")
+        link._label = f"{feature.Label}_link"
+        link.LinkedObject = linked[i % sources]
+        links.append(link)
+
+    for feature in linked:
+        feature.ViewObject.__dict__["Visibility"] = False
+
+    return links
+
+
+def write_sheet_csv(sheet: Sheet, rows: int, columns: int, path: Path) -> None:
+    """Write the sheet's contents to a CSV with every other row changed."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with path.open("w", newline="") as f:
+        writer = csv.writer(f)
+
+        for row in range(rows):
+            values = [
+                sheet.cells.get(address(row, column), "") for column in range(columns)
+            ]
+
+            if row % 2:
+                values[-1] = f"{values[-1]}0"
+
+            writer.writerow(values)
+
+
+def select_sheet(session: Session, sheet: Sheet, rows: int, columns: int) -> None:
+    """Open a sheet view with the given block of cells selected."""
+
+    selected = [
+        ModelIndex(row, column) for row in range(rows) for column in range(columns)
+    ]
+    session.open_sheet_view(sheet, selected)
+
+
+def pages(document) -> list[DrawPage]:
+    return [obj for obj in document._objects if isinstance(obj, DrawPage)]
+
+
+def features(document) -> list[PartFeature]:
+    return [obj for obj in document._objects if isinstance(obj, PartFeature)]
+
+
+def sheets(document) -> list[Sheet]:
+    return [obj for obj in document._objects if isinstance(obj, Sheet)]
@@ -6,16 +6,23 @@
 
 import shutil
 import subprocess
+import sys
+import time
 import tomllib
 from collections.abc import Iterator
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any, TypeVar
 
-import FreeCAD
-import FreeCADGui
-from FreeCADGui import Command
-from PySide import QtWidgets
+try:
+    import FreeCAD
+    import FreeCADGui
+    from FreeCADGui import Command
+    from PySide import QtCore, QtWidgets
+except ImportError:
+    # The models and loaders are also used by the tools in `tools/` which run outside
+    # of FreeCAD. Only the install functions need FreeCAD.
+    pass
 
 
 NAME = "FreeCADConfig"
@@ -30,6 +37,7 @@ SUBPATH_SRC = Path() / "src"
 SUBPATH_CONFIG = SUBPATH_SRC / "config"
 SUBPATH_ICONS = SUBPATH_SRC / "icons"
 SUBPATH_MACROS = SUBPATH_SRC / "macros"
+SUBPATH_LAUNCHERS = SUBPATH_MACROS / "launchers"
 SUBPATH_ADDONS_TOML = SUBPATH_CONFIG / NAME_ADDONS_TOML
 SUBPATH_MACROS_TOML = SUBPATH_CONFIG / NAME_MACROS_TOML
 SUBPATH_PREFERENCES_TOML = SUBPATH_CONFIG / NAME_PREFERENCES_TOML
@@ -37,6 +45,28 @@ SUBPATH_SHORTCUTS_TOML = SUBPATH_CONFIG / NAME_SHORTCUTS_TOML
 
 ICON_MACRO_DEFAULT = "freecad.svg"
 
+# Shortcut commands run these launchers instead of the macros themselves. They hand
+# off to the resident macro host which keeps each macro loaded between runs.
+TEMPLATE_LAUNCHER = """\
+# Generated by {name}'s install.py. Do not edit.
+from freecadconfig import host
+
+host.dispatch({file!r})
+"""
+
+# A `Mod` FreeCAD runs on startup to record which workbenches and macros are used.
+TEMPLATE_STARTUP = """\
+# Generated by {name}'s install.py. Do not edit.
+import sys
+
+if {path!r} not in sys.path:
+    sys.path.append({path!r})
+
+from freecadconfig import usage
+
+usage.start()
+"""
+
 P_ROOT = Path("User parameter:")
 P_SUBPATH_MACROPATH = Path() / "BaseApp" / "Preferences" / "Macro" / "MacroPath"
 P_SUBPATH_MACROS = Path() / "BaseApp" / "Macro" / "Macros"
@@ -90,6 +120,55 @@ class Shortcut(Config):
     shortcut: str
 
 
+@dataclass
+class CommandState:
+    """A macro command as it's stored in the `Macros` parameter group."""
+
+    script: str
+    menu: str
+    pixmap: str
+    accel: str
+    tooltip: str
+
+    @classmethod
+    def from_macro(cls, macro: Macro) -> "CommandState":
+        return cls(
+            script=macro.file,
+            menu=macro.name,
+            pixmap=str(macro.icon),
+            accel=macro.shortcut,
+            tooltip=macro.tooltip,
+        )
+
+    @classmethod
+    def from_group(cls, group: Any) -> "CommandState":
+        strings = read_strings(group)
+
+        return cls(
+            script=strings.get("Script", ""),
+            menu=strings.get("Menu", ""),
+            pixmap=strings.get("Pixmap", ""),
+            accel=strings.get("Accel", ""),
+            tooltip=strings.get("Tooltip", ""),
+        )
+
+    def matches(self, other: "CommandState") -> bool:
+        """Whether the commands only differ by their shortcut, which can be changed
+        without recreating the command."""
+
+        return replace(self, accel="") == replace(other, accel="")
+
+    def write(self, group: Any) -> None:
+        group.SetString("Script", self.script)
+        group.SetString("Menu", self.menu)
+        group.SetString("Pixmap", self.pixmap)
+        group.SetString("Accel", self.accel)
+        group.SetString("Tooltip", self.tooltip)
+        group.SetString("Statustip", "")
+        group.SetString("WhatsThis", "")
+        group.SetBool("System", False)
+
+
 # Install Functions
 
 
@@ -153,48 +232,96 @@ def install_macros(path_config_root: Path | str) -> None:
     # Set the path to the macors source.
     set_preference(P_SUBPATH_MACROPATH, str(path_macro_src))
 
-    print(" Removing old toolbar…")
-    toolbar_global = FreeCAD.ParamGet(str(P_ROOT / P_SUBPATH_TOOLBAR))
-    toolbar_global.RemGroup(NAME_TOOLBAR)
+    # FreeCAD adds `MacroPath` to `sys.path` on startup. Add it to the current
+    # session so the macros can import their shared `freecadconfig` package
+    # without a restart.
+    if str(path_macro_src) not in sys.path:
+        sys.path.append(str(path_macro_src))
 
-    print(f" Building {NAME} toolbar…")
-    toolbar_fcm = toolbar_global.GetGroup(NAME_TOOLBAR)
-    toolbar_fcm.SetString("Name", NAME)
-    toolbar_fcm.SetBool("Active", True)
+    print(" Writing launchers…")
+    path_launchers = path_config_root / SUBPATH_LAUNCHERS
+    launchers = write_launchers(path_launchers, macros_config)
+
+    print(" Rendering icons…")
+    path_icons_cache = Path(FreeCAD.getUserCachePath()) / NAME / "icons"
+
+    # Most macros share the default icon.
+    cached_icons: dict[str, Path] = {}
+
+    for macro in macros_config:
+        icon = str(macro.icon or ICON_MACRO_DEFAULT)
+
+        if icon not in cached_icons:
+            cached_icons[icon] = cache_icon(
+                path_config_root / SUBPATH_ICONS / icon, path_icons_cache
+            )
+
+        macro.icon = str(cached_icons[icon])
+
+    macros_group = FreeCAD.ParamGet(str(P_ROOT / P_SUBPATH_MACROS))
+    shortcuts_group = FreeCAD.ParamGet(str(P_ROOT / P_SUBPATH_SHORTCUTS))
+
+    registered = read_registered_commands(macros_group)
+    shortcuts = read_strings(shortcuts_group)
+
+    changed = False
+    toolbar_commands: dict[str, str] = {}
 
     for macro in macros_config:
         print(f"\nRegistering '{macro.name}'…")
 
-        command: str = Command.findCustomCommand(macro.file)
+        # Fall back to commands that ran the macro directly before launchers existed.
+        command, current = registered.pop(
+            launchers[macro.file], None
+        ) or registered.pop(macro.file, (None, None))
 
-        if command:
-            print(" Removing old version…")
-            Command.removeCustomCommand(command)
+        macro.file = launchers[macro.file]
+        desired = CommandState.from_macro(macro)
 
-        macro.icon = str(
-            path_config_root / SUBPATH_ICONS / (macro.icon or ICON_MACRO_DEFAULT)
-        )
+        if command is None or current is None or not current.matches(desired):
+            if command is not None:
+                print(" Removing old version…")
+                Command.removeCustomCommand(command)
+                macros_group.RemGroup(command)
 
-        command = Command.createCustomCommand(**macro.as_command())
+            command = Command.createCustomCommand(**macro.as_command())
+            desired.write(macros_group.GetGroup(command))
 
-        group = FreeCAD.ParamGet(str(P_ROOT / P_SUBPATH_MACROS))
-        group = group.GetGroup(command)
-        group.SetString("Script", macro.file)
-        group.SetString("Menu", macro.name)
-        group.SetString("Pixmap", macro.icon)
-        group.SetString("Accel", macro.shortcut)
-        group.SetString("Tooltip", macro.tooltip)
-        group.SetString("Statustip", "")
-        group.SetString("WhatsThis", "")
-        group.SetBool("System", False)
+            print(" Setting shorcut…")
+            set_shortcut(command, macro.shortcut)
+            changed = True
+
+        elif current.accel != desired.accel or shortcuts.get(command) != macro.shortcut:
+            print(" Updating shorcut…")
+            Command.get(command).setShortcut(macro.shortcut)
+            macros_group.GetGroup(command).SetString("Accel", macro.shortcut)
+            set_shortcut(command, macro.shortcut)
+            changed = True
 
-        print(" Setting shorcut…")
-        set_shortcut(command, macro.shortcut)
+        else:
+            print(" Up to date.")
+
+        toolbar_commands[command] = macro.name
+
+    # Anything left with a launcher was installed for a macro that has since been
+    # removed from the config.
+    for script, (command, _) in registered.items():
+        if not script.startswith(f"{SUBPATH_LAUNCHERS.name}/"):
+            continue
+
+        print(f"\nRemoving '{command}'…")
+        Command.removeCustomCommand(command)
+        macros_group.RemGroup(command)
+        shortcuts_group.RemString(command)
+        changed = True
+
+    toolbar_global = FreeCAD.ParamGet(str(P_ROOT / P_SUBPATH_TOOLBAR))
 
-        print(" Adding to toolbar…")
-        toolbar_fcm.SetString(command, macro.name)
+    if install_toolbar(toolbar_global, toolbar_commands):
+        changed = True
 
-    FreeCADGui.activeWorkbench().reloadActive()
+    if changed:
+        FreeCADGui.activeWorkbench().reloadActive()
 
 
 def install_preferences(path_config_root: Path | str) -> None:
@@ -234,6 +361,119 @@ def install_shortcuts(path_config_root: Path | str) -> None:
         )
 
 
+def install_toolbar(toolbar_global: Any, commands: dict[str, str]) -> bool:
+    """Build the toolbar unless it already has exactly these commands in this order.
+
+    Returns:
+        Whether the toolbar was rebuilt.
+    """
+
+    toolbar_fcm = toolbar_global.GetGroup(NAME_TOOLBAR)
+    contents = toolbar_fcm.GetContents() or []
+
+    strings = [(name, value) for kind, name, value in contents if kind == "String"]
+    bools = {name: value for kind, name, value in contents if kind == "Boolean"}
+
+    if strings == [("Name", NAME), *commands.items()] and bools == {"Active": True}:
+        return False
+
+    print(f"\nBuilding {NAME} toolbar…")
+    toolbar_global.RemGroup(NAME_TOOLBAR)
+
+    toolbar_fcm = toolbar_global.GetGroup(NAME_TOOLBAR)
+    toolbar_fcm.SetString("Name", NAME)
+    toolbar_fcm.SetBool("Active", True)
+
+    for command, name in commands.items():
+        toolbar_fcm.SetString(command, name)
+
+    return True
+
+
+def cache_icon(path_icon: Path, path_cache: Path) -> Path:
+    """Returns a pre-rendered PNG for an icon or the icon itself if it can't be
+    rendered."""
+
+    # Imported here as `freecadconfig` is only importable once `MacroPath` is set.
+    from freecadconfig import icons
+
+    try:
+        return icons.cache_icon(path_icon, path_cache)
+    except (ImportError, OSError, ValueError) as e:
+        print(f" Using '{path_icon.name}' as is: {e}")
+        return path_icon
+
+
+def install_startup_mod(path_config_root: Path | str) -> None:
+    path_config_root = Path(path_config_root).expanduser()
+    path_macro_src = path_config_root / SUBPATH_MACROS
+
+    path_mod = Path(FreeCAD.getUserAppDataDir()) / "Mod" / NAME
+    path_mod.mkdir(parents=True, exist_ok=True)
+
+    print(f"Installing {NAME} startup Mod…")
+    (path_mod / "InitGui.py").write_text(
+        TEMPLATE_STARTUP.format(name=NAME, path=str(path_macro_src))
+    )
+
+
+def write_launchers(path_launchers: Path, macros: list[Macro]) -> dict[str, str]:
+    """Write a launcher for each macro and remove the launchers of removed macros.
+
+    Launchers that are already up to date aren't rewritten.
+
+    Returns:
+        The macro files mapped to their launcher's path relative to the macros
+        directory.
+    """
+
+    path_launchers.mkdir(parents=True, exist_ok=True)
+
+    launchers = {}
+
+    for macro in macros:
+        launcher = path_launchers / macro.file
+        text = TEMPLATE_LAUNCHER.format(name=NAME, file=macro.file)
+
+        if not launcher.exists() or launcher.read_text() != text:
+            launcher.write_text(text)
+
+        launchers[macro.file] = f"{path_launchers.name}/{macro.file}"
+
+    for launcher in path_launchers.glob("*.py"):
+        if launcher.name not in launchers:
+            launcher.unlink()
+
+    return launchers
+
+
+# Get Functions
+
+
+def read_registered_commands(
+    macros_group: Any,
+) -> dict[str, tuple[str, CommandState]]:
+    """Returns every macro command in the `Macros` group keyed by its script."""
+
+    registered = {}
+
+    for command in macros_group.GetGroups():
+        state = CommandState.from_group(macros_group.GetGroup(command))
+        registered[state.script] = (command, state)
+
+    return registered
+
+
+def read_strings(group: Any) -> dict[str, str]:
+    """Returns a parameter group's strings in one call instead of one per name."""
+
+    return {
+        name: value
+        for kind, name, value in group.GetContents() or []
+        if kind == "String"
+    }
+
+
 # Set Functions
 
 
@@ -247,24 +487,338 @@ def set_preferences(subpaths: list[Path] | list[str], value: Any) -> None:
         set_preference(subpath, value)
 
 
+def set_parameter(subpath: Path | str, value: Any) -> None:
+    """Set a shortcut or a preference by its path relative to the root."""
+
+    subpath = Path(subpath)
+
+    if subpath.parent == P_SUBPATH_SHORTCUTS:
+        set_shortcut(subpath.name, value)
+        return
+
+    set_preference(subpath, value)
+
+
+def remove_parameter(subpath: Path | str, value: Any) -> None:
+    """Remove a shortcut or a preference that was set to `value` by its path relative
+    to the root. FreeCAD keeps a separate value per type so the type is needed."""
+
+    subpath = Path(subpath)
+
+    group = FreeCAD.ParamGet(str(P_ROOT / subpath.parent))
+
+    kind, _ = encode_preference(value)
+
+    getattr(group, f"Rem{kind}")(subpath.name)
+
+
 def set_preference(subpath: Path | str, value: Any) -> None:
     subpath = Path(subpath)
 
     preference = FreeCAD.ParamGet(str(P_ROOT / subpath.parent))
 
+    kind, value = encode_preference(value)
+
+    getattr(preference, f"Set{kind}")(subpath.name, value)
+
+
+def encode_preference(value: Any) -> tuple[str, Any]:
+    """Returns the parameter type a value is stored as and the value to store.
+
+    The type is the suffix of the matching `ParameterGrp` method e.g. `Bool` for
+    `SetBool`.
+    """
+
     if type(value) is bool:
-        preference.SetBool(subpath.name, value)
+        return "Bool", value
     if type(value) is int:
         if value > 100_000:
-            preference.SetUnsigned(subpath.name, value)
-        else:
-            preference.SetInt(subpath.name, value)
+            return "Unsigned", value
+        return "Int", value
     if type(value) is float:
-        preference.SetFloat(subpath.name, value)
+        return "Float", value
     if type(value) is str:
-        preference.SetString(subpath.name, value)
+        return "String", value
     if type(value) is list:
-        preference.SetString(subpath.name, f"{','.join(value)},")
+        return "String", f"{','.join(value)},"
+
+    raise TypeError(f"Unsupported preference value {value!r}.")
+
+
+# Desired State
+
+
+def desired_parameters(path_config_root: Path | str) -> dict[str, tuple[str, Any]]:
+    """Returns every parameter `install_shortcuts` and `install_preferences` set.
+
+    Parameters are keyed by their path relative to the `User parameter:` root and
+    their values are encoded with `encode_preference`. Later entries override earlier
+    ones in the same order as `run_install_configs` applies them.
+    """
+
+    return {
+        path: encode_preference(value)
+        for path, value in config_parameters(path_config_root).items()
+    }
+
+
+def config_parameters(path_config_root: Path | str) -> dict[str, Any]:
+    """Returns the value of every parameter `install_shortcuts` and
+    `install_preferences` set, keyed the same way as `desired_parameters`."""
+
+    path_config_root = Path(path_config_root).expanduser()
+
+    parameters: dict[str, Any] = {}
+
+    shortcuts_config = load_config(
+        path_config_root / SUBPATH_SHORTCUTS_TOML,
+        model=Shortcut,
+    )
+
+    for shortcut in shortcuts_config:
+        path = (P_SUBPATH_SHORTCUTS / shortcut.command).as_posix()
+        parameters[path] = shortcut.shortcut
+
+    preferences_config = load_config(
+        path_config_root / SUBPATH_PREFERENCES_TOML,
+        model=Preference,
+    )
+
+    for preference in preferences_config:
+        paths = preference.path
+
+        if not isinstance(paths, list):
+            paths = [paths]
+
+        for path in paths:
+            parameters[Path(path).as_posix()] = preference.value
+
+    return parameters
+
+
+# Watch
+
+
+@dataclass
+class ConfigState:
+    """The config as the watcher last applied it."""
+
+    parameters: dict[str, Any]
+    macros: list[Macro]
+    # The configured macros whose source files exist.
+    sources: set[str]
+    mtimes: dict[Path, int] = field(default_factory=dict)
+
+
+class ConfigWatcher:
+    """Apply config changes as they're saved while FreeCAD's GUI is running.
+
+    `QFileSystemWatcher` uses the platform's file events e.g. inotify. A burst of
+    saves restarts the debounce timer so the changes are applied once.
+    """
+
+    def __init__(self, path_config_root: Path, debounce: float = 0.3) -> None:
+        self.path_config_root = path_config_root
+        self.state = read_config_state(path_config_root)
+
+        self.timer = QtCore.QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(int(debounce * 1000))
+        self.timer.timeout.connect(self.apply)
+
+        self.watcher = QtCore.QFileSystemWatcher()
+        self.watcher.fileChanged.connect(self.schedule)
+        self.watcher.directoryChanged.connect(self.schedule)
+        self.watch_paths()
+
+    def watch_paths(self) -> None:
+        """Watch the directories and every file in them.
+
+        Editors that save by replacing a file drop it from the watcher so this is
+        repeated after every change.
+        """
+
+        paths = {
+            str(self.path_config_root / SUBPATH_CONFIG),
+            str(self.path_config_root / SUBPATH_MACROS),
+            *(str(path) for path in self.state.mtimes),
+        }
+        paths -= {*self.watcher.files(), *self.watcher.directories()}
+
+        if paths:
+            self.watcher.addPaths(sorted(paths))
+
+    def schedule(self, path: str) -> None:
+        self.timer.start()
+
+    def apply(self) -> None:
+        self.state = apply_config_changes_safely(self.path_config_root, self.state)
+        self.watch_paths()
+
+    def stop(self) -> None:
+        self.timer.stop()
+        paths = [*self.watcher.files(), *self.watcher.directories()]
+
+        if paths:
+            self.watcher.removePaths(paths)
+
+
+def watch_headless(
+    path_config_root: Path,
+    interval: float = 0.5,
+    debounce: float = 0.3,
+) -> None:
+    """Poll for config changes and apply them until interrupted.
+
+    `FreeCADCmd` has no event loop to deliver file events so the files' modification
+    times are polled instead. Parameters are saved after every change as FreeCADCmd
+    only saves them when it exits.
+    """
+
+    state = read_config_state(path_config_root)
+
+    try:
+        while True:
+            time.sleep(interval)
+            mtimes = read_mtimes(path_config_root)
+
+            if mtimes == state.mtimes:
+                continue
+
+            # Wait for a burst of saves to settle.
+            while True:
+                time.sleep(debounce)
+                settled = read_mtimes(path_config_root)
+
+                if settled == mtimes:
+                    break
+
+                mtimes = settled
+
+            state = apply_config_changes_safely(path_config_root, state, macros=False)
+            FreeCAD.saveParameter()
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+
+
+def read_config_state(path_config_root: Path) -> ConfigState:
+    macros = list(load_config(path_config_root / SUBPATH_MACROS_TOML, model=Macro))
+    path_macro_src = path_config_root / SUBPATH_MACROS
+    sources = {macro.file for macro in macros if (path_macro_src / macro.file).exists()}
+
+    return ConfigState(
+        parameters=config_parameters(path_config_root),
+        macros=macros,
+        sources=sources,
+        mtimes=read_mtimes(path_config_root),
+    )
+
+
+def read_mtimes(path_config_root: Path) -> dict[Path, int]:
+    """Returns the modification time of every config file and macro source."""
+
+    path_launchers = path_config_root / SUBPATH_LAUNCHERS
+
+    paths = [
+        *(path_config_root / SUBPATH_CONFIG).glob("*.toml"),
+        *(
+            path
+            for path in (path_config_root / SUBPATH_MACROS).rglob("*.py")
+            # `install_macros` writes the launchers so they'd trigger themselves.
+            if not path.is_relative_to(path_launchers)
+        ),
+    ]
+
+    mtimes = {}
+
+    for path in paths:
+        try:
+            mtimes[path] = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            # Deleted while listing.
+            continue
+
+    return mtimes
+
+
+def apply_config_changes(
+    path_config_root: Path,
+    previous: ConfigState,
+    macros: bool = True,
+) -> ConfigState:
+    """Apply only what changed in the config since the previous state.
+
+    Changed shortcuts and preferences are set one by one and the ones removed from the
+    config are removed from FreeCAD's parameters. Macros are only installed again if
+    `macros.toml` or the set of their source files changed.
+    """
+
+    start = time.perf_counter()
+    current = read_config_state(path_config_root)
+
+    for path in sorted(current.mtimes.keys() - previous.mtimes.keys()):
+        print(f"Added {path.relative_to(path_config_root)}")
+
+    for path, mtime in sorted(current.mtimes.items()):
+        if path in previous.mtimes and previous.mtimes[path] != mtime:
+            print(f"Changed {path.relative_to(path_config_root)}")
+
+    changed = 0
+    removed = 0
+
+    for path in sorted(previous.parameters.keys() - current.parameters.keys()):
+        print(f" Removing {path}")
+        remove_parameter(path, previous.parameters[path])
+        removed += 1
+
+    for path, value in current.parameters.items():
+        kind, encoded = encode_preference(value)
+
+        if path in previous.parameters:
+            # Encoded so `true` and `1` aren't mistaken for the same value.
+            previous_kind, previous_encoded = encode_preference(
+                previous.parameters[path]
+            )
+
+            if (previous_kind, previous_encoded) == (kind, encoded):
+                continue
+
+            # The value under the previous type would otherwise be left behind.
+            if previous_kind != kind:
+                remove_parameter(path, previous.parameters[path])
+
+        print(f" Setting {path} = {value!r}")
+        set_parameter(path, value)
+        changed += 1
+
+    if current.macros != previous.macros or current.sources != previous.sources:
+        if macros:
+            install_macros(path_config_root)
+        else:
+            print(" Skipped the macros. They can only be installed in FreeCAD's GUI.")
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Applied {changed} changed and {removed} removed parameters in "
+        f"{elapsed * 1000:.0f}ms."
+    )
+
+    return current
+
+
+def apply_config_changes_safely(
+    path_config_root: Path,
+    previous: ConfigState,
+    macros: bool = True,
+) -> ConfigState:
+    """Apply the changes or, if the config can't be loaded e.g. it's half edited,
+    keep the previous state so they're applied after the next save."""
+
+    try:
+        return apply_config_changes(path_config_root, previous, macros)
+    except (OSError, RuntimeError, TypeError, tomllib.TOMLDecodeError) as e:
+        print(f"Unable to apply the config: {e}")
+        return replace(previous, mtimes=read_mtimes(path_config_root))
 
 
 # Utils
@@ -335,10 +889,38 @@ def run_install_configs(path_config_root: Path | str) -> None:
     install_macros(path)
     install_shortcuts(path)
     install_preferences(path)
+    install_startup_mod(path)
 
     show_dialog(message="Config instalation complete!\nPlease restart FreeCAD.")
 
 
+WATCHER: ConfigWatcher | None = None
+
+
+def run_watch_configs(path_config_root: Path | str, debounce: float = 0.3) -> None:
+    """Apply config changes as they're saved.
+
+    In FreeCAD's GUI this returns straight away and the changes are applied in the
+    background until `WATCHER.stop()` is called. In `FreeCADCmd` it blocks until
+    interrupted.
+    """
+
+    global WATCHER  # noqa: PLW0603
+
+    path = validate_path_exists(path_config_root)
+
+    if not FreeCAD.GuiUp:
+        print(f"Watching {path} for config changes. Press Ctrl+C to stop.")
+        watch_headless(path, debounce=debounce)
+        return
+
+    if WATCHER is not None:
+        WATCHER.stop()
+
+    WATCHER = ConfigWatcher(path, debounce)
+    print(f"Watching {path} for config changes.")
+
+
 # ------------------------------------------------------------------------------
 #
 #    See README.md for installation instructions.
@@ -350,3 +932,4 @@ PATH_CONFIG_ROOT = "~/Projects/100-active/FreeCADConfig"
 
 # run_install_addons(PATH_CONFIG_ROOT, reinstall=False)
 # run_install_configs(PATH_CONFIG_ROOT)
+# run_watch_configs(PATH_CONFIG_ROOT)
@@ -0,0 +1,223 @@
+# ruff: noqa: TC004
+
+from __future__ import annotations
+
+import heapq
+import math
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import MeshPart
+from freecadconfig import runtime
+
+
+# All FreeCAD types should be placed here.
+if TYPE_CHECKING:
+    import Part
+
+    # This is a FreeCAD type that seems inaccessible to Python.
+    DocumentObjectProxy = Any
+
+
+# `Deviation` and `AngularDeflection` pairs from the finest to the coarsest. They're in
+# the same units as `MeshDeviation` and `MeshAngularDeflection` in `preferences.toml`.
+LEVELS: tuple[tuple[float, float], ...] = (
+    (0.05, 2.0),
+    (0.1, 3.0),
+    (0.2, 4.0),
+    (0.5, 5.0),
+    (1.0, 10.0),
+    (2.0, 15.0),
+    (5.0, 30.0),
+)
+
+# The level matching `preferences.toml`.
+LEVEL_DEFAULT = 3
+
+
+@dataclass
+class Target:
+    obj: DocumentObjectProxy
+    level: int
+    before: int
+    # Triangle counts by level. Each is only measured when it's needed.
+    triangles: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def after(self) -> int:
+        return self.triangles[self.level]
+
+
+class UserMacro:
+    """Set each object's tessellation from its size and face count to keep the
+    document under a triangle budget."""
+
+    # Objects smaller than these fractions of the largest object get finer levels.
+    RATIO_SMALL = 0.02
+    RATIO_MEDIUM = 0.1
+
+    # Objects with at least this many faces get a coarser level.
+    FACES_MANY = 500
+
+    def run(self, budget: int = 2_000_000, dry_run: bool = False) -> None:
+        """Run macro.
+
+        Args:
+            budget: The most triangles every visible target object may add up to.
+            dry_run: Only report the triangle counts, don't change any objects.
+        """
+
+        objects = runtime.get_selection_or_document_objects()
+
+        shapes = []
+        hidden = 0
+
+        for obj in objects:
+            try:
+                view = obj.ViewObject
+                view.Deviation
+                view.AngularDeflection
+                shape = obj.Shape
+            except AttributeError:
+                continue
+
+            if shape.isNull():
+                continue
+
+            # FreeCAD doesn't tessellate hidden objects until they're shown.
+            if not view.Visibility:
+                hidden += 1
+                continue
+
+            shapes.append((obj, shape))
+
+        if not shapes:
+            print("Found no visible objects with a shape.")
+            return
+
+        largest = max(shape.BoundBox.DiagonalLength for _, shape in shapes)
+
+        targets = []
+
+        for obj, shape in shapes:
+            view = obj.ViewObject
+
+            target = Target(
+                obj=obj,
+                level=self.initial_level(
+                    shape.BoundBox.DiagonalLength, largest, len(shape.Faces)
+                ),
+                before=count_triangles(shape, view.Deviation, view.AngularDeflection),
+            )
+            target.triangles[target.level] = count_triangles(
+                shape, *LEVELS[target.level]
+            )
+            targets.append(target)
+
+        self.fit_budget(targets, budget)
+
+        before = sum(target.before for target in targets)
+        after = sum(target.after for target in targets)
+
+        print(f"Triangles before: {before:,}")
+        print(f"Triangles after:  {after:,} (budget {budget:,})")
+
+        if after > budget:
+            print("Unable to fit the budget. Every object is at its coarsest level.")
+
+        if hidden:
+            print(f"Skipped {hidden} hidden objects.")
+
+        print("\nMost triangles:")
+        for target in sorted(targets, key=lambda target: -target.after)[:10]:
+            deviation, angular = LEVELS[target.level]
+            print(
+                f" {target.after:>10,}  {target.obj.Label} "
+                f"(Deviation {deviation}, AngularDeflection {angular})"
+            )
+
+        if dry_run:
+            return
+
+        changed = 0
+
+        for target in targets:
+            view = target.obj.ViewObject
+            deviation, angular = LEVELS[target.level]
+
+            if (view.Deviation, view.AngularDeflection) == (deviation, angular):
+                continue
+
+            view.Deviation = deviation
+            view.AngularDeflection = angular
+            changed += 1
+
+        print(f"\nUpdated {changed} objects.")
+
+    def initial_level(self, size: float, largest: float, faces: int) -> int:
+        """Small parts are usually detailed ones seen up close so they start finer.
+        Parts with many faces start coarser as every face costs triangles."""
+
+        level = LEVEL_DEFAULT
+
+        if size < largest * self.RATIO_SMALL:
+            level -= 2
+        elif size < largest * self.RATIO_MEDIUM:
+            level -= 1
+
+        if faces >= self.FACES_MANY:
+            level += 1
+
+        return level
+
+    @staticmethod
+    def fit_budget(targets: list[Target], budget: int) -> None:
+        """Coarsen the objects with the most triangles until the total fits."""
+
+        total = sum(target.after for target in targets)
+
+        heap = [(-target.after, i) for i, target in enumerate(targets)]
+        heapq.heapify(heap)
+
+        while total > budget and heap:
+            _, i = heapq.heappop(heap)
+            target = targets[i]
+
+            if target.level == len(LEVELS) - 1:
+                continue
+
+            previous = target.after
+            target.level += 1
+
+            if target.level not in target.triangles:
+                target.triangles[target.level] = count_triangles(
+                    target.obj.Shape, *LEVELS[target.level]
+                )
+
+            total += target.after - previous
+            heapq.heappush(heap, (-target.after, i))
+
+
+def count_triangles(shape: Part.Shape, deviation: float, angular: float) -> int:
+    """Returns the triangles FreeCAD's 3D view would use for a shape."""
+
+    # FreeCAD scales `Deviation` by the size of the shape's bounding box.
+    box = shape.BoundBox
+    linear = (box.XLength + box.YLength + box.ZLength) / 300.0 * deviation
+
+    mesh = MeshPart.meshFromShape(
+        Shape=shape,
+        LinearDeflection=max(linear, 1e-6),
+        AngularDeflection=math.radians(angular),
+        Relative=False,
+    )
+
+    return mesh.CountFacets
+
+
+def main() -> None:
+    UserMacro().run()
+
+
+if __name__ == "__main__":
+    main()
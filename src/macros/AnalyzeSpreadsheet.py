@@ -0,0 +1,428 @@
+# ruff: noqa: TC004
+
+from __future__ import annotations
+
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from freecadconfig import runtime, spreadsheet
+
+
+# All FreeCAD types should be placed here.
+if TYPE_CHECKING:
+    import FreeCAD
+
+    # These are FreeCAD types that seem inaccessible to Python.
+    DocumentObjectProxy = Any
+    SheetProxy = Any
+
+
+RE_UNSAFE = re.compile(r"[^\w.-]+")
+
+
+@dataclass
+class SheetGraph:
+    """The cells of a sheet and what depends on each of them."""
+
+    sheet: str
+    contents: dict[str, str] = field(default_factory=dict)
+    aliases: dict[str, str] = field(default_factory=dict)
+    # The cells whose expressions reference each cell.
+    cells: dict[str, set[str]] = field(default_factory=dict)
+    # The names of the objects whose expressions reference each cell.
+    objects: dict[str, set[str]] = field(default_factory=dict)
+    # The names of the objects that recompute when each cell changes, including
+    # everything downstream of the objects referencing it.
+    impact: dict[str, set[str]] = field(default_factory=dict)
+    # Groups of cells that reference each other.
+    cycles: list[list[str]] = field(default_factory=list)
+
+    def fan_out(self, cell: str) -> int:
+        return len(self.cells[cell]) + len(self.objects[cell])
+
+    def dead(self) -> list[str]:
+        """Returns the value cells that nothing outside the sheet depends on.
+
+        Cells with plain text are headings and notes rather than values so they're
+        left out.
+        """
+
+        aliases = self.cell_aliases()
+
+        return [
+            cell
+            for cell, contents in self.contents.items()
+            if not self.impact[cell]
+            and (contents.startswith("=") or is_number(contents) or cell in aliases)
+        ]
+
+    def cell_aliases(self) -> dict[str, str]:
+        return {cell: alias for alias, cell in self.aliases.items()}
+
+    def to_json(self) -> dict[str, Any]:
+        aliases = self.cell_aliases()
+
+        return {
+            "sheet": self.sheet,
+            "cells": {
+                cell: {
+                    "contents": contents,
+                    "alias": aliases.get(cell, ""),
+                    "cells": sorted(self.cells[cell], key=spreadsheet.cell_to_index),
+                    "objects": sorted(self.objects[cell]),
+                    "fan_out": self.fan_out(cell),
+                    "impact": len(self.impact[cell]),
+                }
+                for cell, contents in self.contents.items()
+            },
+            "cycles": self.cycles,
+            "dead": self.dead(),
+        }
+
+    def to_dot(self) -> str:
+        aliases = self.cell_aliases()
+
+        lines = [
+            f"digraph {json.dumps(self.sheet)} {{",
+            "  rankdir=LR;",
+            "  node [shape=ellipse];",
+        ]
+
+        for cell in self.contents:
+            label = f"{cell}\\n{aliases[cell]}" if cell in aliases else cell
+            lines.append(f'  "{cell}" [label="{label}"];')
+
+        names = sorted({name for names in self.objects.values() for name in names})
+
+        for name in names:
+            lines.append(f'  "obj:{name}" [label="{name}", shape=box];')
+
+        for cell in self.contents:
+            for dependent in sorted(self.cells[cell]):
+                lines.append(f'  "{cell}" -> "{dependent}";')
+            for name in sorted(self.objects[cell]):
+                lines.append(f'  "{cell}" -> "obj:{name}";')
+
+        lines.append("}")
+
+        return "\n".join(lines) + "\n"
+
+
+class UserMacro:
+    """Analyze how a sheet's cells drive each other and the document's objects.
+
+    Reports each cell's fan-out, the cycles between cells, the dead cells nothing
+    depends on and the cells whose change recomputes the most objects.
+    """
+
+    def run(
+        self,
+        output_directory: Path | None = None,
+        top: int = 10,
+    ) -> list[SheetGraph]:
+        """Run macro.
+
+        Args:
+            output_directory: Write each sheet's graph here as DOT and JSON.
+            top: The number of cells to list by impact.
+        """
+
+        sheets = runtime.ObjectIndex.from_selection_or_document().by_type_id(
+            spreadsheet.TYPE_ID_SHEET
+        )
+
+        if not sheets:
+            print("Found no spreadsheets.")
+            return []
+
+        # Every sheet is checked against the same expressions so they're only read
+        # once.
+        expressions = [
+            (obj, found)
+            for obj in FreeCAD.activeDocument().Objects
+            if (found := find_expressions(obj))
+        ]
+
+        graphs = []
+        downstream: dict[str, set[str]] = {}
+        stems = file_stems(sheets)
+
+        for sheet in sheets:
+            graph = build_graph(sheet, expressions, downstream)
+            graphs.append(graph)
+
+            print_report(graph, top)
+
+            if output_directory is not None:
+                output_directory.mkdir(parents=True, exist_ok=True)
+                path_dot = output_directory / f"{stems[sheet.Name]}.dot"
+                path_json = output_directory / f"{stems[sheet.Name]}.json"
+
+                path_dot.write_text(graph.to_dot())
+                path_json.write_text(json.dumps(graph.to_json(), indent=2))
+
+                print(f"Exported graph to {path_dot} and {path_json}")
+
+        return graphs
+
+
+def file_stems(sheets: list[SheetProxy]) -> dict[str, str]:
+    """Returns a file name without a suffix for each sheet's name.
+
+    Labels can hold dots and characters file systems reject. Labels that sanitize to
+    the same name, ignoring case, have the sheet's name appended.
+    """
+
+    stems = {sheet.Name: RE_UNSAFE.sub("_", sheet.Label) for sheet in sheets}
+    counts = Counter(stem.casefold() for stem in stems.values())
+
+    return {
+        name: stem if counts[stem.casefold()] == 1 else f"{stem}_{name}"
+        for name, stem in stems.items()
+    }
+
+
+def build_graph(
+    sheet: SheetProxy,
+    expressions: list[tuple[DocumentObjectProxy, list[str]]],
+    downstream: dict[str, set[str]],
+) -> SheetGraph:
+    """Build a sheet's dependency graph.
+
+    Args:
+        sheet: The sheet to analyze.
+        expressions: Every object in the document with its expressions.
+        downstream: The names of the objects downstream of each object. It's filled
+            in as objects are visited so it can be shared between sheets.
+    """
+
+    graph = SheetGraph(sheet=sheet.Label)
+    graph.contents = dict(spreadsheet.iter_cells(sheet))
+    graph.aliases = spreadsheet.get_aliases(sheet, list(graph.contents))
+
+    for cell in graph.contents:
+        graph.cells[cell] = set()
+        graph.objects[cell] = set()
+
+    # References from the sheet's own cells may leave out the sheet.
+    local = {"", sheet.Name, f"<<{sheet.Label}>>"}
+
+    for cell, contents in graph.contents.items():
+        if not contents.startswith("="):
+            continue
+
+        for reference in spreadsheet.find_references(contents):
+            if reference.owner in local:
+                for target in resolve(graph, reference.target):
+                    graph.cells[target].add(cell)
+
+    # References from other objects and other sheets have to name the sheet.
+    qualified = {sheet.Name, f"<<{sheet.Label}>>"}
+    referencing: dict[str, DocumentObjectProxy] = {}
+
+    for obj, found in expressions:
+        if obj.Name == sheet.Name:
+            continue
+
+        for expression in found:
+            for reference in spreadsheet.find_references(expression):
+                if reference.owner not in qualified:
+                    continue
+
+                for target in resolve(graph, reference.target):
+                    graph.objects[target].add(obj.Name)
+                    referencing[obj.Name] = obj
+
+    for name, obj in referencing.items():
+        if name not in downstream:
+            downstream[name] = {dependent.Name for dependent in obj.InListRecursive}
+
+    components = strongly_connected_components(graph.cells)
+
+    graph.cycles = [
+        sorted(component, key=spreadsheet.cell_to_index)
+        for component in components
+        if len(component) > 1 or component[0] in graph.cells[component[0]]
+    ]
+
+    # Components come out with everything they lead to before them, so the impact of
+    # the cells each component leads to is always known.
+    for component in components:
+        members = set(component)
+        names = {name for cell in component for name in graph.objects[cell]}
+        upstream = {
+            id(graph.impact[dependent]): graph.impact[dependent]
+            for cell in component
+            for dependent in graph.cells[cell]
+            if dependent not in members
+        }
+
+        # Long chains of cells share one set rather than copying it down the chain.
+        # The sets are never changed once they're assigned.
+        if not names and len(upstream) == 1:
+            impact = next(iter(upstream.values()))
+        else:
+            impact = set(names)
+
+            for name in names:
+                impact |= downstream[name]
+
+            for dependents in upstream.values():
+                impact |= dependents
+
+        for cell in component:
+            graph.impact[cell] = impact
+
+    return graph
+
+
+def resolve(graph: SheetGraph, target: str) -> list[str]:
+    """Returns the non-empty cells a reference's target points at."""
+
+    if target in graph.aliases:
+        return [graph.aliases[target]]
+
+    if not spreadsheet.is_cell(target.split(":")[0]):
+        return []
+
+    return [cell for cell in spreadsheet.expand_cells(target) if cell in graph.contents]
+
+
+def find_expressions(obj: DocumentObjectProxy) -> list[str]:
+    """Returns every expression an object's properties or cells are bound to."""
+
+    if obj.TypeId == spreadsheet.TYPE_ID_SHEET:
+        return [
+            contents
+            for _, contents in spreadsheet.iter_cells(obj)
+            if contents.startswith("=")
+        ]
+
+    return [expression for _, expression in getattr(obj, "ExpressionEngine", [])]
+
+
+def strongly_connected_components(edges: dict[str, set[str]]) -> list[list[str]]:
+    """Tarjan's algorithm without recursion as parameter sheets chain many cells.
+
+    Returns:
+        The components in reverse topological order i.e. every component comes after
+        the components it has edges to.
+    """
+
+    indices: dict[str, int] = {}
+    lowlinks: dict[str, int] = {}
+    stack: list[str] = []
+    on_stack: set[str] = set()
+    components: list[list[str]] = []
+
+    for root in edges:
+        if root in indices:
+            continue
+
+        work = [(root, iter(edges[root]))]
+        indices[root] = lowlinks[root] = len(indices)
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            node, successors = work[-1]
+
+            for successor in successors:
+                if successor not in indices:
+                    indices[successor] = lowlinks[successor] = len(indices)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(edges[successor])))
+                    break
+
+                if successor in on_stack:
+                    lowlinks[node] = min(lowlinks[node], indices[successor])
+            else:
+                work.pop()
+
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[node])
+
+                if lowlinks[node] == indices[node]:
+                    component = []
+
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+
+                        if member == node:
+                            break
+
+                    components.append(component)
+
+    return components
+
+
+def is_number(contents: str) -> bool:
+    try:
+        float(contents.split()[0])
+    except (IndexError, ValueError):
+        return False
+
+    return True
+
+
+def print_report(graph: SheetGraph, top: int) -> None:
+    objects = {name for names in graph.objects.values() for name in names}
+
+    print(
+        f"{graph.sheet}: {len(graph.contents)} cells, {len(graph.aliases)} aliases, "
+        f"{len(objects)} objects bound to its cells."
+    )
+
+    aliases = graph.cell_aliases()
+
+    ranked = sorted(
+        (cell for cell in graph.contents if graph.impact[cell]),
+        key=lambda cell: (-len(graph.impact[cell]), spreadsheet.cell_to_index(cell)),
+    )
+
+    if ranked:
+        print("\nMost objects recomputed by a change:")
+        print(f" {'impact':>7} {'fan-out':>8}  cell")
+
+        for cell in ranked[:top]:
+            name = f"{cell} ({aliases[cell]})" if cell in aliases else cell
+            print(f" {len(graph.impact[cell]):>7} {graph.fan_out(cell):>8}  {name}")
+
+    if graph.cycles:
+        print(f"\nFound {len(graph.cycles)} cycles:")
+        for cycle in graph.cycles:
+            print(f" {' -> '.join([*cycle, cycle[0]])}")
+
+    dead = graph.dead()
+
+    if dead:
+        more = f" and {len(dead) - top} more" if len(dead) > top else ""
+        print(f"\nFound {len(dead)} dead cells: {', '.join(dead[:top])}{more}")
+
+    print()
+
+
+def main() -> None:
+    path_document = FreeCAD.activeDocument().FileName
+
+    # An unsaved document has no directory to write the graphs next to.
+    if not path_document:
+        print("Save the document first. The graphs are written next to it.")
+        return
+
+    output_directory = Path(path_document).parent
+
+    # TODO: Build GUI.
+    UserMacro().run(output_directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import contextlib
+import tempfile
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+import TechDrawGui
+from freecadconfig import pdf, runtime
+
 
 # All FreeCAD types should be placed here.
 if TYPE_CHECKING:
@@ -14,27 +19,46 @@ if TYPE_CHECKING:
 
     import FreeCAD
     import FreeCADGui
-    import Gui
 
     # This is a FreeCAD type that seems inaccessible to Python.
     DrawPageProxy = Any
 
 
+# The `TechDrawGui` functions that render a page from its view provider without opening
+# it.
+PAGE_EXPORTERS = {
+    ".pdf": "exportPageAsPdf",
+    ".svg": "exportPageAsSvg",
+}
+
+
 class UserMacro:
     """Export drawings using the ISO5457 minimal template."""
 
     TARGET_TYPE_ID = "TechDraw::DrawPage"
 
+    def __init__(self) -> None:
+        # The pages opened to export them the slow way.
+        self.activated: set[str] = set()
+
     def run(
         self,
         page_data: PageData,
         output_directory: Path,
         revision: str,
         date_format: str | None = None,
+        merge: bool = False,
+        svg: bool = False,
     ) -> None:
-        objects = Gui.Selection.getSelection() or FreeCAD.activeDocument().Objects
-        pages = [obj for obj in objects if obj.TypeId == self.TARGET_TYPE_ID]
-        pages = sorted(pages, key=lambda p: p.Label)
+        """Run macro.
+
+        Args:
+            merge: Write every page to a single PDF named after the document, with a
+                bookmark per page, instead of one PDF per page.
+            svg: Also export an SVG per page.
+        """
+        index = runtime.ObjectIndex.from_selection_or_document()
+        pages = sorted(index.by_type_id(self.TARGET_TYPE_ID), key=lambda p: p.Label)
 
         if not pages:
             print("Found no pages to export!")
@@ -49,7 +73,7 @@ class UserMacro:
 
         self.force_recompute_document()
 
-        self.export_drawings(pages, page_data, output_directory)
+        self.export_drawings(pages, page_data, output_directory, merge, svg)
 
         print("Export Complete!")
 
@@ -58,26 +82,71 @@ class UserMacro:
         pages: list[DrawPageProxy],
         page_data: PageData,
         output_directory: Path,
+        merge: bool = False,
+        svg: bool = False,
     ) -> None:
         output_directory.mkdir(parents=True, exist_ok=True)
 
-        for page_number, page in enumerate(pages, start=1):
-            # FreeCAD has a bug where only the active Page is exported. Calling
-            # `doubleClicked` activates the Page.
-            page.ViewObject.doubleClicked()
+        merger = None
+
+        if merge:
+            path_merged = output_directory / f"{FreeCAD.activeDocument().Label}.pdf"
+            merger = pdf.PdfMerger(path_merged)
+
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            merger or contextlib.nullcontext(),
+        ):
+            for page_number, page in enumerate(pages, start=1):
+                page_data.set_page_field_data(page, page_number)
 
-            page_data.set_page_field_data(page, page_number)
+                if merger is None:
+                    path = output_directory / f"{page.Label}.pdf"
 
-            path = output_directory / f"{page.Label}.pdf"
+                    print(f"Exporting '{page.Label}' to {path}...")
 
-            print(f"Exporting '{page.Label}' to {path}...")
+                    self.export_page(page, path)
+                else:
+                    # Append each page as soon as it's exported so only one page is
+                    # ever held in memory.
+                    path = Path(tmp) / f"{page_number}.pdf"
 
-            self.export_page(page, path)
+                    print(f"Exporting '{page.Label}' to {merger.path}...")
+
+                    self.export_page(page, path)
+                    merger.append(path, title=page.Label)
+                    path.unlink()
+
+                if svg:
+                    path = output_directory / f"{page.Label}.svg"
+
+                    print(f"Exporting '{page.Label}' to {path}...")
+
+                    self.export_page(page, path)
+
+                page_data.clear_page_mutable_field_data(page)
+
+    def export_page(self, page: DrawPageProxy, path: Path) -> None:
+        """Export a page without opening it, or by opening it where that fails."""
+
+        error = export_page_directly(page, path)
+
+        if error is None:
+            return
 
-            page_data.clear_page_mutable_field_data(page)
+        if page.Name not in self.activated:
+            if not self.activated:
+                print(f"Unable to export pages without opening them: {error}")
+
+            # FreeCAD has a bug where only the active Page is exported. Calling
+            # `doubleClicked` activates the Page.
+            page.ViewObject.doubleClicked()
+            self.activated.add(page.Name)
+
+        self.export_active_page(page, path)
 
     @staticmethod
-    def export_page(page: str, path: Path) -> None:
+    def export_active_page(page: DrawPageProxy, path: Path) -> None:
         path = str(path)  # pyright: ignore [reportAssignmentType]
 
         if hasattr(FreeCADGui, "exportOptions"):
@@ -96,6 +165,33 @@ class UserMacro:
         document.recompute()
 
 
+def export_page_directly(page: DrawPageProxy, path: Path) -> str | None:
+    """Render a page from its view provider's scene rather than an opened view.
+
+    Older versions of FreeCAD only render pages that have been opened.
+
+    Returns:
+        Why the page couldn't be exported or `None` if it was.
+    """
+
+    exporter = getattr(TechDrawGui, PAGE_EXPORTERS.get(path.suffix.lower(), ""), None)
+
+    if exporter is None:
+        return f"TechDrawGui can't export {path.suffix} files"
+
+    path.unlink(missing_ok=True)
+
+    try:
+        exporter(page, str(path))
+    except (RuntimeError, TypeError) as e:
+        return str(e)
+
+    if not path.exists() or not path.stat().st_size:
+        return f"TechDrawGui didn't write {path.name}"
+
+    return None
+
+
 class PageData:
     _revision: str | int = ""
     _page_count: int = 0
@@ -186,18 +282,23 @@ class PageDataIso5457(PageData):
         return self.date.strftime(self._date_format)
 
 
-output_directory = Path(FreeCAD.activeDocument().FileName)
-
-# TODO: Build GUI.
-UserMacro().run(
-    PageDataIso5457(
-        approval_person="N/A",
-        creator="N/A",
-        general_tolerances="N/A",
-        language_code="N/A",
-        part_material="N/A",
-        title="N/A",
-    ),
-    output_directory,
-    revision="N/A",
-)
+def main() -> None:
+    output_directory = Path(FreeCAD.activeDocument().FileName)
+
+    # TODO: Build GUI.
+    UserMacro().run(
+        PageDataIso5457(
+            approval_person="N/A",
+            creator="N/A",
+            general_tolerances="N/A",
+            language_code="N/A",
+            part_material="N/A",
+            title="N/A",
+        ),
+        output_directory,
+        revision="N/A",
+    )
+
+
+if __name__ == "__main__":
+    main()
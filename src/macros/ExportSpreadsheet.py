@@ -3,16 +3,17 @@
 from __future__ import annotations
 
 import csv
-import re
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from PySide import QtCore, QtGui
+from freecadconfig import runtime, spreadsheet
+from PySide import QtCore
 
 
 # All FreeCAD types should be placed here.
 if TYPE_CHECKING:
-    import FreeCADGui
+    # This is a FreeCAD type that seems inaccessible to Python.
+    SheetProxy = Any
 
 
 class UserMacro:
@@ -20,15 +21,7 @@ class UserMacro:
 
     @staticmethod
     def run(cell_range: str, output_filepath: Path) -> None:
-        main_window = FreeCADGui.getMainWindow()
-        mdi_area = main_window.findChild(QtGui.QMdiArea)
-
-        table_view = None
-
-        for obj in mdi_area.subWindowList():
-            if obj.widget().metaObject().className() == "SpreadsheetGui::SheetView":
-                table_view = obj.widget().findChild(QtGui.QTableView)
-                break
+        table_view = runtime.find_sheet_table_view()
 
         if not table_view:
             print("No table view found.")
@@ -47,13 +40,13 @@ class UserMacro:
             return
 
         try:
-            start_cell, end_cell = cell_range.split(":")
-            start_row, start_column = cell_to_index(start_cell)
-            end_row, end_column = cell_to_index(end_cell)
+            cell_range_indices = spreadsheet.parse_cell_range(cell_range)
         except ValueError as e:
             print(f"Error parsing cell range: {e}")
             return
 
+        start_row, start_column, end_row, end_column = cell_range_indices
+
         data = []
 
         for row in range(start_row, end_row + 1):
@@ -65,31 +58,51 @@ class UserMacro:
 
             data.append(row_data)
 
-        with output_filepath.open("w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerows(data)
+        write_csv(data, output_filepath)
 
         print(f"Exported spreadsheet to {output_filepath}")
 
+    @staticmethod
+    def export_sheet(sheet: SheetProxy, cell_range: str, output_filepath: Path) -> None:
+        """Export a range of a sheet's computed cell values without using the GUI."""
 
-def cell_to_index(cell: str) -> tuple[int, int]:
-    match = re.match(r"([A-Z]+)(\d+)", cell)
-    if not match:
-        raise ValueError(f"Invalid cell format: {cell}")
-    col_str, row_str = match.groups()
-    col = (
-        sum(
-            (ord(char) - ord("A") + 1) * (26**i)
-            for i, char in enumerate(reversed(col_str))
+        start_row, start_column, end_row, end_column = spreadsheet.parse_cell_range(
+            cell_range
         )
-        - 1
+
+        data = []
+
+        for row in range(start_row, end_row + 1):
+            row_data = []
+
+            for column in range(start_column, end_column + 1):
+                cell = spreadsheet.index_to_cell(row, column)
+
+                if sheet.getContents(cell):
+                    row_data.append(str(sheet.get(cell)))
+                else:
+                    row_data.append("")
+
+            data.append(row_data)
+
+        write_csv(data, output_filepath)
+
+        print(f"Exported {sheet.Label} to {output_filepath}")
+
+
+def write_csv(data: list[list[Any]], output_filepath: Path) -> None:
+    with output_filepath.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerows(data)
+
+
+def main() -> None:
+    # TODO: Build GUI.
+    UserMacro().run(
+        cell_range="",
+        output_filepath=Path.cwd(),
     )
-    row = int(row_str) - 1
-    return row, col
 
 
-# TODO: Build GUI.
-UserMacro().run(
-    cell_range="",
-    output_filepath=Path.cwd(),
-)
+if __name__ == "__main__":
+    main()
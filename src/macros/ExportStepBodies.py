@@ -0,0 +1,342 @@
+# ruff: noqa: TC004
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import ImportGui
+from freecadconfig import runtime, workers
+
+
+# All FreeCAD types should be placed here.
+if TYPE_CHECKING:
+    import FreeCAD
+    import FreeCADGui
+
+    # These are FreeCAD types that seem inaccessible to Python.
+    DocumentProxy = Any
+    DocumentObjectProxy = Any
+
+
+TYPE_ID_BODY = "PartDesign::Body"
+
+NAME_MANIFEST = ".step-manifest.json"
+
+SUFFIX_STEP = ".step"
+
+# Every material property that ends up in the exported colors.
+APPEARANCE = (
+    "DiffuseColor",
+    "AmbientColor",
+    "SpecularColor",
+    "EmissiveColor",
+    "Shininess",
+    "Transparency",
+)
+
+RE_UNSAFE = re.compile(r"[^\w.-]+")
+
+
+class UserMacro:
+    """Export each body to its own STEP file with its face colors.
+
+    Bodies whose shape and appearance haven't changed since the last export into the
+    same directory are skipped. Larger exports are spread over offscreen FreeCAD
+    processes.
+    """
+
+    # Starting a worker process takes a few seconds so fewer changed bodies than this
+    # are exported here.
+    MIN_BODIES_WORKERS = 8
+
+    def run(
+        self,
+        output_directory: Path,
+        jobs: int | None = None,
+        objects: list[DocumentObjectProxy] | None = None,
+    ) -> dict[str, str]:
+        """Run macro.
+
+        Args:
+            output_directory: Where the STEP files and the cache manifest are written.
+            jobs: The most worker processes to use. A value of `None` uses one per
+                CPU, `1` exports everything in this process.
+            objects: The objects to export. A value of `None` exports the selected
+                objects or every body in the document.
+
+        Returns:
+            The file exported for each object's name.
+        """
+
+        document = FreeCAD.activeDocument()
+
+        if objects is None:
+            objects = find_objects(document)
+
+        if not objects:
+            print("Found no bodies to export.")
+            return {}
+
+        output_directory.mkdir(parents=True, exist_ok=True)
+
+        path_manifest = output_directory / NAME_MANIFEST
+        manifest = read_manifest(path_manifest)
+
+        changed = []
+        digests = {}
+        files = file_names(objects)
+
+        for obj in objects:
+            digest = body_digest(obj)
+            file = files[obj.Name]
+            entry = manifest.get(obj.Name, {})
+
+            if (
+                entry.get("digest") == digest
+                and entry.get("file") == file
+                and (output_directory / file).exists()
+            ):
+                continue
+
+            changed.append(obj)
+            digests[obj.Name] = digest
+
+        skipped = len(objects) - len(changed)
+
+        jobs = jobs or os.cpu_count() or 1
+        exported: dict[str, str] = {}
+        failed: dict[str, str] = {}
+
+        if changed and self.use_workers(document, changed, jobs):
+            exported, failed = export_with_workers(
+                document, changed, output_directory, jobs, files
+            )
+        elif changed:
+            exported, failed = export_here(changed, output_directory, files)
+
+        # The files of bodies deleted from the document, and the old files of renamed
+        # bodies.
+        names = {obj.Name for obj in document.Objects}
+        stale = {
+            manifest.pop(name).get("file")
+            for name in list(manifest)
+            if name not in names
+        }
+
+        for name, file in exported.items():
+            stale.add(manifest.get(name, {}).get("file"))
+            manifest[name] = {"digest": digests[name], "file": file}
+
+        # Another body's file may now have a stale file's name, including bodies that
+        # weren't exported this time.
+        in_use = set(files.values())
+        in_use.update(entry.get("file") for entry in manifest.values())
+
+        for file in stale - in_use:
+            if file:
+                (output_directory / file).unlink(missing_ok=True)
+
+        if exported or stale:
+            write_manifest(path_manifest, manifest)
+
+        if not changed:
+            print(f"All {skipped} bodies are up to date in {output_directory}")
+            return {}
+
+        print(
+            f"Exported {len(exported)} bodies to {output_directory}, skipped "
+            f"{skipped} unchanged."
+        )
+
+        for label, error in failed.items():
+            print(f" Failed to export {label}: {error}")
+
+        return exported
+
+    def use_workers(
+        self,
+        document: DocumentProxy,
+        changed: list[DocumentObjectProxy],
+        jobs: int,
+    ) -> bool:
+        if jobs <= 1 or len(changed) < self.MIN_BODIES_WORKERS:
+            return False
+
+        # Workers open the saved file so they'd miss any unsaved changes.
+        if not document.FileName:
+            return False
+
+        gui_document = FreeCADGui.getDocument(document.Name)
+
+        if gui_document is None or gui_document.Modified:
+            print("The document has unsaved changes. Exporting without workers.")
+            return False
+
+        return True
+
+
+def find_objects(document: DocumentProxy) -> list[DocumentObjectProxy]:
+    """Returns the selected objects with a shape or every body in the document."""
+
+    selection = [
+        obj for obj in FreeCADGui.Selection.getSelection() if hasattr(obj, "Shape")
+    ]
+
+    if selection:
+        return selection
+
+    return runtime.ObjectIndex.from_document(document).by_type_id(TYPE_ID_BODY)
+
+
+def body_digest(obj: DocumentObjectProxy) -> str:
+    """Returns a hash of everything that ends up in a body's STEP file."""
+
+    digest = hashlib.sha256()
+    digest.update(obj.Shape.exportBrepToString().encode())
+
+    view = obj.ViewObject
+
+    if view is not None:
+        for material in getattr(view, "ShapeAppearance", []):
+            values = [getattr(material, name, None) for name in APPEARANCE]
+            digest.update(repr(values).encode())
+
+    return digest.hexdigest()
+
+
+def file_names(objects: list[DocumentObjectProxy]) -> dict[str, str]:
+    """Returns a file name for each object's name that no other object shares.
+
+    Labels that sanitize to the same name, e.g. `Body/1` and `Body:1`, have the
+    object's name appended. Names are compared ignoring case as some file systems do.
+    """
+
+    stems = {obj.Name: RE_UNSAFE.sub("_", obj.Label) for obj in objects}
+    counts = Counter(stem.casefold() for stem in stems.values())
+
+    return {
+        name: (
+            f"{stem}{SUFFIX_STEP}"
+            if counts[stem.casefold()] == 1
+            else f"{stem}_{name}{SUFFIX_STEP}"
+        )
+        for name, stem in stems.items()
+    }
+
+
+def export_step(obj: DocumentObjectProxy, output_directory: Path, file: str) -> str:
+    """Export one object with its colors and return the file's name."""
+
+    # `ImportGui` writes the colors from the object's view, `Import` doesn't.
+    ImportGui.export([obj], str(output_directory / file))
+
+    return file
+
+
+def export_here(
+    objects: list[DocumentObjectProxy],
+    output_directory: Path,
+    files: dict[str, str],
+) -> tuple[dict[str, str], dict[str, str]]:
+    exported = {}
+    failed = {}
+
+    for obj in objects:
+        try:
+            exported[obj.Name] = export_step(obj, output_directory, files[obj.Name])
+        except (OSError, RuntimeError) as e:
+            failed[obj.Label] = str(e)
+
+    return exported, failed
+
+
+def export_with_workers(
+    document: DocumentProxy,
+    objects: list[DocumentObjectProxy],
+    output_directory: Path,
+    jobs: int,
+    files: dict[str, str],
+) -> tuple[dict[str, str], dict[str, str]]:
+    """Export the objects from the saved document on offscreen FreeCAD processes.
+
+    Every worker has to open the document so the objects are split into one job per
+    worker rather than one per object. The file names are sent along as they depend
+    on every object being exported, not only a worker's share.
+    """
+
+    executables = workers.find_executables(FreeCAD.getHomePath())
+
+    try:
+        executables.get(gui=True)
+    except FileNotFoundError as e:
+        print(f"{e} Exporting without workers.")
+        return export_here(objects, output_directory, files)
+
+    count = min(jobs, math.ceil(len(objects) / UserMacro.MIN_BODIES_WORKERS))
+    chunks = [objects[i::count] for i in range(count)]
+
+    batch = [
+        workers.Job(
+            task="export-step",
+            document=document.FileName,
+            args={
+                "bodies": [obj.Name for obj in chunk],
+                "files": {obj.Name: files[obj.Name] for obj in chunk},
+                "output_directory": str(output_directory),
+            },
+        )
+        for chunk in chunks
+    ]
+
+    print(f"Exporting {len(objects)} bodies on {len(batch)} workers…")
+
+    results = workers.run_jobs(batch, executables, workers=len(batch))
+
+    exported = {}
+    failed = {}
+
+    for chunk, result in zip(chunks, results, strict=True):
+        if result.ok:
+            exported |= result.details["exported"]
+            failed |= result.details["failed"]
+            continue
+
+        error = (result.error or result.status).strip().splitlines()[-1]
+
+        for obj in chunk:
+            failed[obj.Label] = error
+
+    return exported, failed
+
+
+def read_manifest(path: Path) -> dict[str, dict[str, str]]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(path: Path, manifest: dict[str, dict[str, str]]) -> None:
+    # Written whole and then swapped in so an interrupted export can't corrupt it.
+    path_tmp = path.with_suffix(".tmp")
+    path_tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    path_tmp.replace(path)
+
+
+def main() -> None:
+    output_directory = Path(FreeCAD.activeDocument().FileName)
+    output_directory = output_directory.with_name(f"{output_directory.stem}-step")
+
+    # TODO: Build GUI.
+    UserMacro().run(output_directory)
+
+
+if __name__ == "__main__":
+    main()
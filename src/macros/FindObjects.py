@@ -0,0 +1,199 @@
+# ruff: noqa: TC004
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from freecadconfig import labels, runtime
+from PySide import QtCore, QtWidgets
+
+
+# All FreeCAD types should be placed here.
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import FreeCADGui
+
+
+NAME_STATE = "FindObjects"
+
+ALL_TYPES = "All types"
+
+
+class UserMacro:
+    """Find and select objects by part of their label in every open document."""
+
+    # Selecting objects redraws the tree and the 3D view for each one so only this
+    # many are selected at once.
+    MAX_SELECTION = 500
+
+    def run(
+        self,
+        query: str,
+        type_ids: Iterable[str] | None = None,
+        select: bool = True,
+    ) -> list[labels.Entry]:
+        """Run macro.
+
+        Args:
+            query: Part of a label, ignoring case.
+            type_ids: Only find objects with one of these `TypeId`s.
+            select: Replace the selection with the objects found.
+
+        Returns:
+            The objects found ordered by label.
+        """
+
+        entries = labels.search(query, type_ids)
+
+        print(f"Found {len(entries)} objects matching '{query}'.")
+
+        if select:
+            self.select(entries)
+
+        return entries
+
+    @classmethod
+    def select(cls, entries: list[labels.Entry]) -> None:
+        FreeCADGui.Selection.clearSelection()
+
+        for entry in entries[: cls.MAX_SELECTION]:
+            FreeCADGui.Selection.addSelection(entry.document, entry.name)
+
+        if len(entries) > cls.MAX_SELECTION:
+            print(f"Only selected the first {cls.MAX_SELECTION} objects.")
+
+
+class FindObjectsDialog(QtWidgets.QDialog):
+    """Search as you type and select the objects found."""
+
+    # The list is filled right away but the selection waits for typing to pause.
+    DEBOUNCE_MS = 150
+
+    # The most results listed.
+    LIMIT = 1_000
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+
+        self.setWindowTitle("Find Objects")
+        self.resize(480, 560)
+
+        self.query = QtWidgets.QLineEdit()
+        self.query.setPlaceholderText("Part of a label…")
+        self.query.setClearButtonEnabled(True)
+
+        self.type_id = QtWidgets.QComboBox()
+
+        self.results = QtWidgets.QListWidget()
+        self.results.setSelectionMode(
+            QtWidgets.QAbstractItemView.SelectionMode.ExtendedSelection
+        )
+
+        self.status = QtWidgets.QLabel()
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.query)
+        layout.addWidget(self.type_id)
+        layout.addWidget(self.results)
+        layout.addWidget(self.status)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DEBOUNCE_MS)
+        self.timer.timeout.connect(self.select_results)
+
+        self.query.textChanged.connect(self.update_results)
+        self.type_id.currentIndexChanged.connect(self.update_results)
+        self.results.itemSelectionChanged.connect(self.select_items)
+
+        self.entries: list[labels.Entry] = []
+
+    def showEvent(self, event: QtCore.QEvent) -> None:
+        # Documents may have been opened or closed while the dialog was hidden.
+        self.update_type_ids()
+        self.update_results()
+        self.query.setFocus()
+        self.query.selectAll()
+
+        super().showEvent(event)
+
+    def update_type_ids(self) -> None:
+        current = self.type_id.currentText()
+        type_ids = labels.get_index().type_ids()
+
+        self.type_id.blockSignals(True)
+        self.type_id.clear()
+        self.type_id.addItem(ALL_TYPES)
+        self.type_id.addItems(sorted(type_ids))
+        self.type_id.setCurrentIndex(max(self.type_id.findText(current), 0))
+        self.type_id.blockSignals(False)
+
+    def update_results(self) -> None:
+        query = self.query.text()
+        type_id = self.type_id.currentText()
+        type_ids = None if type_id == ALL_TYPES else [type_id]
+
+        # The limit is applied after counting so the total can be shown.
+        self.entries = labels.search(query, type_ids)
+
+        documents = len({entry.document for entry in self.entries})
+        multiple = documents > 1
+
+        self.results.blockSignals(True)
+        self.results.clear()
+
+        for entry in self.entries[: self.LIMIT]:
+            text = f"{entry.label}  ({entry.type_id})"
+
+            if multiple:
+                text = f"{entry.document}: {text}"
+
+            self.results.addItem(text)
+
+        self.results.blockSignals(False)
+
+        more = f", showing {self.LIMIT}" if len(self.entries) > self.LIMIT else ""
+        self.status.setText(
+            f"{len(self.entries)} objects in {documents} documents{more}"
+        )
+
+        if query:
+            self.timer.start()
+        else:
+            # A selection pending from the last query would select every object.
+            self.timer.stop()
+
+    def select_results(self) -> None:
+        # Every object matches an empty query.
+        if not self.query.text():
+            return
+
+        UserMacro.select(self.entries)
+
+    def select_items(self) -> None:
+        """Select only the highlighted results."""
+
+        self.timer.stop()
+
+        rows = sorted(index.row() for index in self.results.selectedIndexes())
+        UserMacro.select([self.entries[row] for row in rows])
+
+
+def main() -> None:
+    state = runtime.get_session_state(NAME_STATE)
+
+    # The dialog is kept for the session so it opens with the last search.
+    dialog = state.get("dialog")
+
+    if dialog is None:
+        dialog = FindObjectsDialog(runtime.get_main_window())
+        state["dialog"] = dialog
+
+    dialog.show()
+    dialog.raise_()
+    dialog.activateWindow()
+
+
+if __name__ == "__main__":
+    main()
@@ -25,4 +25,9 @@ class UserMacro:
         print("Recomputing complete!")
 
 
-UserMacro().run()
+def main() -> None:
+    UserMacro().run()
+
+
+if __name__ == "__main__":
+    main()
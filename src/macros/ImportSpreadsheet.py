@@ -0,0 +1,259 @@
+# ruff: noqa: TC004
+
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from freecadconfig import runtime, spreadsheet
+
+
+# All FreeCAD types should be placed here.
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    import FreeCAD
+
+    # This is a FreeCAD type that seems inaccessible to Python.
+    SheetProxy = Any
+
+
+SUFFIXES_JSON_LINES = (".jsonl", ".ndjson")
+
+
+@dataclass
+class CellUpdate:
+    cell: str
+    # `None` leaves the contents as they are. `""` clears the cell.
+    contents: str | None = None
+    # `None` leaves the alias as it is. `""` removes it.
+    alias: str | None = None
+    # The contents may be a computed value, as `ExportSpreadsheet` exports, so a cell
+    # already showing it is left as it is rather than losing its formula.
+    computed: bool = False
+
+
+@dataclass
+class ImportCounts:
+    read: int = 0
+    cells: int = 0
+    aliases: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    # The cells whose formula was replaced.
+    formulas: list[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.cells or self.aliases)
+
+
+class UserMacro:
+    """Import cells from a CSV or JSON Lines file into a spreadsheet.
+
+    CSV rows are placed starting at a cell, the same way `ExportSpreadsheet` exports
+    them. Each JSON Lines record sets one cell e.g.
+    `{"cell": "B2", "contents": "=B1 * 2", "alias": "length"}`.
+    """
+
+    # Rows are read and applied this many cells at a time so large files are never
+    # held in memory.
+    BATCH_SIZE = 1_000
+
+    # The most replaced formulas listed after an import.
+    MAX_FORMULAS_LISTED = 20
+
+    def run(self, input_filepath: Path, origin: str = "A1") -> None:
+        """Run macro.
+
+        Args:
+            input_filepath: A `.csv`, `.jsonl` or `.ndjson` file.
+            origin: The cell the first CSV row and column are placed at.
+        """
+
+        sheets = runtime.ObjectIndex.from_selection_or_document().by_type_id(
+            spreadsheet.TYPE_ID_SHEET
+        )
+
+        if not sheets:
+            print("No spreadsheet found.")
+            return
+
+        if len(sheets) > 1:
+            print("Found more than one spreadsheet. Select the one to import into.")
+            return
+
+        self.import_sheet(sheets[0], input_filepath, origin)
+
+    @classmethod
+    def import_sheet(
+        cls,
+        sheet: SheetProxy,
+        input_filepath: Path,
+        origin: str = "A1",
+    ) -> ImportCounts:
+        """Import a file into a sheet in one transaction without using the GUI."""
+
+        counts = ImportCounts()
+        document = sheet.Document
+
+        document.openTransaction(f"Import {input_filepath.name}")
+
+        try:
+            updates = read_updates(input_filepath, origin)
+
+            while batch := list(itertools.islice(updates, cls.BATCH_SIZE)):
+                apply_updates(sheet, batch, counts)
+        except (OSError, ValueError) as e:
+            document.abortTransaction()
+            print(f"Aborted importing {input_filepath}: {e}")
+            return counts
+        except Exception:
+            # Never leave a half imported sheet in an open transaction.
+            document.abortTransaction()
+            raise
+
+        document.commitTransaction()
+
+        # Every change is recomputed at once rather than once per cell.
+        if counts.changed:
+            document.recompute()
+
+        print(
+            f"Imported {input_filepath} into {sheet.Label}: {counts.cells} cells and "
+            f"{counts.aliases} aliases changed, {counts.unchanged} unchanged, "
+            f"{counts.failed} failed."
+        )
+
+        if counts.formulas:
+            listed = ", ".join(counts.formulas[: cls.MAX_FORMULAS_LISTED])
+            more = len(counts.formulas) - cls.MAX_FORMULAS_LISTED
+            print(
+                f"Replaced the formulas of {len(counts.formulas)} cells with values: "
+                f"{listed}{f' and {more} more' if more > 0 else ''}"
+            )
+
+        return counts
+
+
+def read_updates(input_filepath: Path, origin: str) -> Iterator[CellUpdate]:
+    if input_filepath.suffix.lower() in SUFFIXES_JSON_LINES:
+        return read_json_lines(input_filepath)
+
+    return read_csv(input_filepath, origin)
+
+
+def read_csv(input_filepath: Path, origin: str) -> Iterator[CellUpdate]:
+    start_row, start_column = spreadsheet.cell_to_index(origin)
+
+    with input_filepath.open(newline="", encoding="utf-8-sig") as f:
+        for row, values in enumerate(csv.reader(f), start=start_row):
+            for column, value in enumerate(values, start=start_column):
+                # Anything but a formula may be a value exported from the cell.
+                yield CellUpdate(
+                    spreadsheet.index_to_cell(row, column),
+                    value,
+                    computed=not value.startswith("="),
+                )
+
+
+def read_json_lines(input_filepath: Path) -> Iterator[CellUpdate]:
+    with input_filepath.open(encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                record = json.loads(line)
+                cell = record["cell"]
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                raise ValueError(f"Invalid record on line {number}: {e}") from e
+
+            if not spreadsheet.is_cell(cell):
+                raise ValueError(f"Invalid cell on line {number}: {cell}")
+
+            contents = record.get("contents")
+            alias = record.get("alias")
+
+            yield CellUpdate(
+                cell.replace("$", ""),
+                None if contents is None else str(contents),
+                alias,
+            )
+
+
+def apply_updates(
+    sheet: SheetProxy, updates: list[CellUpdate], counts: ImportCounts
+) -> None:
+    """Set each cell's contents and alias unless it already has them."""
+
+    for update in updates:
+        counts.read += 1
+        changed = False
+
+        if update.contents is not None:
+            contents = sheet.getContents(update.cell)
+
+            same = contents == update.contents or (
+                update.computed
+                and bool(contents)
+                and shows(sheet, update.cell, update.contents)
+            )
+
+            if not same:
+                if contents.startswith("="):
+                    counts.formulas.append(update.cell)
+
+                sheet.set(update.cell, update.contents)
+                counts.cells += 1
+                changed = True
+
+        if update.alias is not None:
+            if (sheet.getAlias(update.cell) or "") != update.alias:
+                try:
+                    sheet.setAlias(update.cell, update.alias)
+                except ValueError as e:
+                    # The alias is invalid or another cell has it.
+                    print(f"Unable to alias {update.cell} as {update.alias}: {e}")
+                    counts.failed += 1
+                    continue
+
+                counts.aliases += 1
+                changed = True
+
+        if not changed:
+            counts.unchanged += 1
+
+
+def shows(sheet: SheetProxy, cell: str, value: str) -> bool:
+    """Whether a cell's computed value is the given value.
+
+    Values are compared as quantities so e.g. `10 mm` and `10.0 mm` are the same.
+    """
+
+    computed = sheet.get(cell)
+
+    if str(computed) == value:
+        return True
+
+    try:
+        return FreeCAD.Units.Quantity(value) == FreeCAD.Units.Quantity(computed)
+    except (TypeError, ValueError):
+        # Either isn't a number or a quantity.
+        return False
+
+
+def main() -> None:
+    # TODO: Build GUI.
+    UserMacro().run(
+        input_filepath=Path.cwd(),
+        origin="A1",
+    )
+
+
+if __name__ == "__main__":
+    main()
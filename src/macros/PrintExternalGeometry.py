@@ -4,10 +4,11 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from freecadconfig import runtime
+
 
 # All FreeCAD types should be placed here.
 if TYPE_CHECKING:
-    import FreeCAD
     import Gui
 
 
@@ -17,7 +18,7 @@ class UserMacro:
     TYPE_ID_SKETCH = "Sketcher::SketchObject"
 
     def run(self, label: str | None = None) -> None:
-        document = FreeCAD.activeDocument()
+        index = runtime.ObjectIndex.from_document()
 
         if label is None:
             try:
@@ -27,7 +28,7 @@ class UserMacro:
                 return
         else:
             try:
-                source_sketch = document.getObjectsByLabel(label)[0]
+                source_sketch = index.by_label(label)[0]
             except IndexError:
                 print(f"Sketch '{label}' does not exist!")
                 return
@@ -36,11 +37,7 @@ class UserMacro:
             print(f"Object '{label}' is not a Sketch!")
             return
 
-        sketches = [
-            sketch
-            for sketch in document.Objects
-            if sketch.TypeId == self.TYPE_ID_SKETCH
-        ]
+        sketches = index.by_type_id(self.TYPE_ID_SKETCH)
 
         references = set()
 
@@ -60,4 +57,9 @@ class UserMacro:
             print(f"  {reference}")
 
 
-UserMacro().run()
+def main() -> None:
+    UserMacro().run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# ruff: noqa: TC004
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from freecadconfig import rename, runtime, spreadsheet
+
+
+# All FreeCAD types should be placed here.
+if TYPE_CHECKING:
+    import FreeCAD
+
+    # This is a FreeCAD type that seems inaccessible to Python.
+    DocumentObjectProxy = Any
+
+
+class UserMacro:
+    """Rename labels and sheet cells with the rules in `rename.toml`.
+
+    Every rule is applied in a single pass over the objects, however many there are.
+    """
+
+    def run(
+        self,
+        rules_path: Path = rename.PATH_RENAME_TOML,
+        dry_run: bool = True,
+        labels: bool = True,
+        cells: bool = True,
+        objects: list[DocumentObjectProxy] | None = None,
+    ) -> rename.Renamer | None:
+        """Run macro.
+
+        Args:
+            rules_path: The TOML file with the rules.
+            dry_run: Print what would change without changing anything.
+            labels: Rename the objects' labels.
+            cells: Rename the contents of the sheets' cells.
+            objects: The objects to rename. A value of `None` uses the selected
+                objects or every object in the document.
+
+        Returns:
+            The renamer with every change and each rule's hits.
+        """
+
+        try:
+            renamer = rename.Renamer(rename.load_rules(rules_path))
+        except (OSError, ValueError) as e:
+            print(f"Unable to load the rules from {rules_path}: {e}")
+            return None
+
+        if not renamer.rules:
+            print(f"Found no rules in {rules_path}")
+            return renamer
+
+        if objects is None:
+            objects = runtime.get_selection_or_document_objects()
+
+        document = FreeCAD.activeDocument()
+
+        if not dry_run:
+            document.openTransaction("Rename with rules")
+
+        sheets_changed = False
+
+        try:
+            for obj in objects:
+                if labels:
+                    label = renamer.rename(obj.Label, f"{obj.Name} (label)")
+
+                    if not dry_run and label != obj.Label:
+                        obj.Label = label
+
+                if cells and obj.TypeId == spreadsheet.TYPE_ID_SHEET:
+                    for cell, contents in spreadsheet.iter_cells(obj):
+                        new = renamer.rename(contents, f"{obj.Label}.{cell}")
+
+                        if not dry_run and new != contents:
+                            obj.set(cell, new)
+                            sheets_changed = True
+        except Exception as e:
+            if not dry_run:
+                # Nothing is renamed unless everything is.
+                document.abortTransaction()
+
+            print(f"Aborted renaming: {e}")
+            return None
+
+        if not dry_run:
+            document.commitTransaction()
+
+            if sheets_changed:
+                document.recompute()
+
+        if dry_run:
+            rename.print_diff(renamer.changes)
+
+        rename.print_report(renamer)
+
+        verb = "Would rename" if dry_run else "Renamed"
+        print(f"{verb} {len(renamer.changes)} labels and cells.")
+
+        return renamer
+
+
+def main() -> None:
+    # Check the diff before setting this to `False`.
+    dry_run = True
+
+    # TODO: Build GUI.
+    UserMacro().run(dry_run=dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,9 @@
 from __future__ import annotations
 
 import re
-from typing import TYPE_CHECKING
 
-from PySide import QtCore, QtGui
-
-
-# All FreeCAD types should be placed here.
-if TYPE_CHECKING:
-    import FreeCADGui
+from freecadconfig import runtime
+from PySide import QtCore
 
 
 class UserMacro:
@@ -25,15 +20,7 @@ class UserMacro:
             replace: The string to replace the captured text.
         """
 
-        main_window = FreeCADGui.getMainWindow()
-        mdi_area = main_window.findChild(QtGui.QMdiArea)
-
-        table_view = None
-
-        for obj in mdi_area.subWindowList():
-            if obj.widget().metaObject().className() == "SpreadsheetGui::SheetView":
-                table_view = obj.widget().findChild(QtGui.QTableView)
-                break
+        table_view = runtime.find_sheet_table_view()
 
         if not table_view:
             print("No table view found.")
@@ -66,24 +53,29 @@ class UserMacro:
             print(f"Renaming: {contents} -> {new_contents}")
 
 
-pattern = r""
-replace = r""
-dry_run = False
+def main() -> None:
+    pattern = r""
+    replace = r""
+    dry_run = False
+
+    # Remove a string from any part of the name.
+    #
+    # pattern = r"\(helper\)"
+    # replace = r""
+
+    # Remove a string from the end of the name.
+    #
+    # pattern = r"^(.*)_suffix$"
+    # replace = r"\1"
 
-# Remove a string from any part of the name.
-#
-# pattern = r"\(helper\)"
-# replace = r""
+    # Add a prexix/suffix to the name.
+    #
+    # pattern = r"^(.*)$"
+    # replace = r"prefix_\1_suffix"
 
-# Remove a string from the end of the name.
-#
-# pattern = r"^(.*)_suffix$"
-# replace = r"\1"
+    # TODO: Build GUI.
+    UserMacro().run(pattern, replace, dry_run)
 
-# Add a prexix/suffix to the name.
-#
-# pattern = r"^(.*)$"
-# replace = r"prefix_\1_suffix"
 
-# TODO: Build GUI.
-UserMacro().run(pattern, replace, dry_run)
+if __name__ == "__main__":
+    main()
@@ -3,29 +3,44 @@
 from __future__ import annotations
 
 import re
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 
 # All FreeCAD types should be placed here.
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     import Gui
 
+    # This is a FreeCAD type that seems inaccessible to Python.
+    DocumentObjectProxy = Any
+
 
 class UserMacro:
     """Rename the selected objects using a regex pattern."""
 
     @staticmethod
-    def run(pattern: str, replace: str, dry_run: bool = True) -> None:
+    def run(
+        pattern: str,
+        replace: str,
+        dry_run: bool = True,
+        objects: Iterable[DocumentObjectProxy] | None = None,
+    ) -> None:
         """Run macro.
 
         Args:
             find: Regex pattern.
             replace: The string to replace the captured text.
+            objects: The objects to rename. A value of `None` will use the current
+                selection.
         """
 
         re_pattern = re.compile(pattern)
 
-        for obj in Gui.Selection.getSelection():
+        if objects is None:
+            objects = Gui.Selection.getSelection()
+
+        for obj in objects:
             try:
                 obj.Label
             except AttributeError:
@@ -42,28 +57,33 @@ class UserMacro:
                     obj.Label = new_label
 
 
-pattern = r""
-replace = r""
-dry_run = False
+def main() -> None:
+    pattern = r""
+    replace = r""
+    dry_run = False
+
+    # Remove a string from any part of the name.
+    #
+    # pattern = r"\(helper\)"
+    # replace = r""
+
+    # Remove a string from the end of the name.
+    #
+    # pattern = r"^(.*)_suffix$"
+    # replace = r"\1"
 
-# Remove a string from any part of the name.
-#
-# pattern = r"\(helper\)"
-# replace = r""
+    # Add a prexix/suffix to the name.
+    #
+    # pattern = r"^(.*)$"
+    # replace = r"prefix_\1_suffix"
 
-# Remove a string from the end of the name.
-#
-# pattern = r"^(.*)_suffix$"
-# replace = r"\1"
+    # TODO: Build GUI.
+    UserMacro().run(
+        pattern,
+        replace,
+        dry_run,
+    )
 
-# Add a prexix/suffix to the name.
-#
-# pattern = r"^(.*)$"
-# replace = r"prefix_\1_suffix"
 
-# TODO: Build GUI.
-UserMacro().run(
-    pattern,
-    replace,
-    dry_run,
-)
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from freecadconfig import runtime
+
 
 # All FreeCAD types should be placed here.
 if TYPE_CHECKING:
     import FreeCAD
-    import Gui
 
 document = FreeCAD.ActiveDocument
 
@@ -19,8 +20,8 @@ class UserMacro:
     TARGET_TYPE_ID = "TechDraw::DrawProjGroupItem"
 
     def run(self) -> None:
-        objects = Gui.Selection.getSelection() or FreeCAD.activeDocument().Objects
-        projections = [obj for obj in objects if obj.TypeId == self.TARGET_TYPE_ID]
+        index = runtime.ObjectIndex.from_selection_or_document()
+        projections = index.by_type_id(self.TARGET_TYPE_ID)
 
         for projection in projections:
             try:
@@ -39,4 +40,9 @@ class UserMacro:
             view.HiddenWidth = "0.254 mm"
 
 
-UserMacro().run()
+def main() -> None:
+    UserMacro().run()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,12 @@ import contextlib
 import math
 from typing import TYPE_CHECKING, Any
 
+from freecadconfig import runtime
+
 
 # All FreeCAD types should be placed here.
 if TYPE_CHECKING:
     import FreeCAD
-    import Gui
 
     # This is a FreeCAD type that seems inaccessible to Python.
     ViewObjectProxy = Any
@@ -61,7 +62,7 @@ class UserMacro:
                 objects that might have alredy had their color modified.
 
         """
-        objects = Gui.Selection.getSelection() or FreeCAD.activeDocument().Objects
+        objects = runtime.get_selection_or_document_objects()
 
         for obj in objects:
             try:
@@ -140,4 +141,9 @@ class UserMacro:
         )
 
 
-UserMacro().run(retain_diffuse_color=True)
+def main() -> None:
+    UserMacro().run(retain_diffuse_color=True)
+
+
+if __name__ == "__main__":
+    main()
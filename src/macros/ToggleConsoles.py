@@ -2,14 +2,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
-
-from PySide2 import QtWidgets
-
-
-# All FreeCAD types should be placed here.
-if TYPE_CHECKING:
-    import FreeCADGui
+from freecadconfig import runtime
 
 
 class UserMacro:
@@ -17,10 +10,8 @@ class UserMacro:
 
     @staticmethod
     def run() -> None:
-        main_window = FreeCADGui.getMainWindow()
-
-        python_console = main_window.findChild(QtWidgets.QDockWidget, "Python console")
-        report_view = main_window.findChild(QtWidgets.QDockWidget, "Report view")
+        python_console = runtime.get_dock_widget("Python console")
+        report_view = runtime.get_dock_widget("Report view")
 
         if report_view.isVisible() or python_console.isVisible():
             report_view.hide()
@@ -30,4 +21,9 @@ class UserMacro:
             python_console.show()
 
 
-UserMacro().run()
+def main() -> None:
+    UserMacro().run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# ruff: noqa: TC004
+
+from __future__ import annotations
+
+import itertools
+import math
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+import Part
+from freecadconfig import runtime
+
+
+# All FreeCAD types should be placed here.
+if TYPE_CHECKING:
+    import FreeCAD
+    import FreeCADGui
+
+    # These are FreeCAD types that seem inaccessible to Python.
+    DocumentProxy = Any
+    DocumentObjectProxy = Any
+    View3DProxy = Any
+
+    Snapshot = dict[str, dict[str, Any]]
+
+
+NAME_STATE = "ToggleLevelOfDetail"
+
+HIDDEN = "hidden"
+BOUNDING_BOX = "bounding box"
+WIREFRAME = "wireframe"
+
+
+class UserMacro:
+    """Toggle a level of detail mode that simplifies heavy and tiny objects.
+
+    The first run simplifies the visible objects and remembers how they were drawn.
+    The next run in the same document restores them.
+
+    Links are measured by the shape they link to. Heavy links are simplified by
+    changing how their linked object is drawn, which every link to it shows.
+    """
+
+    # Objects smaller than this many pixels on screen are hidden.
+    MIN_PIXELS = 4.0
+
+    # Objects with at least this many faces are drawn as points in a bounding box.
+    FACES_BOUNDING_BOX = 2_000
+
+    # Objects with at least this many faces are drawn as wireframes.
+    FACES_WIREFRAME = 200
+
+    def run(self) -> None:
+        document = FreeCAD.activeDocument()
+        state = runtime.get_session_state(NAME_STATE)
+
+        snapshot = state.pop(document.Name, None)
+
+        if snapshot is not None:
+            self.restore(document, snapshot)
+            return
+
+        snapshot = self.simplify(document)
+
+        if snapshot:
+            state[document.Name] = snapshot
+
+    def simplify(self, document: DocumentProxy) -> Snapshot:
+        """Simplify the selected or all visible objects.
+
+        Returns:
+            The original properties of every changed object by its name.
+        """
+
+        objects = runtime.get_selection_or_document_objects(document)
+        view_3d = FreeCADGui.ActiveDocument.ActiveView
+
+        snapshot: Snapshot = {}
+        counts: Counter[str] = Counter()
+
+        for obj in objects:
+            view = getattr(obj, "ViewObject", None)
+
+            if view is None or not view.Visibility:
+                continue
+
+            # Links have no shape of their own. This returns the one they link to,
+            # placed where the link is.
+            shape = Part.getShape(obj)
+
+            if shape.isNull():
+                continue
+
+            kind, changes = self.choose(view_3d, shape)
+
+            if not changes:
+                continue
+
+            # Links can't be drawn as wireframes or bounding boxes themselves but
+            # they're drawn like the object they link to. For anything else this is
+            # the object itself.
+            if kind != HIDDEN:
+                obj = obj.getLinkedObject(True)
+
+                # Restoring it would need the other document.
+                if obj.Document.Name != document.Name:
+                    continue
+
+                view = obj.ViewObject
+
+            # Already simplified for another link to it.
+            if obj.Name in snapshot:
+                continue
+
+            try:
+                original = {name: getattr(view, name) for name in changes}
+            except AttributeError:
+                continue
+
+            try:
+                for name, value in changes.items():
+                    setattr(view, name, value)
+            except ValueError:
+                # The object doesn't have this display mode.
+                for name, value in original.items():
+                    setattr(view, name, value)
+                continue
+
+            snapshot[obj.Name] = original
+            counts[kind] += 1
+
+        if not snapshot:
+            print("Found nothing to simplify.")
+            return snapshot
+
+        print(
+            f"Simplified {len(snapshot)} objects: {counts[HIDDEN]} hidden, "
+            f"{counts[BOUNDING_BOX]} as bounding boxes, {counts[WIREFRAME]} as "
+            "wireframes. Run again to restore them."
+        )
+
+        return snapshot
+
+    def choose(self, view_3d: View3DProxy, shape: Any) -> tuple[str, dict[str, Any]]:
+        if projected_size(view_3d, shape.BoundBox) < self.MIN_PIXELS:
+            return HIDDEN, {"Visibility": False}
+
+        faces = shape.countSubElements("Face")
+
+        if faces >= self.FACES_BOUNDING_BOX:
+            return BOUNDING_BOX, {"DisplayMode": "Points", "BoundingBox": True}
+
+        if faces >= self.FACES_WIREFRAME:
+            return WIREFRAME, {"DisplayMode": "Wireframe"}
+
+        return "", {}
+
+    @staticmethod
+    def restore(document: DocumentProxy, snapshot: Snapshot) -> None:
+        restored = 0
+
+        for name, original in snapshot.items():
+            obj = document.getObject(name)
+
+            # The object was deleted while simplified.
+            if obj is None:
+                continue
+
+            view = obj.ViewObject
+
+            for prop, value in original.items():
+                if getattr(view, prop) != value:
+                    setattr(view, prop, value)
+
+            restored += 1
+
+        print(f"Restored {restored} objects.")
+
+
+def projected_size(view_3d: View3DProxy, box: FreeCAD.BoundBox) -> float:
+    """Returns the diagonal in pixels of a bounding box's outline on screen."""
+
+    corners = itertools.product(
+        (box.XMin, box.XMax),
+        (box.YMin, box.YMax),
+        (box.ZMin, box.ZMax),
+    )
+
+    points = [view_3d.getPointOnViewport(FreeCAD.Vector(*corner)) for corner in corners]
+
+    xs = [point[0] for point in points]
+    ys = [point[1] for point in points]
+
+    return math.hypot(max(xs) - min(xs), max(ys) - min(ys))
+
+
+def main() -> None:
+    UserMacro().run()
+
+
+if __name__ == "__main__":
+    main()
@@ -27,4 +27,9 @@ class UserMacro:
         pass
 
 
-UserMacro().run()
+def main() -> None:
+    UserMacro().run()
+
+
+if __name__ == "__main__":
+    main()
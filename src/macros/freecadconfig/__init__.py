@@ -0,0 +1,5 @@
+"""Shared runtime library for the FreeCADConfig macros.
+
+The macros directory is added to `sys.path` by FreeCAD via the `MacroPath`
+preference, which makes this package importable from any macro.
+"""
@@ -0,0 +1,93 @@
+"""Keep macros resident so shortcut commands don't re-read and re-compile them.
+
+`install_macros` registers a small launcher per macro that calls `dispatch`. The first
+call loads the macro once and caches its `main` function. Later calls run the cached
+function and only reload the macro when its file's modification time changes.
+"""
+
+from __future__ import annotations
+
+import __main__
+import ast
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from freecadconfig import instrument, runtime, usage
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import CodeType
+
+
+@dataclass
+class Entry:
+    mtime: int
+    main: Callable[[], None]
+
+
+class MacroHost:
+    def __init__(self, directory: Path = runtime.PATH_MACROS) -> None:
+        self.directory = directory
+        self._entries: dict[Path, Entry] = {}
+
+    def __contains__(self, file: str) -> bool:
+        return self.directory / file in self._entries
+
+    def get(self, file: str) -> Callable[[], None]:
+        """Returns the macro's entry point, loading it if it's new or has changed."""
+
+        path = self.directory / file
+        mtime = path.stat().st_mtime_ns
+
+        entry = self._entries.get(path)
+
+        if entry is None or entry.mtime != mtime:
+            entry = Entry(mtime=mtime, main=self._load(path))
+            self._entries[path] = entry
+
+        return entry.main
+
+    def run(self, file: str) -> None:
+        self.get(file)()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @staticmethod
+    def _load(path: Path) -> Callable[[], None]:
+        source = path.read_bytes()
+        tree = ast.parse(source, filename=str(path))
+
+        has_main = any(
+            isinstance(node, ast.FunctionDef) and node.name == "main"
+            for node in tree.body
+        )
+
+        if has_main:
+            return runtime.load_macro(path).main
+
+        # Scripts without a `main`, e.g. `QuickInspect`, are compiled once and run in
+        # the console's namespace so the names they define stay available there.
+        code = compile(tree, str(path), "exec")
+
+        return lambda: run_script(code)
+
+
+def run_script(code: CodeType) -> None:
+    namespace = __main__.__dict__
+    namespace.update(runtime.macro_globals())
+    exec(code, namespace)  # noqa: S102
+
+
+HOST = MacroHost()
+
+
+def dispatch(file: str) -> None:
+    """Run a macro from the macros directory through the resident host."""
+
+    usage.record_macro(file)
+
+    with instrument.measure(Path(file).stem):
+        HOST.run(file)
@@ -0,0 +1,161 @@
+"""Pre-render the macros' SVG icons to PNGs.
+
+Qt rasterizes an SVG pixmap every time a toolbar or menu is built. `install_macros`
+registers cached PNGs instead so building them only loads bitmaps. Each icon is
+minified, rendered at every size and scale in `SIZES` and `SCALES`, and cached in a
+directory named after the minified SVG's hash. Editing an icon renders it again and
+unchanged icons are never re-rendered.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from xml.etree import ElementTree
+
+
+NAMESPACE_SVG = "http://www.w3.org/2000/svg"
+NAMESPACE_XLINK = "http://www.w3.org/1999/xlink"
+
+# Namespaces only used by editors and metadata. Nothing in them is rendered.
+NAMESPACES_EDITOR = {
+    "http://creativecommons.org/ns#",
+    "http://inkscape.sourceforge.net/DTD/sodipodi-0.dtd",
+    "http://purl.org/dc/elements/1.1/",
+    "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd",
+    "http://www.inkscape.org/namespaces/inkscape",
+    "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+}
+
+TAGS_UNRENDERED = {
+    f"{{{NAMESPACE_SVG}}}desc",
+    f"{{{NAMESPACE_SVG}}}metadata",
+    f"{{{NAMESPACE_SVG}}}title",
+}
+
+# Anything that looks like a reference to an id, e.g. `href="#a"`, `url(#a)` or
+# `url("#a")` in a `<style>`. Keeping an unreferenced id is harmless but dropping a
+# referenced one breaks the icon, so this matches more than it has to.
+RE_ID_REFERENCE = re.compile(r"#([\w.:-]+)")
+
+# The menu and toolbar icon sizes and the screen scales they're rendered at.
+SIZES = (16, 24)
+SCALES = (1, 2)
+
+# The size registered as the command's pixmap. Qt picks up the `@2x` file next to it
+# on HiDPI screens.
+SIZE_TOOLBAR = 24
+
+ElementTree.register_namespace("", NAMESPACE_SVG)
+ElementTree.register_namespace("xlink", NAMESPACE_XLINK)
+
+
+def minify(data: bytes) -> bytes:
+    """Validate an SVG and strip everything that isn't rendered.
+
+    Raises:
+        ValueError: If the file isn't an SVG or has no size.
+    """
+
+    try:
+        root = ElementTree.fromstring(data)
+    except ElementTree.ParseError as e:
+        raise ValueError(f"Invalid SVG: {e}.") from e
+
+    if root.tag != f"{{{NAMESPACE_SVG}}}svg":
+        raise ValueError(f"Invalid SVG: root element is '{root.tag}'.")
+
+    if root.get("viewBox") is None and None in (root.get("width"), root.get("height")):
+        raise ValueError("Invalid SVG: missing 'viewBox' or 'width' and 'height'.")
+
+    # Ids can be referenced from attributes and from the text of `<style>` elements,
+    # so the whole document is searched.
+    referenced = set(RE_ID_REFERENCE.findall(data.decode("utf-8", errors="replace")))
+
+    for parent in root.iter():
+        for child in list(parent):
+            if not isinstance(child.tag, str) or is_unrendered(child.tag):
+                parent.remove(child)
+
+    for element in root.iter():
+        for name in list(element.attrib):
+            if is_editor(name):
+                del element.attrib[name]
+            elif name == "id" and element.get(name) not in referenced:
+                del element.attrib[name]
+
+        if element.text is not None and not element.text.strip():
+            element.text = None
+        if element.tail is not None and not element.tail.strip():
+            element.tail = None
+
+    return ElementTree.tostring(root, encoding="utf-8", xml_declaration=False)
+
+
+def is_editor(name: str) -> bool:
+    return name.startswith("{") and name[1:].split("}")[0] in NAMESPACES_EDITOR
+
+
+def is_unrendered(tag: str) -> bool:
+    return tag in TAGS_UNRENDERED or is_editor(tag)
+
+
+def file_name(size: int, scale: int) -> str:
+    return f"{size}.png" if scale == 1 else f"{size}@{scale}x.png"
+
+
+def cache_icon(path: Path, directory: Path) -> Path:
+    """Returns the cached PNG to register for an SVG icon, rendering it if needed.
+
+    Raises:
+        ValueError: If the icon isn't a valid SVG or can't be rendered.
+    """
+
+    svg = minify(path.read_bytes())
+
+    path_icon = directory / hashlib.sha256(svg).hexdigest()[:16]
+
+    if not path_icon.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+
+        # Render into a temporary directory so an interrupted render is never used.
+        path_tmp = Path(tempfile.mkdtemp(dir=directory))
+
+        try:
+            for size in SIZES:
+                for scale in SCALES:
+                    render(svg, path_tmp / file_name(size, scale), size * scale)
+
+            path_tmp.rename(path_icon)
+        except OSError:
+            # Another FreeCAD rendered the same icon first.
+            if not path_icon.exists():
+                raise
+        finally:
+            shutil.rmtree(path_tmp, ignore_errors=True)
+
+    return path_icon / file_name(SIZE_TOOLBAR, 1)
+
+
+def render(svg: bytes, path: Path, size: int) -> None:
+    # Only needed when an icon isn't cached, which is rarely.
+    from PySide import QtCore, QtGui, QtSvg
+
+    renderer = QtSvg.QSvgRenderer(QtCore.QByteArray(svg))
+
+    if not renderer.isValid():
+        raise ValueError("Invalid SVG: Qt can't render it.")
+
+    image = QtGui.QImage(size, size, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtCore.Qt.transparent)
+
+    painter = QtGui.QPainter(image)
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    renderer.render(painter)
+    painter.end()
+
+    if not image.save(str(path), "PNG"):
+        raise OSError(f"Failed to write '{path}'.")
@@ -0,0 +1,256 @@
+"""Measure the memory each macro run allocates and keeps.
+
+Instrumentation is off unless the `FREECADCONFIG_INSTRUMENT` environment variable is
+set or the `Instrument` preference is true. The environment variable may name the
+directory reports are written to. By default they go to `instrument` in FreeCAD's user
+data directory, one JSON report per run.
+
+Each report has the run's peak and retained Python memory from `tracemalloc`, the
+source lines holding the most retained memory, the process' resident memory before
+and after and how the number of objects of each type changed. `tools.memory_report`
+compares reports between runs.
+
+Tracing allocations slows Python code down several times over and its bookkeeping
+adds to the resident memory, so reports are only meaningful compared with each other.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gc
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+try:
+    import resource
+except ImportError:
+    # Windows
+    resource = None
+
+
+ENV_INSTRUMENT = "FREECADCONFIG_INSTRUMENT"
+
+P_INSTRUMENT = "User parameter:BaseApp/Preferences/FreeCADConfig"
+P_NAME_INSTRUMENT = "Instrument"
+
+NAME_REPORTS = "instrument"
+
+# Values of the environment variable that only turn instrumentation on or off.
+VALUES_ON = {"1", "true", "yes", "on"}
+VALUES_OFF = {"", "0", "false", "no", "off"}
+
+TOP_SITES = 20
+TOP_TYPES = 20
+
+RE_UNSAFE = re.compile(r"[^\w.-]+")
+
+
+@dataclass
+class Report:
+    name: str
+    started: float
+    elapsed: float = 0.0
+    # Bytes.
+    peak: int = 0
+    retained: int = 0
+    rss_before: int | None = None
+    rss_after: int | None = None
+    # The source lines holding the most retained memory.
+    sites: list[dict[str, Any]] = field(default_factory=list)
+    # The change in the number of live objects by type. Only objects the garbage
+    # collector tracks are counted, i.e. containers and class instances but not
+    # numbers or strings.
+    objects: dict[str, int] = field(default_factory=dict)
+    # Objects found by the collection after the run i.e. reference cycles it left.
+    collected: int = 0
+    error: str | None = None
+
+
+def enabled() -> bool:
+    value = os.environ.get(ENV_INSTRUMENT)
+
+    if value is not None:
+        return value.strip().lower() not in VALUES_OFF
+
+    try:
+        import FreeCAD
+    except ImportError:
+        return False
+
+    return FreeCAD.ParamGet(P_INSTRUMENT).GetBool(P_NAME_INSTRUMENT, False)
+
+
+def report_directory() -> Path:
+    value = os.environ.get(ENV_INSTRUMENT, "").strip()
+
+    if value and value.lower() not in VALUES_ON:
+        return Path(value).expanduser()
+
+    import FreeCAD
+
+    return Path(FreeCAD.getUserAppDataDir()) / "FreeCADConfig" / NAME_REPORTS
+
+
+@contextlib.contextmanager
+def measure(name: str, directory: Path | None = None) -> Iterator[Report | None]:
+    """Measure everything run inside the block and write a report when it exits.
+
+    Yields the report being filled in or `None` if instrumentation is off.
+    """
+
+    if not enabled():
+        yield None
+        return
+
+    report = Report(name=name, started=time.time())
+
+    gc.collect()
+    objects_before = count_objects()
+    report.rss_before = current_memory()
+
+    # Somebody else might be tracing already, e.g. a profiler. Their trace is reset
+    # but left running.
+    tracing = tracemalloc.is_tracing()
+
+    if not tracing:
+        tracemalloc.start()
+
+    tracemalloc.clear_traces()
+    tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+
+    try:
+        yield report
+    except BaseException as e:
+        report.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        report.elapsed = time.perf_counter() - start
+
+        # Garbage that's only waiting for a collection isn't retained.
+        report.collected = gc.collect()
+
+        snapshot = tracemalloc.take_snapshot()
+        report.retained, report.peak = tracemalloc.get_traced_memory()
+
+        if not tracing:
+            tracemalloc.stop()
+
+        report.sites = top_sites(snapshot)
+        del snapshot
+
+        report.rss_after = current_memory()
+        report.objects = diff_objects(objects_before, count_objects())
+
+        try:
+            write_report(report, directory or report_directory())
+        except OSError as e:
+            print(f"Unable to write the instrumentation report for {name}: {e}")
+
+
+def top_sites(snapshot: tracemalloc.Snapshot, top: int = TOP_SITES) -> list[dict]:
+    # Our own bookkeeping would otherwise show up in every report.
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+
+    return [
+        {
+            "file": stat.traceback[0].filename,
+            "line": stat.traceback[0].lineno,
+            "size": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:top]
+    ]
+
+
+def count_objects() -> Counter[str]:
+    return Counter(type(obj).__qualname__ for obj in gc.get_objects())
+
+
+def diff_objects(
+    before: Counter[str], after: Counter[str], top: int = TOP_TYPES
+) -> dict[str, int]:
+    """Returns the types whose number of live objects changed the most."""
+
+    changes = Counter(after)
+    changes.subtract(before)
+
+    ranked = sorted(
+        ((name, change) for name, change in changes.items() if change),
+        key=lambda item: -abs(item[1]),
+    )
+
+    return dict(ranked[:top])
+
+
+def current_memory() -> int | None:
+    """Returns the process' resident memory in bytes.
+
+    Falls back to the peak resident memory where the current one isn't available.
+    """
+
+    with contextlib.suppress(OSError, ValueError, IndexError):
+        pages = Path("/proc/self/statm").read_text().split()[1]
+        return int(pages) * os.sysconf("SC_PAGE_SIZE")
+
+    if resource is None:
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes and macOS bytes.
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def write_report(report: Report, directory: Path) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(report.started))
+    stamp += f".{int(report.started * 1000) % 1000:03d}"
+    name = RE_UNSAFE.sub("_", report.name)
+    path = directory / f"{stamp}-{os.getpid()}-{name}.json"
+
+    path.write_text(json.dumps(asdict(report), indent=2))
+
+    print(
+        f"Instrumented {report.name}: peak {report.peak / 1024**2:.1f} MB, "
+        f"retained {report.retained / 1024**2:.1f} MB. Report written to {path}"
+    )
+
+    return path
+
+
+def read_reports(paths: list[Path]) -> list[Report]:
+    """Read every report in the given files and directories, oldest first."""
+
+    reports = []
+
+    for path in paths:
+        files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+
+        for file in files:
+            try:
+                reports.append(Report(**json.loads(file.read_text())))
+            except (OSError, ValueError, TypeError):
+                continue
+
+    return sorted(reports, key=lambda report: report.started)
@@ -0,0 +1,223 @@
+"""Find objects by part of their label across every open document.
+
+Labels are indexed by their lowercased trigrams, so a search only has to check the
+labels that contain every trigram of the query rather than every object. A document
+observer keeps the index current as objects are created, relabelled and deleted, so
+it's only built once per document for the whole session.
+
+Documents are indexed the first time they're searched and again after they're
+reloaded, as FreeCAD doesn't report the labels objects are restored with.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    # These are FreeCAD types that seem inaccessible to Python.
+    DocumentProxy = Any
+    DocumentObjectProxy = Any
+
+
+# Queries shorter than this can't be looked up by trigram so every label is checked.
+SIZE_GRAM = 3
+
+
+class Entry(NamedTuple):
+    document: str
+    name: str
+    label: str
+    type_id: str
+
+
+class LabelIndex:
+    def __init__(self) -> None:
+        self.entries: dict[tuple[str, str], Entry] = {}
+        # Kept so searches don't lowercase every label they check.
+        self.lowered: dict[tuple[str, str], str] = {}
+        # The entries whose lowercased label contains each trigram.
+        self.postings: dict[str, set[tuple[str, str]]] = defaultdict(set)
+        self.documents: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.lowered.clear()
+        self.postings.clear()
+        self.documents.clear()
+
+    def add(self, entry: Entry) -> None:
+        key = (entry.document, entry.name)
+
+        previous = self.entries.get(key)
+
+        if previous is not None:
+            if previous.label == entry.label:
+                self.entries[key] = entry
+                return
+
+            self.remove(entry.document, entry.name)
+
+        self.entries[key] = entry
+        self.lowered[key] = lowered = entry.label.lower()
+
+        for gram in trigrams(lowered):
+            self.postings[gram].add(key)
+
+    def remove(self, document: str, name: str) -> None:
+        entry = self.entries.pop((document, name), None)
+
+        if entry is None:
+            return
+
+        for gram in trigrams(self.lowered.pop((document, name))):
+            keys = self.postings[gram]
+            keys.discard((document, name))
+
+            if not keys:
+                del self.postings[gram]
+
+    def add_document(self, document: DocumentProxy) -> None:
+        self.remove_document(document.Name)
+        self.documents.add(document.Name)
+
+        for obj in document.Objects:
+            self.add(entry_for(obj))
+
+    def remove_document(self, document: str) -> None:
+        self.documents.discard(document)
+
+        names = [name for doc, name in self.entries if doc == document]
+
+        for name in names:
+            self.remove(document, name)
+
+    def search(
+        self,
+        query: str,
+        type_ids: Iterable[str] | None = None,
+        limit: int | None = None,
+    ) -> list[Entry]:
+        """Returns the entries whose label contains the query, ignoring case.
+
+        Args:
+            query: Part of a label. An empty query matches every label.
+            type_ids: Only return entries with one of these `TypeId`s.
+            limit: Return at most this many entries.
+
+        Returns:
+            The matching entries ordered by label.
+        """
+
+        query = query.lower()
+        type_ids = set(type_ids) if type_ids else None
+
+        if len(query) < SIZE_GRAM:
+            keys: Iterable[tuple[str, str]] = self.entries
+        else:
+            keys = self.candidates(query)
+
+        lowered = self.lowered
+        entries = self.entries
+
+        matches = [
+            key
+            for key in keys
+            if query in lowered[key]
+            and (type_ids is None or entries[key].type_id in type_ids)
+        ]
+
+        # Sorting by the lowercased labels alone is several times faster than
+        # sorting by tuples.
+        matches.sort(key=lowered.__getitem__)
+
+        return [entries[key] for key in matches[:limit]]
+
+    def candidates(self, query: str) -> set[tuple[str, str]]:
+        """Returns the entries whose label has every trigram of the query."""
+
+        postings = sorted(
+            (self.postings.get(gram, set()) for gram in trigrams(query)), key=len
+        )
+
+        # Starting from the rarest trigram keeps the intersection small.
+        return postings[0].intersection(*postings[1:])
+
+    def type_ids(self) -> Counter[str]:
+        return Counter(entry.type_id for entry in self.entries.values())
+
+
+class LabelObserver:
+    """Keep the index current. FreeCAD calls these for every document."""
+
+    def __init__(self, index: LabelIndex) -> None:
+        self.index = index
+
+    def slotCreatedObject(self, obj: DocumentObjectProxy) -> None:
+        # Documents that haven't been searched yet are indexed on their first search.
+        if obj.Document.Name in self.index.documents:
+            self.index.add(entry_for(obj))
+
+    def slotDeletedObject(self, obj: DocumentObjectProxy) -> None:
+        self.index.remove(obj.Document.Name, obj.Name)
+
+    def slotChangedObject(self, obj: DocumentObjectProxy, prop: str) -> None:
+        # Called for every property change so it has to return quickly.
+        if prop == "Label" and obj.Document.Name in self.index.documents:
+            self.index.add(entry_for(obj))
+
+    def slotFinishRestoreDocument(self, document: DocumentProxy) -> None:
+        self.index.remove_document(document.Name)
+
+    def slotDeletedDocument(self, document: DocumentProxy) -> None:
+        self.index.remove_document(document.Name)
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i : i + SIZE_GRAM] for i in range(len(text) - SIZE_GRAM + 1)}
+
+
+def entry_for(obj: DocumentObjectProxy) -> Entry:
+    return Entry(obj.Document.Name, obj.Name, obj.Label, obj.TypeId)
+
+
+INDEX = LabelIndex()
+
+OBSERVER: LabelObserver | None = None
+
+
+def get_index() -> LabelIndex:
+    """Returns the index of every open document, starting the observer if needed."""
+
+    global OBSERVER  # noqa: PLW0603
+
+    import FreeCAD
+
+    if OBSERVER is None:
+        OBSERVER = LabelObserver(INDEX)
+        FreeCAD.addDocumentObserver(OBSERVER)
+
+    documents = FreeCAD.listDocuments()
+
+    for name in INDEX.documents - documents.keys():
+        INDEX.remove_document(name)
+
+    for name, document in documents.items():
+        if name not in INDEX.documents:
+            INDEX.add_document(document)
+
+    return INDEX
+
+
+def search(
+    query: str,
+    type_ids: Iterable[str] | None = None,
+    limit: int | None = None,
+) -> list[Entry]:
+    return get_index().search(query, type_ids, limit)
@@ -0,0 +1,321 @@
+"""Merge PDFs into one file as they're produced.
+
+FreeCAD only exports one TechDraw page per PDF. `PdfMerger` appends each exported file
+to a single output as soon as it's written, so only one page is ever held in memory.
+It supports the classic cross-reference tables Qt writes, not cross-reference streams.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from types import TracebackType
+
+
+RE_STARTXREF = re.compile(rb"startxref\s+(\d+)")
+RE_XREF_SECTION = re.compile(rb"\s*(\d+)\s+(\d+)\s*[\r\n]+")
+RE_XREF_ENTRY = re.compile(rb"(\d{10})\s+(\d{5})\s+([nf])")
+RE_OBJ_HEADER = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj\b")
+RE_REFERENCE = re.compile(rb"(\d+)\s+(\d+)\s+R\b")
+RE_STREAM = re.compile(rb"stream(?:\r\n|\n|\r)")
+RE_ENDOBJ = re.compile(rb"endobj\s*$")
+RE_ROOT = re.compile(rb"/Root\s+(\d+)\s+\d+\s+R")
+RE_PAGES = re.compile(rb"/Pages\s+(\d+)\s+\d+\s+R")
+RE_KIDS = re.compile(rb"/Kids\s*\[([^\]]*)\]")
+RE_COUNT = re.compile(rb"/Count\s+(\d+)")
+
+HEADER = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+
+
+@dataclass
+class PdfObject:
+    # Everything between `N G obj` and `stream` or `endobj`.
+    head: bytes
+    # The raw stream including the `stream` and `endstream` keywords.
+    stream: bytes = b""
+    references: list[int] = field(default_factory=list)
+
+
+@dataclass
+class Bookmark:
+    title: str
+    page: int
+
+
+class PdfMerger:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file = path.open("wb")
+        self._file.write(HEADER)
+
+        # Byte offsets indexed by object number. Object 0 is always free.
+        self._offsets: list[int] = [0]
+        self._kids: list[int] = []
+        self._page_count = 0
+        self._bookmarks: list[Bookmark] = []
+
+        # The root of the page tree is written last but its number is needed up front
+        # for every appended page tree's `/Parent`.
+        self._pages = self._reserve()
+
+    def __enter__(self) -> PdfMerger:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+    @property
+    def page_count(self) -> int:
+        return self._page_count
+
+    def append(self, source: Path, title: str | None = None) -> None:
+        """Append every page in a PDF file.
+
+        Args:
+            source: The PDF to append.
+            title: Add a bookmark to the first appended page with this title.
+        """
+
+        data = source.read_bytes()
+        objects, root = parse(data)
+
+        pages = find_int(RE_PAGES, objects[root].head)
+        kids = find_references(RE_KIDS, objects[pages].head)
+        count = find_int(RE_COUNT, objects[pages].head)
+
+        # Only copy what the page tree uses. This drops the catalog and anything only
+        # it refers to e.g. metadata and output intents.
+        reachable = reachable_from(pages, objects)
+        numbers = {number: self._reserve() for number in sorted(reachable)}
+
+        def renumber(match: re.Match[bytes]) -> bytes:
+            number = int(match[1])
+            if number not in numbers:
+                return b"null"
+            return f"{numbers[number]} 0 R".encode()
+
+        for number in sorted(reachable):
+            obj = objects[number]
+            head = RE_REFERENCE.sub(renumber, obj.head)
+
+            if number == pages:
+                parent = f"<< /Parent {self._pages} 0 R".encode()
+                head = head.replace(b"<<", parent, 1)
+
+            self._write(numbers[number], head, obj.stream)
+
+        self._kids.append(numbers[pages])
+        self._page_count += count
+
+        if title is not None and kids:
+            self._bookmarks.append(Bookmark(title=title, page=numbers[kids[0]]))
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+
+        kids = " ".join(f"{kid} 0 R" for kid in self._kids)
+        self._write(
+            self._pages,
+            f"<< /Type /Pages /Kids [{kids}] /Count {self._page_count} >>".encode(),
+        )
+
+        catalog = f"/Type /Catalog /Pages {self._pages} 0 R"
+
+        if self._bookmarks:
+            outlines = self._write_outlines()
+            catalog += f" /Outlines {outlines} 0 R /PageMode /UseOutlines"
+
+        root = self._reserve()
+        self._write(root, f"<< {catalog} >>".encode())
+
+        self._write_xref(root)
+        self._file.close()
+
+    def _reserve(self) -> int:
+        self._offsets.append(0)
+        return len(self._offsets) - 1
+
+    def _write(self, number: int, head: bytes, stream: bytes = b"") -> None:
+        self._offsets[number] = self._file.tell()
+        self._file.write(f"{number} 0 obj\n".encode())
+        self._file.write(head.strip())
+        if stream:
+            self._file.write(b"\n")
+            self._file.write(stream)
+        self._file.write(b"\nendobj\n")
+
+    def _write_outlines(self) -> int:
+        outlines = self._reserve()
+        items = [self._reserve() for _ in self._bookmarks]
+
+        for i, bookmark in enumerate(self._bookmarks):
+            item = items[i]
+            entries = [
+                f"/Title {encode_text(bookmark.title)}",
+                f"/Parent {outlines} 0 R",
+                f"/Dest [{bookmark.page} 0 R /Fit]",
+            ]
+            if i > 0:
+                entries.append(f"/Prev {items[i - 1]} 0 R")
+            if i < len(items) - 1:
+                entries.append(f"/Next {items[i + 1]} 0 R")
+
+            self._write(item, f"<< {' '.join(entries)} >>".encode())
+
+        self._write(
+            outlines,
+            (
+                f"<< /Type /Outlines /First {items[0]} 0 R /Last {items[-1]} 0 R "
+                f"/Count {len(items)} >>"
+            ).encode(),
+        )
+
+        return outlines
+
+    def _write_xref(self, root: int) -> None:
+        offset = self._file.tell()
+
+        self._file.write(f"xref\n0 {len(self._offsets)}\n".encode())
+        self._file.write(b"0000000000 65535 f \n")
+
+        for number in range(1, len(self._offsets)):
+            self._file.write(f"{self._offsets[number]:010d} 00000 n \n".encode())
+
+        self._file.write(
+            (
+                f"trailer\n<< /Size {len(self._offsets)} /Root {root} 0 R >>\n"
+                f"startxref\n{offset}\n%%EOF\n"
+            ).encode()
+        )
+
+
+# Parsing
+
+
+def parse(data: bytes) -> tuple[dict[int, PdfObject], int]:
+    """Parse a PDF's objects using its cross-reference table.
+
+    Returns:
+        The objects by number and the number of the document catalog.
+    """
+
+    matches = list(RE_STARTXREF.finditer(data))
+
+    if not matches:
+        raise ValueError("Invalid PDF: missing 'startxref'.")
+
+    xref = int(matches[-1][1])
+
+    if not data.startswith(b"xref", xref):
+        raise ValueError("Unsupported PDF: cross-reference streams aren't supported.")
+
+    offsets: dict[int, int] = {}
+    position = xref + len(b"xref")
+
+    while section := RE_XREF_SECTION.match(data, position):
+        start, count = int(section[1]), int(section[2])
+        position = section.end()
+
+        for i in range(count):
+            entry = RE_XREF_ENTRY.match(data, position)
+
+            if entry is None:
+                raise ValueError("Invalid PDF: malformed cross-reference table.")
+
+            position = entry.end()
+
+            while data[position : position + 1] in (b" ", b"\r", b"\n"):
+                position += 1
+
+            if entry[3] == b"n":
+                offsets[start + i] = int(entry[1])
+
+    trailer = data[position : data.find(b"startxref", position)]
+    root = find_int(RE_ROOT, trailer)
+
+    # Each object runs until the next one starts. The last runs until the table.
+    ordered = sorted(offsets.items(), key=lambda item: item[1])
+    ends = [offset for _, offset in ordered[1:]] + [xref]
+
+    objects = {}
+
+    for (number, start), end in zip(ordered, ends, strict=True):
+        objects[number] = parse_object(data[start:end])
+
+    return objects, root
+
+
+def parse_object(data: bytes) -> PdfObject:
+    header = RE_OBJ_HEADER.match(data)
+
+    if header is None:
+        raise ValueError("Invalid PDF: object offset doesn't point to an object.")
+
+    body = data[header.end() :]
+    stream = RE_STREAM.search(body)
+
+    if stream is not None:
+        head = body[: stream.start()]
+        end = body.rfind(b"endstream")
+        raw = body[stream.start() : end + len(b"endstream")]
+    else:
+        head = RE_ENDOBJ.sub(b"", body.rstrip())
+        raw = b""
+
+    references = [int(match[1]) for match in RE_REFERENCE.finditer(head)]
+
+    return PdfObject(head=head, stream=raw, references=references)
+
+
+def reachable_from(number: int, objects: dict[int, PdfObject]) -> set[int]:
+    seen = set()
+    stack = [number]
+
+    while stack:
+        current = stack.pop()
+
+        if current in seen or current not in objects:
+            continue
+
+        seen.add(current)
+        stack.extend(objects[current].references)
+
+    return seen
+
+
+def find_int(pattern: re.Pattern[bytes], data: bytes) -> int:
+    match = pattern.search(data)
+
+    if match is None:
+        raise ValueError(f"Invalid PDF: missing {pattern.pattern!r}.")
+
+    return int(match[1])
+
+
+def find_references(pattern: re.Pattern[bytes], data: bytes) -> list[int]:
+    match = pattern.search(data)
+
+    if match is None:
+        return []
+
+    return [int(reference[1]) for reference in RE_REFERENCE.finditer(match[1])]
+
+
+def encode_text(text: str) -> str:
+    """Encode text as a UTF-16 PDF string so any label can be used as a title."""
+
+    return f"<FEFF{text.encode('utf-16-be').hex().upper()}>"
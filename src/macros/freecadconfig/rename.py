@@ -0,0 +1,260 @@
+"""Rename text with an ordered list of regex rules in a single pass.
+
+The rules are read from `rename.toml` in the config directory. They're compiled into
+one pattern that alternates between them, each in its own named group, so every text
+is scanned once however many rules there are. Where more than one rule matches at
+the same place the earlier rule wins. As the text is only scanned once, a rule never
+sees another rule's replacement.
+
+A rule's groups are numbered after the earlier rules' in the combined pattern, so its
+numbered backreferences e.g. `\1` are shifted to match.
+"""
+
+from __future__ import annotations
+
+import re
+import tomllib
+from collections import Counter
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+
+PATH_CONFIG = Path(__file__).resolve().parent.parent.parent / "config"
+PATH_RENAME_TOML = PATH_CONFIG / "rename.toml"
+
+PREFIX_GROUP = "rule_"
+
+# Global inline flags e.g. `(?i)` are only allowed at the start of a whole pattern.
+RE_GLOBAL_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+# A conditional on a numbered group e.g. `(?(1)yes|no)`.
+RE_CONDITIONAL = re.compile(r"\(\?\((\d+)\)")
+
+DIGITS = "0123456789"
+DIGITS_OCTAL = "01234567"
+
+# Backreferences only take two digits.
+MAX_GROUP_REFERENCE = 99
+
+
+@dataclass
+class RenameRule:
+    pattern: str
+    replace: str
+
+
+@dataclass
+class Change:
+    # What was renamed e.g. an object's name or a sheet's cell.
+    source: str
+    old: str
+    new: str
+
+
+class Renamer:
+    """Apply every rule to each text in one scan and count each rule's hits."""
+
+    def __init__(self, rules: list[RenameRule]) -> None:
+        self.rules = rules
+        self.patterns: list[re.Pattern] = []
+
+        for number, rule in enumerate(rules, start=1):
+            try:
+                self.patterns.append(re.compile(rule.pattern))
+            except re.error as e:
+                raise ValueError(f"Invalid pattern in rule {number}: {e}") from e
+
+        alternatives = []
+        # The number of the group wrapping the next rule.
+        offset = 1
+
+        for i, (rule, pattern) in enumerate(zip(rules, self.patterns, strict=True)):
+            try:
+                shifted = shift_group_references(scope_flags(rule.pattern), offset)
+            except ValueError as e:
+                raise ValueError(f"Unable to combine rule {i + 1}: {e}") from e
+
+            alternatives.append(f"(?P<{PREFIX_GROUP}{i}>{shifted})")
+            offset += 1 + pattern.groups
+
+        try:
+            self.combined = re.compile("|".join(alternatives))
+        except re.error as e:
+            # The rules' own group names clash.
+            raise ValueError(f"Unable to combine the rules: {e}") from e
+
+        # Replacements without group references are used as they are rather than
+        # matching their rule again to expand them.
+        self.literals = [
+            None if "\\" in rule.replace else rule.replace for rule in rules
+        ]
+
+        self.hits: Counter[int] = Counter()
+        self.changes: list[Change] = []
+
+    def rename(self, text: str, source: str = "") -> str:
+        """Returns the renamed text and records the change if there is one."""
+
+        if not self.rules:
+            return text
+
+        new = self.combined.sub(self.substitute, text)
+
+        if new != text:
+            self.changes.append(Change(source, text, new))
+
+        return new
+
+    def substitute(self, match: re.Match) -> str:
+        # Each rule's group wraps the whole of its alternative, so it's the last
+        # group to close.
+        name = match.lastgroup or ""
+        index = int(name.removeprefix(PREFIX_GROUP))
+        self.hits[index] += 1
+
+        literal = self.literals[index]
+
+        if literal is not None:
+            return literal
+
+        # The rule's own groups are numbered differently inside the combined
+        # pattern, so the rule is matched again where it matched to expand them.
+        rule_match = self.patterns[index].match(match.string, match.start())
+
+        if rule_match is None:
+            return match.group()
+
+        return rule_match.expand(self.rules[index].replace)
+
+
+def scope_flags(pattern: str) -> str:
+    """Turn a pattern's global flags into flags scoped to the pattern."""
+
+    match = RE_GLOBAL_FLAGS.match(pattern)
+
+    if match is None:
+        return pattern
+
+    flags = match.group(1)
+
+    # A verbose pattern's trailing comment would otherwise swallow the `)`.
+    end = "\n)" if "x" in flags else ")"
+
+    return f"(?{flags}:{pattern[match.end():]}{end}"
+
+
+def shift_group_references(pattern: str, offset: int) -> str:
+    """Shift a pattern's numbered backreferences and conditionals by an offset.
+
+    Escapes are read the way `re` reads them: `\0` and three octal digits are
+    characters, as is anything inside a character class.
+
+    Raises:
+        ValueError: If a shifted reference is past what a backreference can refer to.
+    """
+
+    def shift(number: str) -> str:
+        shifted = int(number) + offset
+
+        if shifted > MAX_GROUP_REFERENCE:
+            raise ValueError(
+                f"group {number} would be group {shifted} in the combined pattern, "
+                f"past the {MAX_GROUP_REFERENCE} a backreference can refer to. Move "
+                f"the rule up or use named groups."
+            )
+
+        return str(shifted)
+
+    parts = []
+    in_class = False
+    i = 0
+
+    while i < len(pattern):
+        char = pattern[i]
+
+        if char == "\\":
+            escape = pattern[i : i + 2]
+            i += 2
+
+            if in_class or len(escape) < 2 or escape[1] not in DIGITS[1:]:
+                parts.append(escape)
+                continue
+
+            digits = escape[1]
+            rest = pattern[i : i + 2]
+
+            if rest[:1] and rest[0] in DIGITS:
+                # Three octal digits are a character rather than a reference.
+                if (
+                    digits in DIGITS_OCTAL
+                    and rest[0] in DIGITS_OCTAL
+                    and rest[1:2]
+                    and rest[1] in DIGITS_OCTAL
+                ):
+                    parts.append(escape + rest)
+                    i += 2
+                    continue
+
+                digits += rest[0]
+                i += 1
+
+            # Grouped so a digit that follows isn't read as part of the reference.
+            parts.append(f"(?:\\{shift(digits)})")
+        elif in_class:
+            parts.append(char)
+            i += 1
+
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            start = i
+            i += 1
+
+            # A `]` straight after the opening bracket is a character in the class.
+            if pattern[i : i + 1] == "^":
+                i += 1
+            if pattern[i : i + 1] == "]":
+                i += 1
+
+            parts.append(pattern[start:i])
+        elif match := RE_CONDITIONAL.match(pattern, i):
+            parts.append(f"(?({shift(match[1])})")
+            i = match.end()
+        else:
+            parts.append(char)
+            i += 1
+
+    return "".join(parts)
+
+
+def load_rules(path: Path = PATH_RENAME_TOML) -> list[RenameRule]:
+    with path.open(mode="rb") as f:
+        items = tomllib.load(f).get("rule", [])
+
+    names = {item.name for item in fields(RenameRule)}
+
+    for item in items:
+        if set(item.keys()) != names:
+            raise ValueError(f"Encountered invalid fields for RenameRule.\n{item}")
+
+    return [RenameRule(**item) for item in items]
+
+
+def print_report(renamer: Renamer) -> None:
+    print(f"{'rule':>4} {'hits':>6}  pattern -> replace")
+
+    for i, rule in enumerate(renamer.rules):
+        print(f"{i + 1:>4} {renamer.hits[i]:>6}  {rule.pattern!r} -> {rule.replace!r}")
+
+    unused = sum(1 for i in range(len(renamer.rules)) if not renamer.hits[i])
+
+    if unused:
+        print(f"{unused} rules matched nothing.")
+
+
+def print_diff(changes: list[Change]) -> None:
+    for change in changes:
+        print(change.source)
+        print(f"- {change.old}")
+        print(f"+ {change.new}")
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import functools
+import importlib.util
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import FreeCAD
+import FreeCADGui
+from PySide import QtWidgets
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from types import ModuleType
+
+    # These are FreeCAD types that seem inaccessible to Python.
+    DocumentProxy = Any
+    DocumentObjectProxy = Any
+
+
+CLASS_NAME_SHEET_VIEW = "SpreadsheetGui::SheetView"
+
+PATH_MACROS = Path(__file__).resolve().parent.parent
+
+PREFIX_MACRO_MODULE = "freecadconfig_macro_"
+
+
+class ObjectIndex:
+    """Index a set of document objects by `TypeId` and `Label`.
+
+    The index is built in a single pass and is meant to live for the duration of one
+    macro run. Build a new one on every run as the document changes between runs.
+    """
+
+    def __init__(self, objects: Iterable[DocumentObjectProxy]) -> None:
+        self.objects: list[DocumentObjectProxy] = []
+        self._by_type_id: dict[str, list[DocumentObjectProxy]] = defaultdict(list)
+        self._by_label: dict[str, list[DocumentObjectProxy]] = defaultdict(list)
+
+        for obj in objects:
+            self.objects.append(obj)
+            self._by_type_id[obj.TypeId].append(obj)
+            self._by_label[obj.Label].append(obj)
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    @classmethod
+    def from_document(cls, document: DocumentProxy | None = None) -> ObjectIndex:
+        document = document or FreeCAD.activeDocument()
+        return cls(document.Objects)
+
+    @classmethod
+    def from_selection_or_document(
+        cls, document: DocumentProxy | None = None
+    ) -> ObjectIndex:
+        return cls(get_selection_or_document_objects(document))
+
+    def by_type_id(self, *type_ids: str) -> list[DocumentObjectProxy]:
+        if len(type_ids) == 1:
+            return list(self._by_type_id.get(type_ids[0], []))
+
+        return [
+            obj for type_id in type_ids for obj in self._by_type_id.get(type_id, [])
+        ]
+
+    def by_label(self, label: str) -> list[DocumentObjectProxy]:
+        return list(self._by_label.get(label, []))
+
+    def type_ids(self) -> set[str]:
+        return set(self._by_type_id.keys())
+
+
+# Selection
+
+
+def get_selection_or_document_objects(
+    document: DocumentProxy | None = None,
+) -> list[DocumentObjectProxy]:
+    """Returns the selected objects or, if nothing is selected, every object in the
+    document."""
+
+    selection = FreeCADGui.Selection.getSelection()
+
+    if selection:
+        return selection
+
+    document = document or FreeCAD.activeDocument()
+
+    return document.Objects
+
+
+# Session State
+
+# A macro's module is replaced whenever the host reloads its edited file, and running
+# it from FreeCAD's macro dialog executes the file from scratch, but `freecadconfig`
+# stays imported for the whole session. Macros that need to remember something
+# between runs, e.g. to undo what they did, keep it here under their own name.
+SESSION_STATE: dict[str, dict[str, Any]] = defaultdict(dict)
+
+
+def get_session_state(name: str) -> dict[str, Any]:
+    return SESSION_STATE[name]
+
+
+# Widgets
+
+# The main window and its children live for the whole session so we only look them
+# up once. The active MDI sub-window changes between runs so it's never cached.
+
+# Only the dock widgets that were found are kept, as workbenches create their own
+# later in the session.
+DOCK_WIDGETS: dict[str, QtWidgets.QDockWidget] = {}
+
+
+@functools.cache
+def get_main_window() -> QtWidgets.QMainWindow:
+    return FreeCADGui.getMainWindow()
+
+
+@functools.cache
+def get_mdi_area() -> QtWidgets.QMdiArea:
+    return get_main_window().findChild(QtWidgets.QMdiArea)
+
+
+def get_dock_widget(name: str) -> QtWidgets.QDockWidget | None:
+    dock_widget = DOCK_WIDGETS.get(name)
+
+    if dock_widget is None:
+        dock_widget = get_main_window().findChild(QtWidgets.QDockWidget, name)
+
+        if dock_widget is not None:
+            DOCK_WIDGETS[name] = dock_widget
+
+    return dock_widget
+
+
+def find_sheet_table_view() -> QtWidgets.QTableView | None:
+    """Returns the table view of the active spreadsheet or the first open one."""
+
+    mdi_area = get_mdi_area()
+
+    sub_windows = mdi_area.subWindowList()
+    active = mdi_area.activeSubWindow()
+
+    if active is not None:
+        sub_windows = [active, *sub_windows]
+
+    for sub_window in sub_windows:
+        widget = sub_window.widget()
+
+        if widget.metaObject().className() == CLASS_NAME_SHEET_VIEW:
+            return widget.findChild(QtWidgets.QTableView)
+
+    return None
+
+
+# Macros
+
+
+def macro_globals() -> dict[str, Any]:
+    """Returns the globals FreeCAD provides to a macro it runs."""
+
+    return {
+        "App": FreeCAD,
+        "FreeCAD": FreeCAD,
+        "FreeCADGui": FreeCADGui,
+        "Gui": FreeCADGui,
+    }
+
+
+def load_macro(path: Path | str) -> ModuleType:
+    """Import a macro file as a module without running it.
+
+    Relative paths are resolved against the macros directory. The macros expect the
+    globals FreeCAD provides when it runs them so they're added before the module is
+    executed. The `__main__` guard at the bottom of each macro keeps `main` from
+    running.
+    """
+
+    path = PATH_MACROS / path
+
+    spec = importlib.util.spec_from_file_location(
+        f"{PREFIX_MACRO_MODULE}{path.stem}", path
+    )
+
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Unable to load macro {path}.")
+
+    module = importlib.util.module_from_spec(spec)
+    module.__dict__.update(macro_globals())
+
+    # Dataclasses look up their module in `sys.modules` while they're created.
+    sys.modules[spec.name] = module
+
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[spec.name]
+        raise
+
+    return module
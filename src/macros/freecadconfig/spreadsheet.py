@@ -0,0 +1,135 @@
+"""Address spreadsheet cells and find the references in their expressions.
+
+Cells are addressed in A1 notation. Rows and columns are zero based when they're
+indices, e.g. `A1` is `(0, 0)`.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    # This is a FreeCAD type that seems inaccessible to Python.
+    SheetProxy = Any
+
+
+TYPE_ID_SHEET = "Spreadsheet::Sheet"
+
+RE_CELL = re.compile(r"\$?([A-Z]+)\$?(\d+)")
+
+# A reference to a cell, a range of cells, an alias or a property in an expression.
+# It's either unqualified or qualified by an object's name or `<<label>>`. Names
+# following a `.` are the rest of a chain e.g. `Box.Shape.Volume` and are skipped.
+# Names followed by `(` are functions.
+RE_REFERENCE = re.compile(
+    r"(?<![\w.$>])"
+    r"(?:(?:<<(?P<label>[^>]+)>>|(?P<name>[A-Za-z_]\w*))\.)?"
+    r"(?P<target>"
+    r"\$?[A-Z]+\$?\d+:\$?[A-Z]+\$?\d+\b"
+    r"|\$?[A-Z]+\$?\d+\b"
+    r"|[A-Za-z_]\w*\b(?!\s*\()"
+    r")"
+)
+
+# A `<<text>>` that isn't followed by `.` is a string rather than a label.
+RE_STRING = re.compile(r"<<[^>]*>>(?!\s*\.)")
+
+
+class Reference(NamedTuple):
+    # The object's name, its label as `<<label>>` or `""` if it's unqualified.
+    owner: str
+    # A cell e.g. `A1`, a range e.g. `A1:B3`, an alias or a property.
+    target: str
+
+
+def parse_cell_range(cell_range: str) -> tuple[int, int, int, int]:
+    start_cell, end_cell = cell_range.split(":")
+    start_row, start_column = cell_to_index(start_cell)
+    end_row, end_column = cell_to_index(end_cell)
+    return start_row, start_column, end_row, end_column
+
+
+def cell_to_index(cell: str) -> tuple[int, int]:
+    match = RE_CELL.match(cell)
+    if not match:
+        raise ValueError(f"Invalid cell format: {cell}")
+    col_str, row_str = match.groups()
+    col = (
+        sum(
+            (ord(char) - ord("A") + 1) * (26**i)
+            for i, char in enumerate(reversed(col_str))
+        )
+        - 1
+    )
+    row = int(row_str) - 1
+    return row, col
+
+
+def index_to_cell(row: int, col: int) -> str:
+    col_str = ""
+    col += 1
+    while col:
+        col, remainder = divmod(col - 1, 26)
+        col_str = chr(ord("A") + remainder) + col_str
+    return f"{col_str}{row + 1}"
+
+
+def is_cell(target: str) -> bool:
+    return RE_CELL.fullmatch(target) is not None
+
+
+def expand_cells(target: str) -> list[str]:
+    """Returns every cell in a cell or a range of cells without any `$`."""
+
+    if ":" not in target:
+        return [index_to_cell(*cell_to_index(target))]
+
+    start_row, start_column, end_row, end_column = parse_cell_range(target)
+
+    return [
+        index_to_cell(row, column)
+        for row in range(min(start_row, end_row), max(start_row, end_row) + 1)
+        for column in range(
+            min(start_column, end_column), max(start_column, end_column) + 1
+        )
+    ]
+
+
+def find_references(expression: str) -> Iterator[Reference]:
+    expression = RE_STRING.sub("", expression)
+
+    for match in RE_REFERENCE.finditer(expression):
+        if match["label"] is not None:
+            owner = f"<<{match['label']}>>"
+        else:
+            owner = match["name"] or ""
+
+        yield Reference(owner, match["target"])
+
+
+def iter_cells(sheet: SheetProxy) -> Iterator[tuple[str, str]]:
+    """Yields the address and contents of every non-empty cell in a sheet."""
+
+    for cell in sheet.getNonEmptyCells():
+        contents = sheet.getContents(cell)
+
+        if contents:
+            yield cell, contents
+
+
+def get_aliases(sheet: SheetProxy, cells: list[str]) -> dict[str, str]:
+    """Returns the cells of a sheet by their alias."""
+
+    aliases = {}
+
+    for cell in cells:
+        alias = sheet.getAlias(cell)
+
+        if alias:
+            aliases[alias] = cell
+
+    return aliases
@@ -0,0 +1,159 @@
+"""Record which workbenches and macros are used in each FreeCAD session.
+
+`install_startup_mod` installs a startup `Mod` that calls `start` when FreeCAD's GUI
+loads. Counts are kept in memory and appended to `usage.jsonl` in FreeCAD's user data
+directory as one line per session when FreeCAD quits. `tools.usage_report` turns them
+into the workbench section of `preferences.toml`.
+
+FreeCAD activates the start workbench and every background autoloaded workbench while
+it starts. Counting those would only repeat `preferences.toml` back to the report, so
+activations are recorded once FreeCAD's event loop runs. The workbench FreeCAD
+started in is recorded as used then, as it's in use without ever being switched to.
+
+This module only imports FreeCAD in `UsageRecorder`'s methods so the recorded usage
+can be read from a plain Python interpreter.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+
+
+NAME_USAGE = "usage.jsonl"
+
+NAME_NONE_WORKBENCH = "NoneWorkbench"
+
+
+@dataclass
+class Session:
+    started: float = field(default_factory=time.time)
+    ended: float | None = None
+    # The workbench FreeCAD started in.
+    start: str | None = None
+    # The first workbench switched to once FreeCAD had started, if any.
+    first: str | None = None
+    workbenches: Counter[str] = field(default_factory=Counter)
+    macros: Counter[str] = field(default_factory=Counter)
+    # Every workbench FreeCAD could have activated.
+    available: list[str] = field(default_factory=list)
+
+
+class UsageRecorder:
+    def __init__(self) -> None:
+        self.path: Path | None = None
+        self.session = Session()
+        self.recording = False
+
+    def start(self, path: Path | None = None) -> None:
+        """Start recording workbench activations and write them out on quit."""
+
+        import FreeCAD
+        import FreeCADGui
+        from PySide import QtCore, QtWidgets
+
+        if self.path is not None:
+            return
+
+        self.path = path or default_path(FreeCAD.getUserAppDataDir())
+
+        FreeCADGui.getMainWindow().workbenchActivated.connect(self.record_workbench)
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.flush)
+
+        QtCore.QTimer.singleShot(0, self.start_recording)
+
+    def start_recording(self) -> None:
+        """Start recording once FreeCAD's event loop runs, after all its autoloading."""
+
+        import FreeCADGui
+        from PySide import QtCore
+
+        # The splash screen processes events while FreeCAD starts, which runs timers
+        # before the event loop does.
+        if QtCore.QThread.currentThread().loopLevel() == 0:
+            QtCore.QTimer.singleShot(0, self.start_recording)
+            return
+
+        self.recording = True
+
+        workbench = FreeCADGui.activeWorkbench()
+
+        if workbench is not None and workbench.name() != NAME_NONE_WORKBENCH:
+            self.session.start = workbench.name()
+            self.session.workbenches[self.session.start] += 1
+
+    def record_workbench(self, name: str) -> None:
+        # Activations while FreeCAD starts are made by its autoload, not the user.
+        if not self.recording:
+            return
+
+        if self.session.first is None and name != NAME_NONE_WORKBENCH:
+            self.session.first = name
+
+        self.session.workbenches[name] += 1
+
+    def record_macro(self, file: str) -> None:
+        self.session.macros[file] += 1
+
+    def flush(self) -> None:
+        """Append the current session to the usage file and start a new one."""
+
+        import FreeCADGui
+
+        if self.path is None:
+            return
+
+        self.session.ended = time.time()
+
+        # Workbenches are still being registered while FreeCAD starts, so they're
+        # only listed now.
+        self.session.available = sorted(FreeCADGui.listWorkbenches())
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Not `asdict` as it would rebuild the counters from `(name, count)` tuples.
+        data = {
+            item.name: getattr(self.session, item.name) for item in fields(self.session)
+        }
+
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(data) + "\n")
+
+        self.session = Session()
+
+
+def default_path(user_app_data: str | Path) -> Path:
+    return Path(user_app_data) / "FreeCADConfig" / NAME_USAGE
+
+
+def read_sessions(path: Path) -> list[Session]:
+    """Read every recorded session, skipping any line a crash left half written."""
+
+    sessions = []
+
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            data["workbenches"] = Counter(data.get("workbenches", {}))
+            data["macros"] = Counter(data.get("macros", {}))
+            sessions.append(Session(**data))
+
+    return sessions
+
+
+RECORDER = UsageRecorder()
+
+
+def start() -> None:
+    RECORDER.start()
+
+
+def record_macro(file: str) -> None:
+    RECORDER.record_macro(file)
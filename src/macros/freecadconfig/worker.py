@@ -0,0 +1,284 @@
+"""Run a single job inside a `FreeCAD` or `FreeCADCmd` process.
+
+This file is run as a script by `workers.run_job`. The job is read from the JSON file
+named by the `FREECADCONFIG_JOB` environment variable and the result is written to the
+path given in the job.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+
+PATH_MACROS = Path(__file__).resolve().parent.parent
+
+if str(PATH_MACROS) not in sys.path:
+    sys.path.insert(0, str(PATH_MACROS))
+
+import FreeCAD  # noqa: E402
+import FreeCADGui  # noqa: E402
+from freecadconfig import instrument, runtime, workers  # noqa: E402
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    # This is a FreeCAD type that seems inaccessible to Python.
+    DocumentProxy = Any
+
+    Task = Callable[[DocumentProxy, dict[str, Any]], dict[str, Any]]
+
+
+TYPE_ID_SHEET = "Spreadsheet::Sheet"
+
+
+def task_export_drawings(document: DocumentProxy, args: dict[str, Any]) -> dict:
+    macro = runtime.load_macro("ExportDrawingsIso5457Minimal.py")
+
+    output_directory = output_directory_for(document, args)
+
+    macro.UserMacro().run(
+        macro.PageDataIso5457(**args.get("page_data", {})),
+        output_directory,
+        revision=args.get("revision", ""),
+        date_format=args.get("date_format"),
+        merge=args.get("merge", False),
+        svg=args.get("svg", False),
+    )
+
+    return {"output_directory": str(output_directory)}
+
+
+def task_export_spreadsheet(document: DocumentProxy, args: dict[str, Any]) -> dict:
+    macro = runtime.load_macro("ExportSpreadsheet.py")
+
+    output_directory = output_directory_for(document, args)
+    output_directory.mkdir(parents=True, exist_ok=True)
+
+    sheets = runtime.ObjectIndex.from_document(document).by_type_id(TYPE_ID_SHEET)
+
+    for sheet in sheets:
+        macro.UserMacro.export_sheet(
+            sheet,
+            args["cell_range"],
+            output_directory / f"{sheet.Label}.csv",
+        )
+
+    return {"output_directory": str(output_directory), "sheets": len(sheets)}
+
+
+def task_export_step(document: DocumentProxy, args: dict[str, Any]) -> dict:
+    macro = runtime.load_macro("ExportStepBodies.py")
+
+    # `ExportStepBodies` sends the bodies it wants exported, reusing its manifest.
+    if "bodies" in args:
+        objects = [document.getObject(name) for name in args["bodies"]]
+        exported, failed = macro.export_here(
+            [obj for obj in objects if obj is not None],
+            Path(args["output_directory"]),
+            args["files"],
+        )
+        return {"exported": exported, "failed": failed}
+
+    output_directory = output_directory_for(document, args)
+    exported = macro.UserMacro().run(output_directory, jobs=1)
+
+    return {"output_directory": str(output_directory), "exported": len(exported)}
+
+
+def task_list_workbenches(document: DocumentProxy, args: dict[str, Any]) -> dict:
+    workbenches = {
+        name: {"path": workbench_path(workbench)}
+        for name, workbench in FreeCADGui.listWorkbenches().items()
+    }
+
+    return {
+        "workbenches": workbenches,
+        "active": FreeCADGui.activeWorkbench().name(),
+        "addons": str(Path(FreeCAD.getUserAppDataDir()) / "Mod"),
+        "rss": instrument.current_memory(),
+        "modules": len(sys.modules),
+    }
+
+
+def task_open(document: DocumentProxy, args: dict[str, Any]) -> dict:
+    """Time opening a document and, if asked, recomputing it. The document is opened
+    here rather than by the worker so only the opening is timed."""
+
+    start = time.perf_counter()
+    opened = FreeCAD.openDocument(args["path"])
+    details = {"open": time.perf_counter() - start, "objects": len(opened.Objects)}
+
+    try:
+        if args.get("recompute"):
+            start = time.perf_counter()
+            opened.recompute()
+            details["recompute"] = time.perf_counter() - start
+    finally:
+        FreeCAD.closeDocument(opened.Name)
+
+    return details
+
+
+def task_profile_mod(document: DocumentProxy, args: dict[str, Any]) -> dict:
+    """Returns how long FreeCAD took to start and what it loaded.
+
+    Started with a single add-on Mod, the difference from starting with none is what
+    running the Mod's `Init.py` and `InitGui.py` costs.
+    """
+
+    return {
+        "mod": args["mod"],
+        "startup": time.time() - float(os.environ[workers.ENV_LAUNCHED]),
+        "rss": instrument.current_memory(),
+        "modules": len(sys.modules),
+    }
+
+
+def task_profile_workbench(document: DocumentProxy, args: dict[str, Any]) -> dict:
+    workbench = args["workbench"]
+
+    modules = len(sys.modules)
+    rss = instrument.current_memory()
+    start = time.perf_counter()
+
+    # Activating a workbench for the first time imports its modules and runs its
+    # `Initialize`, which is what autoloading it at startup costs.
+    FreeCADGui.activateWorkbench(workbench)
+
+    activate = time.perf_counter() - start
+    rss_after = instrument.current_memory()
+
+    return {
+        "workbench": workbench,
+        "activate": activate,
+        "rss": None if rss is None or rss_after is None else rss_after - rss,
+        "modules": len(sys.modules) - modules,
+    }
+
+
+def task_recompute(document: DocumentProxy, args: dict[str, Any]) -> dict:
+    macro = runtime.load_macro("ForceRecompute.py")
+    macro.UserMacro.run()
+
+    document.save()
+
+    return {"objects": len(document.Objects)}
+
+
+def task_rename_labels(document: DocumentProxy, args: dict[str, Any]) -> dict:
+    macro = runtime.load_macro("SearchAndReplaceLabels.py")
+
+    dry_run = args.get("dry_run", True)
+    labels = {obj.Name: obj.Label for obj in document.Objects}
+
+    macro.UserMacro.run(
+        args["pattern"],
+        args["replace"],
+        dry_run,
+        objects=document.Objects,
+    )
+
+    renamed = sum(1 for obj in document.Objects if labels[obj.Name] != obj.Label)
+
+    if dry_run is False:
+        document.save()
+
+    return {"renamed": renamed, "dry_run": dry_run}
+
+
+def task_restyle(document: DocumentProxy, args: dict[str, Any]) -> dict:
+    macro = runtime.load_macro("SetViewObjectViewport.py")
+    macro.UserMacro().run(**args)
+
+    document.save()
+
+    return {"objects": len(document.Objects)}
+
+
+TASKS: dict[str, Task] = {
+    "export-drawings": task_export_drawings,
+    "export-spreadsheet": task_export_spreadsheet,
+    "export-step": task_export_step,
+    "recompute": task_recompute,
+    "rename-labels": task_rename_labels,
+    "restyle": task_restyle,
+    # Internal
+    "list-workbenches": task_list_workbenches,
+    "open": task_open,
+    "profile-mod": task_profile_mod,
+    "profile-workbench": task_profile_workbench,
+}
+
+
+def output_directory_for(document: DocumentProxy, args: dict[str, Any]) -> Path:
+    """Returns a per-document output directory so documents don't overwrite each
+    other's files."""
+
+    path_document = Path(document.FileName)
+    output_directory = Path(args.get("output_directory") or path_document.parent)
+
+    return output_directory.expanduser() / path_document.stem
+
+
+def workbench_path(workbench: Any) -> str:
+    """Returns the `InitGui.py` a workbench was defined in."""
+
+    # FreeCAD compiles each `InitGui.py` with its path as the file name.
+    initialize = getattr(type(workbench), "Initialize", None)
+    code = getattr(initialize, "__code__", None)
+
+    return code.co_filename if code is not None else ""
+
+
+def main() -> int:
+    job = json.loads(Path(os.environ[workers.ENV_JOB]).read_text())
+
+    result: dict[str, Any] = {"ok": False, "error": None, "details": {}}
+
+    document = None
+    start = time.perf_counter()
+
+    try:
+        task = TASKS[job["task"]]
+
+        if job["document"]:
+            document = FreeCAD.openDocument(job["document"])
+            FreeCAD.setActiveDocument(document.Name)
+
+        name = job["task"]
+
+        if document is not None:
+            name = f"{name}-{Path(job['document']).stem}"
+
+        with instrument.measure(name):
+            result["details"] = task(document, job["args"]) or {}
+
+        result["ok"] = True
+    except Exception:
+        result["error"] = traceback.format_exc()
+    finally:
+        if document is not None:
+            FreeCAD.closeDocument(document.Name)
+
+    result["details"]["elapsed"] = time.perf_counter() - start
+
+    Path(job["result"]).write_text(json.dumps(result, default=str))
+
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    code = main()
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    # FreeCAD keeps running after a script given on the command line has finished.
+    os._exit(code)
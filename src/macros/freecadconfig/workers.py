@@ -0,0 +1,301 @@
+"""Run jobs in separate FreeCAD processes.
+
+This module doesn't import FreeCAD so it can be used both from inside FreeCAD and
+from a plain Python interpreter.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+
+ENV_JOB = "FREECADCONFIG_JOB"
+# When the worker's process was launched, as seconds since the epoch.
+ENV_LAUNCHED = "FREECADCONFIG_LAUNCHED"
+# FreeCAD's user data directory. Add-on Mods are loaded from its `Mod` directory.
+ENV_USER_DATA = "FREECAD_USER_DATA"
+
+PATH_WORKER = Path(__file__).resolve().with_name("worker.py")
+
+# Task names mapped to whether the task needs FreeCAD's GUI. GUI tasks are run with
+# the `FreeCAD` executable on an offscreen display, all others with `FreeCADCmd`.
+TASKS: dict[str, bool] = {
+    "export-drawings": True,
+    "export-spreadsheet": False,
+    # `ImportGui` is needed to export colors.
+    "export-step": True,
+    "recompute": False,
+    "rename-labels": False,
+    "restyle": True,
+}
+
+# Tasks only the tools run. They aren't run over documents so they're kept apart from
+# the tasks `tools.batch` offers.
+TASKS_INTERNAL: dict[str, bool] = {
+    "list-workbenches": True,
+    # Opening a document in the GUI also restores its view providers.
+    "open": True,
+    # FreeCAD runs every Mod's `InitGui.py` only when started with its GUI.
+    "profile-mod": True,
+    "profile-workbench": True,
+}
+
+FILE_NAME_USER_CFG = "user.cfg"
+DIR_NAME_MOD = "Mod"
+DIR_NAME_USER_DATA = "data"
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_TIMEOUT = "timeout"
+
+
+@dataclass
+class Job:
+    task: str
+    args: dict[str, Any] = field(default_factory=dict)
+    document: str | None = None
+    # The contents of a `user.cfg` FreeCAD is started with instead of the user's.
+    user_cfg: str | None = None
+    # The add-on Mod directories FreeCAD is started with instead of the user's.
+    mods: list[str] | None = None
+
+    @property
+    def gui(self) -> bool:
+        return (TASKS | TASKS_INTERNAL)[self.task]
+
+    @property
+    def name(self) -> str:
+        return Path(self.document).name if self.document else self.task
+
+
+@dataclass
+class JobResult:
+    job: Job
+    status: str
+    attempts: int = 0
+    elapsed: float = 0.0
+    error: str | None = None
+    details: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class Executables:
+    cmd: Path | None = None
+    gui: Path | None = None
+
+    def get(self, gui: bool) -> Path:
+        executable = self.gui if gui else self.cmd
+
+        if executable is None:
+            name = "FreeCAD" if gui else "FreeCADCmd"
+            raise FileNotFoundError(f"Unable to find the {name} executable.")
+
+        return executable
+
+
+def find_executables(freecad_home: Path | str | None = None) -> Executables:
+    """Find the `FreeCADCmd` and `FreeCAD` executables.
+
+    Args:
+        freecad_home: FreeCAD's home directory e.g. the value of
+            `FreeCAD.getHomePath()`. A value of `None` will search the usual install
+            locations and `PATH`.
+    """
+
+    candidates: list[Path] = []
+
+    if freecad_home:
+        home = Path(freecad_home).expanduser()
+        candidates += [home / "bin", home.parent / "MacOS", home / "MacOS"]
+
+    if sys.platform == "darwin":
+        candidates += [
+            Path("/Applications/FreeCAD.app/Contents/Resources/bin"),
+            Path("/Applications/FreeCAD.app/Contents/MacOS"),
+        ]
+
+    def find(*names: str) -> Path | None:
+        for directory in candidates:
+            for name in names:
+                if (directory / name).is_file():
+                    return directory / name
+
+        for name in names:
+            if found := shutil.which(name):
+                return Path(found)
+
+        return None
+
+    return Executables(
+        cmd=find("FreeCADCmd", "freecadcmd", "FreeCADCmd.exe"),
+        gui=find("FreeCAD", "freecad", "FreeCAD.exe"),
+    )
+
+
+def run_job(
+    job: Job,
+    executables: Executables,
+    timeout: float | None = None,
+    retries: int = 0,
+) -> JobResult:
+    """Run a job in a new FreeCAD process, retrying on failures and timeouts."""
+
+    result = JobResult(job=job, status=STATUS_FAILED)
+
+    try:
+        executable = executables.get(job.gui)
+    except FileNotFoundError as e:
+        result.error = str(e)
+        return result
+
+    env = os.environ.copy()
+
+    if job.gui:
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    start = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(prefix="freecadconfig-") as tmp:
+        path_job = Path(tmp) / "job.json"
+        path_result = Path(tmp) / "result.json"
+
+        path_job.write_text(
+            json.dumps(
+                {
+                    "task": job.task,
+                    "args": job.args,
+                    "document": job.document,
+                    "result": str(path_result),
+                }
+            )
+        )
+
+        env[ENV_JOB] = str(path_job)
+
+        command = [str(executable)]
+
+        if job.user_cfg is not None:
+            path_user_cfg = Path(tmp) / FILE_NAME_USER_CFG
+            command += ["--user-cfg", str(path_user_cfg)]
+
+        if job.mods is not None:
+            path_user_data = Path(tmp) / DIR_NAME_USER_DATA
+            link_mods(path_user_data / DIR_NAME_MOD, job.mods)
+            env[ENV_USER_DATA] = str(path_user_data)
+
+        command.append(str(PATH_WORKER))
+
+        for attempt in range(1, retries + 2):
+            result.attempts = attempt
+            path_result.unlink(missing_ok=True)
+
+            # Written for every attempt so each one starts from the same config.
+            if job.user_cfg is not None:
+                path_user_cfg.write_text(job.user_cfg, encoding="utf-8")
+
+            env[ENV_LAUNCHED] = repr(time.time())
+
+            try:
+                process = subprocess.run(
+                    command,
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout,
+                    check=False,
+                )
+            except subprocess.TimeoutExpired:
+                result.status = STATUS_TIMEOUT
+                result.error = f"Timed out after {timeout}s."
+                continue
+
+            if path_result.exists():
+                data = json.loads(path_result.read_text())
+                result.status = STATUS_OK if data["ok"] else STATUS_FAILED
+                result.error = data.get("error")
+                result.details = data.get("details", {})
+            else:
+                output = (process.stderr or process.stdout).strip()
+                result.status = STATUS_FAILED
+                result.error = (
+                    f"Worker exited with code {process.returncode} without a "
+                    f"result.\n{output[-2000:]}"
+                )
+
+            if result.ok:
+                break
+
+    result.elapsed = time.perf_counter() - start
+
+    return result
+
+
+def link_mods(path_mod: Path, mods: list[str]) -> None:
+    """Make a `Mod` directory holding only the given add-on Mods."""
+
+    path_mod.mkdir(parents=True)
+
+    for mod in mods:
+        path = Path(mod)
+
+        try:
+            (path_mod / path.name).symlink_to(path, target_is_directory=True)
+        except OSError:
+            # Windows only allows symlinks with developer mode or as an admin.
+            shutil.copytree(path, path_mod / path.name)
+
+
+def run_jobs(
+    jobs: Iterable[Job],
+    executables: Executables,
+    workers: int | None = None,
+    timeout: float | None = None,
+    retries: int = 0,
+    on_result: Callable[[JobResult], None] | None = None,
+) -> list[JobResult]:
+    """Run jobs on a pool of FreeCAD processes.
+
+    Each job gets its own process so a crash or a hang only takes down that job. The
+    results are returned in the order the jobs were given.
+    """
+
+    jobs = list(jobs)
+    workers = workers or os.cpu_count() or 1
+
+    results: dict[int, JobResult] = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run_job, job, executables, timeout, retries): i
+            for i, job in enumerate(jobs)
+        }
+
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+
+            if on_result is not None:
+                on_result(result)
+
+    return [results[i] for i in range(len(jobs))]
@@ -0,0 +1,16 @@
+"""Command line tools that run outside of FreeCAD's GUI.
+
+Run them from the root of this repo e.g. `python -m tools.batch --help`.
+"""
+
+import sys
+from pathlib import Path
+
+
+PATH_ROOT = Path(__file__).resolve().parent.parent
+PATH_MACROS = PATH_ROOT / "src" / "macros"
+
+# Make the macros' shared `freecadconfig` package and `install.py` importable.
+for path in (PATH_MACROS, PATH_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,308 @@
+"""Audit FreeCAD parameter files for drift from this repo's config.
+
+Compares the parameters `install_shortcuts` and `install_preferences` would set against
+one or many `user.cfg` files. The files are parsed in parallel and nothing is written.
+
+    python -m tools.audit ~/.config/FreeCAD/user.cfg
+    python -m tools.audit /mnt/profiles --jobs 8 --json > drift.json
+
+Exits with 1 if any file has drifted or couldn't be read.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any
+from xml.etree import ElementTree
+
+import install
+from tools import PATH_ROOT
+
+
+NAME_USER_CFG = "user.cfg"
+
+TAG_GROUP = "FCParamGroup"
+
+# Parameter elements mapped to the type suffix used by `install.encode_preference`.
+KINDS = {
+    "FCBool": "Bool",
+    "FCInt": "Int",
+    "FCUInt": "Unsigned",
+    "FCFloat": "Float",
+    "FCText": "String",
+}
+
+# Shortcuts `install_macros` assigns to the macro commands it creates.
+PREFIX_MACRO_COMMAND = "Std_Macro_"
+
+# Parameters keyed by path, then by type. FreeCAD keeps a separate value per type so
+# the same name can be stored more than once.
+Index = dict[str, dict[str, Any]]
+Desired = dict[str, tuple[str, Any]]
+
+
+@dataclass
+class Entry:
+    path: str
+    kind: str
+    expected: Any = None
+    actual: Any = None
+
+
+@dataclass
+class Audit:
+    file: str
+    added: list[Entry] = field(default_factory=list)
+    changed: list[Entry] = field(default_factory=list)
+    stale: list[Entry] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def drifted(self) -> bool:
+        return bool(self.added or self.changed or self.stale)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.drifted
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools.audit",
+        description="Audit FreeCAD parameter files for drift from this repo's config.",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        type=Path,
+        help="Parameter files or directories to search for 'user.cfg' files.",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        default=PATH_ROOT,
+        help="The root of the config repo. Defaults to this repo.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes. Defaults to the number of CPUs.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print a JSON report instead of text.",
+    )
+
+    return parser.parse_args(argv)
+
+
+def find_parameter_files(paths: list[Path]) -> list[Path]:
+    files = set()
+
+    for path in paths:
+        path = path.expanduser().resolve()
+
+        if path.is_dir():
+            files.update(path.rglob(NAME_USER_CFG))
+        else:
+            files.add(path)
+
+    return sorted(files)
+
+
+def index_parameters(path: Path) -> Index:
+    """Index every parameter in a file by its path relative to the root group."""
+
+    index: Index = defaultdict(dict)
+    groups: list[str] = []
+
+    for event, element in ElementTree.iterparse(path, events=("start", "end")):
+        if element.tag == TAG_GROUP:
+            if event == "start":
+                groups.append(element.get("Name", ""))
+            else:
+                groups.pop()
+                element.clear()
+            continue
+
+        kind = KINDS.get(element.tag)
+
+        if event != "end" or kind is None:
+            continue
+
+        # Skip the `Root` group so paths match the config's.
+        path_parameter = "/".join([*groups[1:], element.get("Name", "")])
+        index[path_parameter][kind] = decode_parameter(kind, element)
+
+    return index
+
+
+def decode_parameter(kind: str, element: ElementTree.Element) -> Any:
+    if kind == "String":
+        return element.text or ""
+
+    value = element.get("Value", "")
+
+    if kind == "Bool":
+        return value == "1"
+    if kind == "Float":
+        return float(value)
+
+    return int(value)
+
+
+def is_equal(kind: str, expected: Any, actual: Any) -> bool:
+    if kind == "Float":
+        return math.isclose(expected, actual)
+
+    return expected == actual
+
+
+def diff_parameters(desired: Desired, index: Index) -> tuple[list, list, list]:
+    added: list[Entry] = []
+    changed: list[Entry] = []
+    stale: list[Entry] = []
+
+    for path, (kind, expected) in desired.items():
+        stored = index.get(path, {})
+
+        if kind not in stored:
+            added.append(Entry(path, kind, expected=expected))
+        elif not is_equal(kind, expected, stored[kind]):
+            changed.append(Entry(path, kind, expected=expected, actual=stored[kind]))
+
+        # The same name stored as another type e.g. an `Int` that's now `Unsigned`.
+        for other, actual in stored.items():
+            if other != kind:
+                stale.append(Entry(path, other, actual=actual))
+
+    # Shortcuts are the only group the config owns entirely. Anything else in there
+    # was set by hand or by an old version of the config.
+    prefix = f"{install.P_SUBPATH_SHORTCUTS.as_posix()}/"
+
+    for path, stored in index.items():
+        if not path.startswith(prefix) or path in desired:
+            continue
+
+        command = path.removeprefix(prefix)
+
+        if "/" in command or command.startswith(PREFIX_MACRO_COMMAND):
+            continue
+
+        for kind, actual in stored.items():
+            stale.append(Entry(path, kind, actual=actual))
+
+    return added, changed, stale
+
+
+def audit_file(path: Path, desired: Desired) -> Audit:
+    audit = Audit(file=str(path))
+
+    try:
+        index = index_parameters(path)
+    except (OSError, ElementTree.ParseError) as e:
+        audit.error = str(e)
+        return audit
+
+    audit.added, audit.changed, audit.stale = diff_parameters(desired, index)
+
+    return audit
+
+
+def audit_files(files: list[Path], desired: Desired, jobs: int | None) -> list[Audit]:
+    jobs = jobs or os.cpu_count() or 1
+
+    # Small batches keep every worker busy without paying for a round trip per file.
+    chunksize = max(1, len(files) // (jobs * 4))
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(
+            executor.map(
+                partial(audit_file, desired=desired),
+                files,
+                chunksize=chunksize,
+            )
+        )
+
+
+def format_value(kind: str, value: Any) -> str:
+    return f"{value!r} ({kind})"
+
+
+def print_audit(audit: Audit) -> None:
+    if audit.error is not None:
+        print(f"{audit.file}: failed")
+        print(f"  ! {audit.error}")
+        return
+
+    if not audit.drifted:
+        print(f"{audit.file}: ok")
+        return
+
+    print(
+        f"{audit.file}: {len(audit.added)} added, {len(audit.changed)} changed, "
+        f"{len(audit.stale)} stale"
+    )
+
+    for entry in audit.added:
+        print(f"  + {entry.path} = {format_value(entry.kind, entry.expected)}")
+    for entry in audit.changed:
+        print(
+            f"  ~ {entry.path} = {entry.actual!r} -> "
+            f"{format_value(entry.kind, entry.expected)}"
+        )
+    for entry in audit.stale:
+        print(f"  - {entry.path} = {format_value(entry.kind, entry.actual)}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    files = find_parameter_files(args.paths)
+
+    if not files:
+        print(f"Found no parameter files in {', '.join(map(str, args.paths))}.")
+        return 0
+
+    desired = install.desired_parameters(args.config)
+
+    start = time.perf_counter()
+    audits = audit_files(files, desired, args.jobs)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        report = {
+            "config": str(args.config),
+            "elapsed": elapsed,
+            "audits": [asdict(audit) for audit in audits],
+        }
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        for audit in audits:
+            print_audit(audit)
+
+        drifted = sum(1 for audit in audits if audit.drifted)
+        failed = sum(1 for audit in audits if audit.error is not None)
+
+        print(
+            f"\nAudited {len(audits)} files against {len(desired)} parameters in "
+            f"{elapsed:.1f}s: {drifted} drifted, {failed} failed."
+        )
+
+    return 0 if all(audit.ok for audit in audits) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Run a macro over a directory of FreeCAD documents.
+
+Each document is processed in its own `FreeCADCmd` process, or an offscreen `FreeCAD`
+process for tasks that need the GUI, on a pool of workers.
+
+    python -m tools.batch recompute ~/Drawings --jobs 8 --timeout 300
+    python -m tools.batch export-drawings ~/Drawings --arg revision=B \\
+        --arg output_directory=~/Releases --report report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from freecadconfig import workers
+
+
+GLOB_DOCUMENTS = "*.FCStd"
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools.batch",
+        description="Run a macro over a directory of FreeCAD documents.",
+    )
+    parser.add_argument("task", choices=sorted(workers.TASKS))
+    parser.add_argument("directory", type=Path)
+    parser.add_argument(
+        "--recursive",
+        action="store_true",
+        help="Search sub-directories for documents.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes. Defaults to the number of CPUs.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600.0,
+        help="Seconds before a document's worker is killed.",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=1,
+        help="Number of times a failed or timed out document is retried.",
+    )
+    parser.add_argument(
+        "--freecad-home",
+        type=Path,
+        default=None,
+        help="FreeCAD's home directory. Searches the usual locations by default.",
+    )
+    parser.add_argument(
+        "--arg",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="An argument passed to the task. Values are parsed as JSON if possible.",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=None,
+        help="Write a JSON report of every document's result to this path.",
+    )
+
+    return parser.parse_args(argv)
+
+
+def parse_task_args(items: list[str]) -> dict[str, Any]:
+    args = {}
+
+    for item in items:
+        key, separator, value = item.partition("=")
+
+        if not separator:
+            raise ValueError(f"Invalid task argument '{item}'. Expected KEY=VALUE.")
+
+        try:
+            args[key] = json.loads(value)
+        except json.JSONDecodeError:
+            args[key] = value
+
+    return args
+
+
+def find_documents(directory: Path, recursive: bool = False) -> list[Path]:
+    pattern = f"**/{GLOB_DOCUMENTS}" if recursive else GLOB_DOCUMENTS
+    return sorted(directory.expanduser().resolve().glob(pattern))
+
+
+def print_summary(results: list[workers.JobResult], elapsed: float) -> None:
+    counts = {
+        status: sum(1 for result in results if result.status == status)
+        for status in (workers.STATUS_OK, workers.STATUS_FAILED, workers.STATUS_TIMEOUT)
+    }
+    retried = sum(1 for result in results if result.attempts > 1)
+
+    print(f"\nProcessed {len(results)} documents in {elapsed:.1f}s.")
+    print(f" {counts[workers.STATUS_OK]} ok")
+    print(f" {counts[workers.STATUS_FAILED]} failed")
+    print(f" {counts[workers.STATUS_TIMEOUT]} timed out")
+    print(f" {retried} retried")
+
+    slowest = sorted(results, key=lambda result: result.elapsed, reverse=True)[:5]
+
+    if slowest:
+        print("\nSlowest documents:")
+        for result in slowest:
+            print(f" {result.elapsed:8.1f}s  {result.job.name}")
+
+    failures = [result for result in results if not result.ok]
+
+    if failures:
+        print("\nFailures:")
+        for result in failures:
+            error = (result.error or "").strip().splitlines()
+            print(f" {result.job.name}: {error[-1] if error else result.status}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    try:
+        task_args = parse_task_args(args.arg)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    documents = find_documents(args.directory, args.recursive)
+
+    if not documents:
+        print(f"Found no documents in {args.directory}.")
+        return 0
+
+    executables = workers.find_executables(args.freecad_home)
+
+    jobs = [
+        workers.Job(task=args.task, args=task_args, document=str(document))
+        for document in documents
+    ]
+
+    print(f"Running '{args.task}' on {len(jobs)} documents…")
+
+    def on_result(result: workers.JobResult) -> None:
+        print(f" [{result.status:>7}] {result.job.name} ({result.elapsed:.1f}s)")
+
+    start = time.perf_counter()
+
+    results = workers.run_jobs(
+        jobs,
+        executables,
+        workers=args.jobs,
+        timeout=args.timeout,
+        retries=args.retries,
+        on_result=on_result,
+    )
+
+    elapsed = time.perf_counter() - start
+
+    print_summary(results, elapsed)
+
+    if args.report:
+        report = {
+            "task": args.task,
+            "args": task_args,
+            "elapsed": elapsed,
+            "results": [result.as_dict() for result in results],
+        }
+        args.report.write_text(json.dumps(report, indent=2, default=str))
+        print(f"\nWrote report to {args.report}")
+
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
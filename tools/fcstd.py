@@ -0,0 +1,680 @@
+"""Report what makes FreeCAD documents slow to open and large on disk, and slim them.
+
+An `.FCStd` is a zip of `Document.xml`, `GuiDocument.xml` and a file for every shape,
+color list and embedded file they reference. Reading the shapes' BREP files dominates
+opening a document, so the report ranks objects by the size of their shapes and finds
+the hidden ones. Nothing needs FreeCAD except measuring the open time.
+
+Slimming writes a copy without the thumbnail and the files nothing references, and
+recompresses it. `--strip-hidden-shapes` also drops the shapes of hidden objects that
+FreeCAD can rebuild and marks those objects touched, so the next recompute restores
+them. With `--open-time` that recompute is timed along with opening the slimmed copy.
+
+    python -m tools.fcstd part.FCStd
+    python -m tools.fcstd ~/Drawings/*.FCStd --top 5 --report sizes.json
+    python -m tools.fcstd part.FCStd --slim --strip-hidden-shapes --open-time
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sys
+import xml.etree.ElementTree as ET
+import zipfile
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from freecadconfig import workers
+
+
+NAME_DOCUMENT = "Document.xml"
+NAME_GUI_DOCUMENT = "GuiDocument.xml"
+
+PREFIX_THUMBNAILS = "thumbnails/"
+
+SUFFIX_SLIM = "-slim"
+
+TYPE_PROPERTY_SHAPE = "Part::PropertyPartShape"
+TYPE_PROPERTY_FILE = "App::PropertyFileIncluded"
+
+# Objects whose stored shape is the only copy of it, e.g. imported geometry, so it's
+# never stripped even when they're hidden.
+TYPE_IDS_NOT_RECOMPUTED = {
+    "App::FeaturePython",
+    "Part::Feature",
+    "Part::FeaturePython",
+}
+
+KIND_XML = "xml"
+KIND_SHAPE = "shape"
+KIND_EMBEDDED = "embedded"
+KIND_VIEW = "view"
+KIND_THUMBNAIL = "thumbnail"
+KIND_DATA = "data"
+KIND_UNREFERENCED = "unreferenced"
+
+MB = 1024 * 1024
+
+
+@dataclass
+class Member:
+    """A file in the document's archive."""
+
+    name: str
+    size: int
+    packed: int
+    kind: str
+    # The object and property referencing the file, if any.
+    owner: str = ""
+    property: str = ""
+
+
+@dataclass
+class DocumentObject:
+    name: str
+    type_id: str
+    label: str = ""
+    visible: bool | None = None
+    # The number of objects that depend on this one.
+    dependents: int = 0
+    # The archive files of the object's shapes.
+    shapes: list[str] = field(default_factory=list)
+    shape_size: int = 0
+
+    @property
+    def hidden(self) -> bool:
+        return self.visible is False
+
+    @property
+    def strippable(self) -> bool:
+        """Whether the object's shapes can be dropped and rebuilt by a recompute."""
+
+        return (
+            self.hidden
+            and bool(self.shapes)
+            and self.type_id not in TYPE_IDS_NOT_RECOMPUTED
+        )
+
+
+@dataclass
+class Analysis:
+    path: str
+    size: int
+    members: list[Member] = field(default_factory=list)
+    objects: dict[str, DocumentObject] = field(default_factory=dict)
+    # Seconds to open the document in FreeCAD, if it was measured.
+    open_time: float | None = None
+    # The objects slimming stripped the shapes of. They're rebuilt by the first
+    # recompute after opening, which is part of what opening them costs.
+    touched: list[str] = field(default_factory=list)
+    # Seconds to recompute the touched objects after opening, if it was measured.
+    recompute_time: float | None = None
+
+    def by_kind(self) -> dict[str, tuple[int, ...]]:
+        """Returns the number, size and packed size of the files of each kind."""
+
+        totals: dict[str, list[int]] = defaultdict(lambda: [0, 0, 0])
+
+        for member in self.members:
+            total = totals[member.kind]
+            total[0] += 1
+            total[1] += member.size
+            total[2] += member.packed
+
+        return {kind: tuple(total) for kind, total in totals.items()}
+
+    def unused(self) -> list[DocumentObject]:
+        """Returns the hidden objects nothing depends on."""
+
+        return [
+            obj for obj in self.objects.values() if obj.hidden and not obj.dependents
+        ]
+
+    def removable(self, strip_hidden_shapes: bool = False) -> set[str]:
+        """Returns the archive files slimming drops."""
+
+        names = {
+            member.name
+            for member in self.members
+            if member.kind in (KIND_THUMBNAIL, KIND_UNREFERENCED)
+        }
+
+        if strip_hidden_shapes:
+            for obj in self.objects.values():
+                if obj.strippable:
+                    names.update(obj.shapes)
+
+        return names
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools.fcstd",
+        description="Report what makes FreeCAD documents slow to open and large.",
+    )
+    parser.add_argument("paths", nargs="+", type=Path, help="The documents.")
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of objects listed by shape size.",
+    )
+    parser.add_argument(
+        "--slim",
+        action="store_true",
+        help="Write a copy without the removable files, recompressed.",
+    )
+    parser.add_argument(
+        "--strip-hidden-shapes",
+        action="store_true",
+        help="Also drop the shapes of hidden objects that a recompute can rebuild.",
+    )
+    parser.add_argument(
+        "--keep-thumbnail",
+        action="store_true",
+        help="Keep the thumbnail file browsers show.",
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        default=6,
+        choices=range(10),
+        metavar="0-9",
+        help="The zlib level slimmed documents are compressed with.",
+    )
+    parser.add_argument(
+        "--output-directory",
+        type=Path,
+        default=None,
+        help=(
+            f"Where slimmed documents are written. Defaults to next to each document "
+            f"with a '{SUFFIX_SLIM}' suffix."
+        ),
+    )
+    parser.add_argument(
+        "--open-time",
+        action="store_true",
+        help="Measure how long each document takes to open in an offscreen FreeCAD.",
+    )
+    parser.add_argument(
+        "--freecad-home",
+        type=Path,
+        default=None,
+        help="FreeCAD's home directory. Searches the usual locations by default.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600.0,
+        help="Seconds before opening a document is given up on.",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=None,
+        help="Write a JSON report of every document to this path.",
+    )
+
+    return parser.parse_args(argv)
+
+
+# Analysis
+
+
+def analyze(path: Path) -> Analysis:
+    analysis = Analysis(path=str(path), size=path.stat().st_size)
+
+    with zipfile.ZipFile(path) as archive:
+        infos = archive.infolist()
+        names = {info.filename for info in infos}
+
+        document = ET.fromstring(archive.read(NAME_DOCUMENT))
+        gui_document = None
+
+        if NAME_GUI_DOCUMENT in names:
+            gui_document = ET.fromstring(archive.read(NAME_GUI_DOCUMENT))
+
+    analysis.objects = read_objects(document)
+
+    roots = [document] if gui_document is None else [document, gui_document]
+
+    # Files can also be referenced outside of the objects, e.g. by the document
+    # itself, so anything named anywhere is kept.
+    references = {
+        element.get("file", ""): ("", "", KIND_DATA)
+        for root in roots
+        for element in root.iter()
+        if element.get("file")
+    }
+    references |= read_references(document, "ObjectData")
+
+    if gui_document is not None:
+        read_visibility(gui_document, analysis.objects)
+        references |= {
+            file: (owner, prop, KIND_VIEW)
+            for file, (owner, prop, _) in read_references(
+                gui_document, "ViewProviderData"
+            ).items()
+        }
+
+    for info in infos:
+        owner, prop, kind = references.get(info.filename, ("", "", KIND_UNREFERENCED))
+
+        if info.filename in (NAME_DOCUMENT, NAME_GUI_DOCUMENT):
+            kind = KIND_XML
+        elif info.filename.startswith(PREFIX_THUMBNAILS):
+            kind = KIND_THUMBNAIL
+        elif info.is_dir():
+            continue
+
+        analysis.members.append(
+            Member(info.filename, info.file_size, info.compress_size, kind, owner, prop)
+        )
+
+        if kind == KIND_SHAPE and owner in analysis.objects:
+            obj = analysis.objects[owner]
+            obj.shapes.append(info.filename)
+            obj.shape_size += info.file_size
+
+    return analysis
+
+
+def read_objects(document: ET.Element) -> dict[str, DocumentObject]:
+    objects = {}
+    section = document.find("Objects")
+
+    if section is None:
+        return objects
+
+    for element in section.iter("Object"):
+        name = element.get("name", "")
+        objects[name] = DocumentObject(name, element.get("type", ""))
+
+    # Only documents saved by FreeCAD 0.19 or newer list the dependencies.
+    for element in section.iter("ObjectDeps"):
+        for dependency in element.iter("Dep"):
+            obj = objects.get(dependency.get("Name", ""))
+
+            if obj is not None:
+                obj.dependents += 1
+
+    data = document.find("ObjectData")
+
+    for element in data.iter("Object") if data is not None else []:
+        obj = objects.get(element.get("name", ""))
+
+        if obj is None:
+            continue
+
+        for prop in element.iter("Property"):
+            name = prop.get("name")
+
+            if name == "Label":
+                value = prop.find("String")
+                obj.label = value.get("value", "") if value is not None else ""
+            elif name == "Visibility" and obj.visible is None:
+                obj.visible = read_bool(prop)
+
+    return objects
+
+
+def read_visibility(
+    gui_document: ET.Element, objects: dict[str, DocumentObject]
+) -> None:
+    """Read each object's visibility from its view provider.
+
+    The view providers are what FreeCAD shows, so they win over the `Visibility`
+    property newer versions also store with the object.
+    """
+
+    data = gui_document.find("ViewProviderData")
+
+    for element in data.iter("ViewProvider") if data is not None else []:
+        obj = objects.get(element.get("name", ""))
+
+        if obj is None:
+            continue
+
+        for prop in element.iter("Property"):
+            if prop.get("name") == "Visibility":
+                obj.visible = read_bool(prop)
+                break
+
+
+def read_bool(prop: ET.Element) -> bool | None:
+    value = prop.find("Bool")
+    return None if value is None else value.get("value") == "true"
+
+
+def read_references(root: ET.Element, section: str) -> dict[str, tuple[str, str, str]]:
+    """Returns the object, property and kind of every file the XML references."""
+
+    references = {}
+    owners = root.find(section)
+
+    for owner in owners if owners is not None else []:
+        for prop in owner.iter("Property"):
+            kind = {
+                TYPE_PROPERTY_SHAPE: KIND_SHAPE,
+                TYPE_PROPERTY_FILE: KIND_EMBEDDED,
+            }.get(prop.get("type", ""), KIND_DATA)
+
+            for element in prop.iter():
+                file = element.get("file")
+
+                if file:
+                    name = owner.get("name", "")
+                    references[file] = (name, prop.get("name", ""), kind)
+
+    return references
+
+
+# Slimming
+
+
+def slim(
+    analysis: Analysis,
+    output: Path,
+    strip_hidden_shapes: bool = False,
+    keep_thumbnail: bool = False,
+    compression_level: int = 6,
+) -> Analysis:
+    """Write a slimmed copy of the document and return its analysis."""
+
+    removed = analysis.removable(strip_hidden_shapes)
+
+    if keep_thumbnail:
+        removed = {name for name in removed if not name.startswith(PREFIX_THUMBNAILS)}
+
+    touched = {
+        obj.name
+        for obj in analysis.objects.values()
+        if strip_hidden_shapes and obj.strippable
+    }
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    path_tmp = output.with_suffix(".tmp")
+
+    try:
+        with (
+            zipfile.ZipFile(analysis.path) as source,
+            zipfile.ZipFile(
+                path_tmp,
+                "w",
+                compression=zipfile.ZIP_DEFLATED,
+                compresslevel=compression_level,
+            ) as target,
+        ):
+            # FreeCAD reads the files in the order it wrote them and skips any that are
+            # out of order, so the order is kept.
+            for info in source.infolist():
+                if info.filename in removed:
+                    continue
+
+                if info.is_dir():
+                    continue
+
+                if info.filename == NAME_DOCUMENT and touched:
+                    document = touch_objects(source.read(info), touched)
+                    target.writestr(info.filename, document)
+                    continue
+
+                # Shapes can be larger than fits in memory so they're streamed.
+                with (
+                    source.open(info) as src,
+                    target.open(
+                        info.filename,
+                        "w",
+                        force_zip64=info.file_size > zipfile.ZIP64_LIMIT,
+                    ) as dst,
+                ):
+                    shutil.copyfileobj(src, dst, MB)
+    except BaseException:
+        # A half written copy is never left behind.
+        path_tmp.unlink(missing_ok=True)
+        raise
+
+    path_tmp.replace(output)
+
+    slimmed = analyze(output)
+    slimmed.touched = sorted(touched)
+
+    return slimmed
+
+
+def touch_objects(document: bytes, names: set[str]) -> bytes:
+    """Mark objects touched so a recompute rebuilds their stripped shapes."""
+
+    root = ET.fromstring(document)
+    section = root.find("Objects")
+
+    for element in section.iter("Object") if section is not None else []:
+        if element.get("name") in names:
+            element.set("Touched", "1")
+
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+def output_path(path: Path, output_directory: Path | None) -> Path:
+    name = f"{path.stem}{SUFFIX_SLIM}{path.suffix}"
+    return (output_directory or path.parent).expanduser() / name
+
+
+# Open Time
+
+
+def measure_open_times(
+    analyses: list[Analysis], freecad_home: Path | None, timeout: float
+) -> None:
+    """Open each document in its own offscreen FreeCAD and time it.
+
+    Documents with touched objects are also recomputed and timed, as they're only
+    usable once their stripped shapes are rebuilt.
+    """
+
+    executables = workers.find_executables(freecad_home)
+
+    jobs = [
+        workers.Job(
+            task="open",
+            args={"path": analysis.path, "recompute": bool(analysis.touched)},
+        )
+        for analysis in analyses
+    ]
+
+    print(f"Opening {len(jobs)} documents in FreeCAD…")
+
+    # One at a time so the documents don't compete for the disk and CPUs.
+    results = workers.run_jobs(jobs, executables, workers=1, timeout=timeout)
+
+    for analysis, result in zip(analyses, results, strict=True):
+        if not result.ok:
+            error = (result.error or result.status).strip().splitlines()
+            name = Path(analysis.path).name
+            print(f" Failed to open {name}: {error[-1] if error else ''}")
+            continue
+
+        analysis.open_time = result.details.get("open")
+        analysis.recompute_time = result.details.get("recompute")
+
+
+# Report
+
+
+def print_analysis(analysis: Analysis, top: int) -> None:
+    unpacked = sum(member.size for member in analysis.members)
+
+    print(
+        f"\n{analysis.path}: {analysis.size / MB:.1f} MB on disk, "
+        f"{unpacked / MB:.1f} MB unpacked, {len(analysis.objects)} objects"
+    )
+
+    print(f" {'kind':<14} {'files':>6} {'unpacked':>10} {'packed':>10}")
+
+    kinds = sorted(analysis.by_kind().items(), key=lambda item: -item[1][1])
+
+    for kind, (count, size, packed) in kinds:
+        print(f" {kind:<14} {count:>6} {size / MB:>8.1f}MB {packed / MB:>8.1f}MB")
+
+    ranked = sorted(
+        (obj for obj in analysis.objects.values() if obj.shape_size),
+        key=lambda obj: -obj.shape_size,
+    )
+
+    if ranked:
+        print("\n Largest shapes:")
+
+        for obj in ranked[:top]:
+            hidden = "hidden" if obj.hidden else ""
+            line = (
+                f" {obj.shape_size / MB:>8.1f}MB  {obj.label or obj.name:<32} "
+                f"{obj.type_id:<28} {hidden}"
+            )
+            print(line.rstrip())
+
+    hidden = [obj for obj in analysis.objects.values() if obj.hidden and obj.shapes]
+
+    if hidden:
+        strippable = [obj for obj in hidden if obj.strippable]
+        print(
+            f"\n {len(hidden)} hidden objects store "
+            f"{sum(obj.shape_size for obj in hidden) / MB:.1f} MB of shapes, "
+            f"{sum(obj.shape_size for obj in strippable) / MB:.1f} MB of which a "
+            f"recompute can rebuild."
+        )
+
+    unused = analysis.unused()
+
+    if unused:
+        labels = [obj.label or obj.name for obj in unused]
+        more = f" and {len(labels) - top} more" if len(labels) > top else ""
+        print(
+            f"\n {len(unused)} hidden objects nothing depends on: "
+            f"{', '.join(labels[:top])}{more}"
+        )
+
+    embedded = [member for member in analysis.members if member.kind == KIND_EMBEDDED]
+
+    if embedded:
+        print(f"\n {len(embedded)} embedded files:")
+
+        for member in sorted(embedded, key=lambda member: -member.size)[:top]:
+            print(
+                f" {member.size / MB:>8.1f}MB  {member.name} in "
+                f"{member.owner}.{member.property}"
+            )
+
+
+def print_comparison(before: Analysis, after: Analysis) -> None:
+    change = (after.size - before.size) / before.size if before.size else 0.0
+
+    print(
+        f"\n Slimmed to {after.path}: {before.size / MB:.1f} MB -> "
+        f"{after.size / MB:.1f} MB ({change:+.0%})"
+    )
+
+    if before.open_time is None or after.open_time is None:
+        return
+
+    line = f" Opened in {before.open_time:.2f}s -> {after.open_time:.2f}s"
+
+    if after.touched:
+        if after.recompute_time is not None:
+            line += (
+                f" + {after.recompute_time:.2f}s recomputing the "
+                f"{len(after.touched)} stripped objects"
+            )
+        else:
+            line += (
+                f", excluding the recompute the {len(after.touched)} stripped objects "
+                f"need"
+            )
+
+    print(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    analyses: list[Analysis] = []
+    # The slimmed copies keyed by the path of the document they were slimmed from.
+    slimmed: dict[str, Analysis] = {}
+    failed: list[Path] = []
+
+    # A document that can't be read or slimmed is skipped so the others are still
+    # reported.
+    for path in args.paths:
+        path = path.expanduser()
+
+        try:
+            analysis = analyze(path)
+        except (OSError, zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+            print(f"Unable to read {path}: {e}", file=sys.stderr)
+            failed.append(path)
+            continue
+
+        analyses.append(analysis)
+
+        if not args.slim:
+            continue
+
+        try:
+            slimmed[analysis.path] = slim(
+                analysis,
+                output_path(path, args.output_directory),
+                args.strip_hidden_shapes,
+                args.keep_thumbnail,
+                args.compression_level,
+            )
+        except (OSError, zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+            print(f"Unable to slim {path}: {e}", file=sys.stderr)
+            failed.append(path)
+
+    if args.open_time and analyses:
+        measure_open_times(
+            [*analyses, *slimmed.values()], args.freecad_home, args.timeout
+        )
+
+    for analysis in analyses:
+        print_analysis(analysis, args.top)
+
+        if analysis.path in slimmed:
+            print_comparison(analysis, slimmed[analysis.path])
+        elif analysis.open_time is not None:
+            print(f"\n Opened in {analysis.open_time:.2f}s")
+
+    if args.report:
+        report = {
+            "documents": [
+                {
+                    **asdict(analysis),
+                    "kinds": analysis.by_kind(),
+                    "slimmed": (
+                        asdict(slimmed[analysis.path])
+                        if analysis.path in slimmed
+                        else None
+                    ),
+                }
+                for analysis in analyses
+            ],
+            "failed": [str(path) for path in failed],
+        }
+        args.report.write_text(json.dumps(report, indent=2))
+        print(f"\nWrote report to {args.report}")
+
+    if failed:
+        print(
+            f"\nFailed to process {len(failed)} documents: "
+            f"{', '.join(str(path) for path in failed)}",
+            file=sys.stderr,
+        )
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Compare the memory reports `freecadconfig.instrument` writes for each macro run.
+
+Reports are grouped by macro or worker task. The latest run of each is compared with
+the median of the runs before it, so a macro that starts allocating or keeping more
+memory stands out.
+
+    FREECADCONFIG_INSTRUMENT=~/reports python -m tools.batch restyle parts/
+    python -m tools.memory_report ~/reports
+    python -m tools.memory_report ~/reports --name SetViewObjectViewport --sites 5
+
+Exits with 1 if the latest run of any macro regressed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from freecadconfig import instrument
+
+
+MB = 1024 * 1024
+
+MEASURES = ("peak", "retained")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools.memory_report",
+        description="Compare the memory reports written for each macro run.",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        type=Path,
+        help="Report files or directories of them.",
+    )
+    parser.add_argument(
+        "--name",
+        action="append",
+        default=[],
+        help="Only compare this macro or task. Defaults to every one.",
+    )
+    parser.add_argument(
+        "--sites",
+        type=int,
+        default=0,
+        help="Show this many allocation sites and types from each latest run.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed growth as a fraction of the median of the earlier runs.",
+    )
+    parser.add_argument(
+        "--floor",
+        type=float,
+        default=1.0,
+        help="Growth under this many MB is never a regression.",
+    )
+
+    return parser.parse_args(argv)
+
+
+def compare(
+    latest: instrument.Report,
+    earlier: list[instrument.Report],
+    tolerance: float,
+    floor: float,
+) -> list[str]:
+    """Returns a message for each measure the latest run regressed on."""
+
+    regressions = []
+
+    for measure in MEASURES:
+        if not earlier:
+            break
+
+        median = statistics.median(getattr(report, measure) for report in earlier)
+        value = getattr(latest, measure)
+
+        if value - median > max(median * tolerance, floor * MB):
+            regressions.append(
+                f"{latest.name}: {measure} {value / MB:.1f} MB "
+                f"(median {median / MB:.1f} MB over {len(earlier)} runs)"
+            )
+
+    return regressions
+
+
+def print_details(report: instrument.Report, top: int) -> None:
+    for site in report.sites[:top]:
+        print(
+            f"{'':>4}{site['size'] / 1024:>10.1f} KB {site['count']:>8}  "
+            f"{site['file']}:{site['line']}"
+        )
+
+    for name, change in list(report.objects.items())[:top]:
+        print(f"{'':>4}{change:>+13,}  {name}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    reports = instrument.read_reports([path.expanduser() for path in args.paths])
+
+    by_name: dict[str, list[instrument.Report]] = defaultdict(list)
+
+    for report in reports:
+        if not args.name or report.name in args.name:
+            by_name[report.name].append(report)
+
+    if not by_name:
+        print("Found no reports.", file=sys.stderr)
+        return 1
+
+    print(
+        f"{'name':<36} {'runs':>5} {'peak':>10} {'retained':>10} {'rss':>10} "
+        f"{'elapsed':>9}"
+    )
+
+    regressions = []
+
+    for name in sorted(by_name):
+        *earlier, latest = by_name[name]
+
+        rss = ""
+        if latest.rss_before is not None and latest.rss_after is not None:
+            rss = f"{(latest.rss_after - latest.rss_before) / MB:>+8.1f}MB"
+
+        print(
+            f"{name:<36} {len(earlier) + 1:>5} {latest.peak / MB:>8.1f}MB "
+            f"{latest.retained / MB:>8.1f}MB {rss:>10} {latest.elapsed:>8.2f}s"
+        )
+
+        if latest.error:
+            print(f"{'':>4}Failed: {latest.error}")
+
+        if args.sites:
+            print_details(latest, args.sites)
+
+        regressions += compare(latest, earlier, args.tolerance, args.floor)
+
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f" {regression}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
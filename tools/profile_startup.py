@@ -0,0 +1,480 @@
+"""Profile what each workbench costs FreeCAD at startup.
+
+Every workbench is activated in its own offscreen `FreeCAD` process so nothing it
+imports is shared with another. Activating a workbench imports its modules and runs
+its `Initialize`, which is what listing it in `AutoloadModule` or
+`BackgroundAutoloadModules` costs at startup. The report ranks workbenches by their
+activation time and shows the memory and modules they add, whether they're an add-on
+and how `preferences.toml` loads them.
+
+Every add-on Mod's `Init.py` and `InitGui.py` run at startup whether its workbench is
+loaded or not. Each add-on is timed by starting FreeCAD with only that Mod, compared
+with starting it with no add-ons at all. Built-in Mods can't be left out, so their
+cost is part of that baseline.
+
+The processes start with a clean `user.cfg` that autoloads nothing. With the user's
+own config, the workbenches it already loads would be imported before they're
+activated and profile at next to nothing.
+
+    python -m tools.profile_startup
+    python -m tools.profile_startup --repeats 3 --report startup.json
+    python -m tools.profile_startup --workbench CurvesWorkbench --report curves.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from xml.etree import ElementTree
+
+import install
+from freecadconfig import workers
+from tools import PATH_ROOT
+
+
+P_AUTOLOAD = "BaseApp/Preferences/General/AutoloadModule"
+P_BACKGROUND = "BaseApp/Preferences/General/BackgroundAutoloadModules"
+P_DISABLED = "BaseApp/Preferences/Workbenches/Disabled"
+
+LOADING_AUTOLOAD = "autoload"
+LOADING_BACKGROUND = "background"
+LOADING_DISABLED = "disabled"
+
+# The placeholder workbench FreeCAD starts with. It has nothing to load.
+NAME_NONE_WORKBENCH = "NoneWorkbench"
+
+# The files FreeCAD runs from every Mod at startup.
+FILE_NAMES_INIT = ("Init.py", "InitGui.py")
+
+# The name the run without any add-on Mods is reported under.
+MOD_BASELINE = ""
+
+TAG_PARAMETERS = "FCParameters"
+TAG_GROUP = "FCParamGroup"
+TAG_TEXT = "FCText"
+
+MB = 1024 * 1024
+
+
+@dataclass
+class Profile:
+    workbench: str
+    mod: str
+    addon: bool
+    loading: str
+    # The best of the repeated runs.
+    activate: float | None = None
+    rss: int | None = None
+    modules: int | None = None
+    error: str | None = None
+
+
+@dataclass
+class ModProfile:
+    mod: str
+    # What the Mod adds to starting FreeCAD without add-ons, from the best runs.
+    startup: float | None = None
+    rss: int | None = None
+    modules: int | None = None
+    error: str | None = None
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools.profile_startup",
+        description="Profile what each workbench costs FreeCAD at startup.",
+    )
+    parser.add_argument(
+        "--workbench",
+        action="append",
+        default=[],
+        help="Only profile this workbench. Defaults to every workbench.",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=1,
+        help=(
+            "Number of times each workbench and add-on Mod is profiled. The best run "
+            "is reported."
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of workbenches profiled at once. More is faster but noisier.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=300.0,
+        help="Seconds before a workbench's process is killed.",
+    )
+    parser.add_argument(
+        "--freecad-home",
+        type=Path,
+        default=None,
+        help="FreeCAD's home directory. Searches the usual locations by default.",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        default=PATH_ROOT,
+        help="The root of the config repo. Defaults to this repo.",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=None,
+        help="Write a JSON report to this path.",
+    )
+
+    return parser.parse_args(argv)
+
+
+def find_loading(path_config_root: Path) -> dict[str, str]:
+    """Returns how `preferences.toml` loads each workbench it mentions."""
+
+    parameters = install.desired_parameters(path_config_root)
+
+    def names(path: str) -> list[str]:
+        _, value = parameters.get(path, ("String", ""))
+        return [name for name in str(value).split(",") if name]
+
+    loading = {name: LOADING_BACKGROUND for name in names(P_BACKGROUND)}
+    loading |= {name: LOADING_AUTOLOAD for name in names(P_AUTOLOAD)}
+    loading |= {name: LOADING_DISABLED for name in names(P_DISABLED)}
+
+    return loading
+
+
+def find_mods(listing: dict, workbenches: list[str]) -> list[Path]:
+    """Returns the add-on Mods FreeCAD runs an `Init.py` or `InitGui.py` from.
+
+    Args:
+        workbenches: Only return the Mods these workbenches come from. Returns every
+            add-on Mod if empty.
+    """
+
+    path_addons = Path(listing["addons"])
+
+    if not path_addons.is_dir():
+        return []
+
+    wanted = {
+        Path(listing["workbenches"][name]["path"]).parent.name
+        for name in workbenches
+        if listing["workbenches"].get(name, {}).get("path")
+    }
+
+    return [
+        path
+        for path in sorted(path_addons.iterdir())
+        if any((path / name).is_file() for name in FILE_NAMES_INIT)
+        and (not workbenches or path.name in wanted)
+    ]
+
+
+def best_of(current: float | None, value: float | None) -> float | None:
+    # Keep the best of each measure. The worst runs are mostly noise from the rest of
+    # the machine.
+    if value is None:
+        return current
+
+    return value if current is None or value < current else current
+
+
+def clean_user_cfg() -> str:
+    """Returns a `user.cfg` that starts FreeCAD without loading any workbench."""
+
+    root = ElementTree.Element(TAG_PARAMETERS)
+    group = ElementTree.SubElement(root, TAG_GROUP, Name="Root")
+
+    path_group, _, _ = P_AUTOLOAD.rpartition("/")
+
+    for name in path_group.split("/"):
+        group = ElementTree.SubElement(group, TAG_GROUP, Name=name)
+
+    values = {P_AUTOLOAD: NAME_NONE_WORKBENCH, P_BACKGROUND: ""}
+
+    for path, value in values.items():
+        element = ElementTree.SubElement(group, TAG_TEXT, Name=path.rpartition("/")[2])
+        element.text = value
+
+    return ElementTree.tostring(root, encoding="unicode", xml_declaration=True)
+
+
+def build_profiles(
+    listing: dict,
+    results: list[workers.JobResult],
+    loading: dict[str, str],
+) -> list[Profile]:
+    profiles: dict[str, Profile] = {}
+
+    for name, info in listing["workbenches"].items():
+        path = Path(info["path"]) if info["path"] else None
+
+        profiles[name] = Profile(
+            workbench=name,
+            mod=path.parent.name if path else "",
+            addon=path is not None and path.is_relative_to(listing["addons"]),
+            loading=loading.get(name, ""),
+        )
+
+    for result in results:
+        profile = profiles[result.job.args["workbench"]]
+
+        if not result.ok:
+            if profile.activate is None:
+                profile.error = result.error
+            continue
+
+        details = result.details
+
+        for attr in ("activate", "rss", "modules"):
+            setattr(profile, attr, best_of(getattr(profile, attr), details[attr]))
+
+        profile.error = None
+
+    return sorted(
+        profiles.values(),
+        key=lambda profile: profile.activate if profile.activate is not None else -1,
+        reverse=True,
+    )
+
+
+def build_mod_profiles(results: list[workers.JobResult]) -> list[ModProfile]:
+    best: dict[str, dict[str, float | None]] = {}
+    errors: dict[str, str] = {}
+
+    for result in results:
+        mod = result.job.args["mod"]
+
+        if not result.ok:
+            errors.setdefault(mod, result.error or "")
+            continue
+
+        measures = best.setdefault(mod, {})
+
+        for attr in ("startup", "rss", "modules"):
+            measures[attr] = best_of(measures.get(attr), result.details[attr])
+
+    baseline = best.get(MOD_BASELINE)
+    profiles = []
+
+    for mod in sorted((best.keys() | errors.keys()) - {MOD_BASELINE}):
+        profile = ModProfile(mod=mod)
+        measures = best.get(mod)
+
+        if baseline is None:
+            profile.error = errors.get(MOD_BASELINE, "")
+        elif measures is None:
+            profile.error = errors[mod]
+        else:
+            for attr, value in measures.items():
+                if value is not None and baseline[attr] is not None:
+                    setattr(profile, attr, value - baseline[attr])
+
+        profiles.append(profile)
+
+    return sorted(
+        profiles,
+        key=lambda profile: profile.startup if profile.startup is not None else -1,
+        reverse=True,
+    )
+
+
+def print_report(
+    listing: dict,
+    elapsed: float,
+    profiles: list[Profile],
+    mod_profiles: list[ModProfile],
+) -> None:
+    memory = f"{listing['rss'] / MB:.0f} MB" if listing["rss"] else "unknown memory"
+
+    print(
+        f"\nFreeCAD started and listed {len(profiles)} workbenches in {elapsed:.1f}s "
+        f"using {memory} and {listing['modules']} modules."
+    )
+    print(
+        f"\n{'rank':>4}  {'workbench':<28} {'activate':>9} {'memory':>10} "
+        f"{'modules':>8}  {'mod':<20} {'source':<8} loading"
+    )
+
+    for rank, profile in enumerate(profiles, start=1):
+        source = "add-on" if profile.addon else "built-in"
+
+        if profile.activate is None:
+            error = (profile.error or "").strip().splitlines()
+            print(
+                f"{rank:>4}  {profile.workbench:<28} {'failed':>9} {'':>10} {'':>8}  "
+                f"{profile.mod:<20} {source:<8} {profile.loading}"
+            )
+            if error:
+                print(f"{'':>6}{error[-1]}")
+            continue
+
+        print(
+            f"{rank:>4}  {profile.workbench:<28} "
+            f"{profile.activate * 1000:>7.0f}ms "
+            f"{(profile.rss or 0) / MB:>+8.1f}MB "
+            f"{profile.modules:>8}  "
+            f"{profile.mod:<20} {source:<8} {profile.loading}"
+        )
+
+    for loading in (LOADING_AUTOLOAD, LOADING_BACKGROUND):
+        loaded = [
+            profile
+            for profile in profiles
+            if profile.loading == loading and profile.activate is not None
+        ]
+
+        if loaded:
+            total = sum(profile.activate or 0 for profile in loaded)
+            print(
+                f"\n{loading.capitalize()} workbenches cost {total * 1000:.0f}ms: "
+                f"{', '.join(profile.workbench for profile in loaded)}"
+            )
+
+    if not mod_profiles:
+        return
+
+    print(
+        "\nAdd-on Mods, by what running their Init.py and InitGui.py adds to startup:"
+    )
+    print(f"\n{'rank':>4}  {'mod':<28} {'startup':>9} {'memory':>10} {'modules':>8}")
+
+    for rank, profile in enumerate(mod_profiles, start=1):
+        if profile.startup is None:
+            error = (profile.error or "").strip().splitlines()
+            print(f"{rank:>4}  {profile.mod:<28} {'failed':>9}")
+            if error:
+                print(f"{'':>6}{error[-1]}")
+            continue
+
+        print(
+            f"{rank:>4}  {profile.mod:<28} "
+            f"{profile.startup * 1000:>+7.0f}ms "
+            f"{(profile.rss or 0) / MB:>+8.1f}MB "
+            f"{profile.modules or 0:>+8}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    executables = workers.find_executables(args.freecad_home)
+    user_cfg = clean_user_cfg()
+
+    print("Listing workbenches…")
+    listed = workers.run_job(
+        workers.Job(task="list-workbenches", user_cfg=user_cfg),
+        executables,
+        timeout=args.timeout,
+    )
+
+    if not listed.ok:
+        print(f"Failed to list workbenches:\n{listed.error}", file=sys.stderr)
+        return 1
+
+    listing = listed.details
+
+    names = [
+        name
+        for name in listing["workbenches"]
+        if name != NAME_NONE_WORKBENCH
+        and (not args.workbench or name in args.workbench)
+    ]
+    listing["workbenches"] = {name: listing["workbenches"][name] for name in names}
+
+    jobs = [
+        workers.Job(
+            task="profile-workbench", args={"workbench": name}, user_cfg=user_cfg
+        )
+        for name in names
+        for _ in range(args.repeats)
+    ]
+
+    print(f"Profiling {len(names)} workbenches…")
+
+    def on_result(result: workers.JobResult) -> None:
+        print(f" [{result.status:>7}] {result.job.args['workbench']}")
+
+    results = workers.run_jobs(
+        jobs,
+        executables,
+        workers=args.jobs,
+        timeout=args.timeout,
+        retries=0,
+        on_result=on_result,
+    )
+
+    profiles = build_profiles(listing, results, find_loading(args.config))
+
+    mods = find_mods(listing, args.workbench)
+
+    # Started without the user's add-ons so each Mod is measured on its own.
+    mod_jobs = [
+        workers.Job(
+            task="profile-mod",
+            args={"mod": path.name},
+            user_cfg=user_cfg,
+            mods=[str(path)],
+        )
+        for path in mods
+        for _ in range(args.repeats)
+    ]
+
+    if mod_jobs:
+        mod_jobs += [
+            workers.Job(
+                task="profile-mod",
+                args={"mod": MOD_BASELINE},
+                user_cfg=user_cfg,
+                mods=[],
+            )
+            for _ in range(args.repeats)
+        ]
+
+    print(f"Profiling {len(mods)} add-on Mods…")
+
+    def on_mod_result(result: workers.JobResult) -> None:
+        print(f" [{result.status:>7}] {result.job.args['mod'] or '(no add-ons)'}")
+
+    mod_results = workers.run_jobs(
+        mod_jobs,
+        executables,
+        workers=args.jobs,
+        timeout=args.timeout,
+        retries=0,
+        on_result=on_mod_result,
+    )
+
+    mod_profiles = build_mod_profiles(mod_results)
+
+    print_report(listing, listed.elapsed, profiles, mod_profiles)
+
+    if args.report:
+        report = {
+            "startup": {
+                "elapsed": listed.elapsed,
+                "rss": listing["rss"],
+                "modules": listing["modules"],
+            },
+            "profiles": [asdict(profile) for profile in profiles],
+            "mods": [asdict(profile) for profile in mod_profiles],
+        }
+        args.report.write_text(json.dumps(report, indent=2))
+        print(f"\nWrote report to {args.report}")
+
+    failed = any(profile.error is not None for profile in [*profiles, *mod_profiles])
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
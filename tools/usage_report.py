@@ -0,0 +1,287 @@
+"""Generate the workbench lists in `preferences.toml` from recorded usage.
+
+Reads the `usage.jsonl` files the startup `Mod` records and picks:
+
+- `AutoloadModule`: The workbench sessions most often switch to first.
+- `BackgroundAutoloadModules`: The few workbenches used in most sessions.
+- `Workbenches/Ordered`: Every used workbench, most activated first.
+- `Workbenches/Disabled`: Every workbench that wasn't used at all. The current start
+  workbench and any a session started in are never disabled.
+
+Workbenches that are used but not constantly are left to load when they're first
+activated. The section is printed as TOML or written into `preferences.toml`.
+
+    python -m tools.usage_report ~/.local/share/FreeCAD/FreeCADConfig/usage.jsonl
+    python -m tools.usage_report seats/*/usage.jsonl --last 50 --update
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import tomllib
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+import install
+from freecadconfig import usage
+from tools import PATH_ROOT
+
+
+P_AUTOLOAD = "BaseApp/Preferences/General/AutoloadModule"
+P_BACKGROUND = "BaseApp/Preferences/General/BackgroundAutoloadModules"
+P_ORDERED = "BaseApp/Preferences/Workbenches/Ordered"
+P_DISABLED = "BaseApp/Preferences/Workbenches/Disabled"
+
+NAME_NONE_WORKBENCH = "NoneWorkbench"
+
+
+@dataclass
+class Plan:
+    sessions: int
+    autoload: str
+    background: list[str]
+    ordered: list[str]
+    disabled: list[str]
+    macros: Counter[str]
+
+    def values(self) -> dict[str, str | list[str]]:
+        return {
+            P_AUTOLOAD: self.autoload,
+            P_BACKGROUND: self.background,
+            P_ORDERED: self.ordered,
+            P_DISABLED: self.disabled,
+        }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools.usage_report",
+        description="Generate the workbench lists in preferences.toml from usage.",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        type=Path,
+        help="Recorded 'usage.jsonl' files. Sessions from every file are combined.",
+    )
+    parser.add_argument(
+        "--last",
+        type=int,
+        default=100,
+        help="Only use the most recent sessions.",
+    )
+    parser.add_argument(
+        "--min-sessions",
+        type=int,
+        default=5,
+        help="Refuse to generate anything from fewer sessions.",
+    )
+    parser.add_argument(
+        "--eager-ratio",
+        type=float,
+        default=0.5,
+        help="Background load workbenches used in at least this fraction of sessions.",
+    )
+    parser.add_argument(
+        "--eager-max",
+        type=int,
+        default=3,
+        help="The most workbenches to background load.",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        default=PATH_ROOT,
+        help="The root of the config repo. Defaults to this repo.",
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Write the lists into the config's preferences.toml.",
+    )
+
+    return parser.parse_args(argv)
+
+
+def plan_workbenches(
+    sessions: list[usage.Session],
+    disabled: list[str],
+    eager_ratio: float = 0.5,
+    eager_max: int = 3,
+    autoload: str = "",
+) -> Plan:
+    """Plan the workbench lists from sessions.
+
+    Args:
+        sessions: The recorded sessions.
+        disabled: The currently disabled workbenches. FreeCAD might not list them as
+            available so they're kept disabled unless they've been used.
+        autoload: The current start workbench. It's kept if no session switched
+            workbench. Sessions recorded before the start workbench was counted as
+            used have no activations for it, so it's never disabled.
+    """
+
+    activations: Counter[str] = Counter()
+    used_in: Counter[str] = Counter()
+    firsts: Counter[str] = Counter()
+    macros: Counter[str] = Counter()
+    available = set(disabled)
+    # The current start workbench and every one a session started in. Disabling one
+    # would leave FreeCAD starting in a workbench that can't load.
+    starts = {autoload}
+
+    for session in sessions:
+        activations.update(session.workbenches)
+        used_in.update(session.workbenches.keys())
+        macros.update(session.macros)
+        available.update(session.available)
+
+        if session.start:
+            starts.add(session.start)
+
+        if session.first:
+            firsts[session.first] += 1
+
+    for counter in (activations, used_in, firsts):
+        counter.pop(NAME_NONE_WORKBENCH, None)
+
+    ranked = sorted(activations, key=lambda name: (-activations[name], name))
+
+    if firsts:
+        autoload = firsts.most_common(1)[0][0]
+    elif ranked:
+        autoload = ranked[0]
+
+    background = [
+        name
+        for name in sorted(used_in, key=lambda name: (-used_in[name], name))
+        if used_in[name] / len(sessions) >= eager_ratio
+    ][:eager_max]
+
+    # The start workbench is loaded first anyway. Listing it keeps FreeCAD from
+    # unloading it when another background module finishes loading.
+    if autoload and autoload not in background:
+        background = [autoload, *background][:eager_max]
+
+    return Plan(
+        sessions=len(sessions),
+        autoload=autoload,
+        background=background,
+        ordered=ranked,
+        disabled=sorted(available - set(activations) - starts - {autoload}),
+        macros=macros,
+    )
+
+
+def format_value(value: str | list[str]) -> str:
+    if isinstance(value, str):
+        return f'"{value}"'
+
+    items = "".join(f'  "{item}",\n' for item in value)
+
+    return f"[\n{items}]"
+
+
+def format_section(plan: Plan) -> str:
+    lines = [f"# Generated by tools.usage_report from {plan.sessions} sessions.\n"]
+
+    for path, value in plan.values().items():
+        lines.append(
+            f'[[preference]]\npath = "{path}"\nvalue = {format_value(value)}\n'
+        )
+
+    return "\n".join(lines)
+
+
+def update_preferences(text: str, plan: Plan) -> str:
+    """Replace the value of each planned preference, keeping everything else."""
+
+    for path, value in plan.values().items():
+        pattern = re.compile(
+            rf'(\[\[preference\]\]\npath = "{re.escape(path)}"\nvalue = )'
+            r'(\[.*?\n\]|"[^"\n]*")',
+            flags=re.DOTALL,
+        )
+
+        text, count = pattern.subn(
+            lambda match, value=value: match[1] + format_value(value),
+            text,
+            count=1,
+        )
+
+        if count == 0:
+            raise ValueError(f"Unable to find the preference '{path}'.")
+
+    # Fail before writing anything that FreeCADConfig can't load.
+    tomllib.loads(text)
+
+    return text
+
+
+def print_summary(plan: Plan) -> None:
+    print(f"# Autoload: {plan.autoload}", file=sys.stderr)
+    print(f"# Background: {', '.join(plan.background)}", file=sys.stderr)
+    lazy = set(plan.ordered) - set(plan.background)
+    print(f"# Lazy: {len(lazy)}", file=sys.stderr)
+    print(f"# Disabled: {len(plan.disabled)}", file=sys.stderr)
+
+    if plan.macros:
+        print("# Most used macros:", file=sys.stderr)
+        for file, count in plan.macros.most_common(5):
+            print(f"#  {count:>6}  {file}", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    sessions = []
+
+    for path in args.paths:
+        sessions += usage.read_sessions(path.expanduser())
+
+    sessions = sorted(sessions, key=lambda session: session.started)[-args.last :]
+
+    if len(sessions) < args.min_sessions:
+        print(
+            f"Found {len(sessions)} sessions. At least {args.min_sessions} are needed.",
+            file=sys.stderr,
+        )
+        return 1
+
+    parameters = install.desired_parameters(args.config)
+    _, disabled = parameters.get(P_DISABLED, ("String", ""))
+    _, autoload = parameters.get(P_AUTOLOAD, ("String", ""))
+
+    plan = plan_workbenches(
+        sessions,
+        disabled=[name for name in str(disabled).split(",") if name],
+        eager_ratio=args.eager_ratio,
+        eager_max=args.eager_max,
+        autoload=str(autoload),
+    )
+
+    print_summary(plan)
+
+    if not args.update:
+        print(format_section(plan))
+        return 0
+
+    path_preferences = args.config.expanduser() / install.SUBPATH_PREFERENCES_TOML
+
+    try:
+        text = update_preferences(path_preferences.read_text(), plan)
+    except (ValueError, tomllib.TOMLDecodeError) as e:
+        print(f"Aborted! {e}", file=sys.stderr)
+        return 1
+
+    path_preferences.write_text(text)
+    print(f"Updated {path_preferences}", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())